@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, send_from_directory, render_template
+from flask import Flask, request, jsonify, send_from_directory, render_template, Response, stream_with_context
 from flask_cors import CORS
 import yt_dlp
 import google.generativeai as genai
@@ -10,12 +10,27 @@ import time
 import random
 import requests
 import json
+import copy
+import itertools
+import hashlib
+import xml.etree.ElementTree as ET
+from urllib.parse import urlparse
+import io
+import codecs
+from contextlib import contextmanager
 from dotenv import load_dotenv
 import threading
-import queue
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FuturesTimeoutError
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
+from youtube_transcript_api._transcripts import TranscriptListFetcher
 import logging
 import socket
+import sqlite3
+import atexit
+import signal
+import sys
+from collections import OrderedDict, namedtuple
 
 # Set global default socket timeout (30s) to prevent indefinite hangs
 socket.setdefaulttimeout(30.0)
@@ -28,7 +43,83 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 MAX_TRANSCRIPT_LENGTH = 50000 # Limit for context window
+EXTRACTION_TIMEOUT = 45 # Seconds a request waits for a transcript before giving up
 DEPLOYMENT_ID = "v2025.11.21.51"
+# Caches and snapshots live outside the source tree; point this at a persistent disk to keep them across deploys
+DATA_DIR = os.getenv('DATA_DIR', os.path.join(tempfile.gettempdir(), 'youtube-summarizer'))
+
+# Extraction concurrency (fixed worker pool plus bounded wait queue per platform)
+EXTRACTION_WORKERS_YOUTUBE = int(os.getenv('EXTRACTION_WORKERS_YOUTUBE', 8))
+EXTRACTION_WORKERS_VIMEO = int(os.getenv('EXTRACTION_WORKERS_VIMEO', 2))
+EXTRACTION_WORKERS_TIKTOK = int(os.getenv('EXTRACTION_WORKERS_TIKTOK', 2))
+EXTRACTION_QUEUE_SIZE = int(os.getenv('EXTRACTION_QUEUE_SIZE', 16)) # Waiting requests per platform
+EXTRACTION_RETRY_AFTER = int(os.getenv('EXTRACTION_RETRY_AFTER', 5)) # Seconds sent in Retry-After when saturated
+
+# Playlist/channel ingestion
+PLAYLIST_MAX_ENTRIES = int(os.getenv('PLAYLIST_MAX_ENTRIES', 50)) # Videos listed per playlist/channel request
+PLAYLIST_TIMEOUT = int(os.getenv('PLAYLIST_TIMEOUT', 300)) # Seconds before unfinished videos are reported as timed out
+PLAYLIST_CONCURRENCY = int(os.getenv('PLAYLIST_CONCURRENCY', max(1, EXTRACTION_WORKERS_YOUTUBE // 2))) # In-flight fetches per playlist request
+
+# Transcript cache (in-process LRU in front of an on-disk SQLite store)
+TRANSCRIPT_CACHE_TTL = int(os.getenv('TRANSCRIPT_CACHE_TTL', 7 * 24 * 3600)) # Seconds, 0 disables caching
+TRANSCRIPT_CACHE_MEMORY_ENTRIES = int(os.getenv('TRANSCRIPT_CACHE_MEMORY_ENTRIES', 128))
+TRANSCRIPT_CACHE_DISK_ENTRIES = int(os.getenv('TRANSCRIPT_CACHE_DISK_ENTRIES', 5000))
+TRANSCRIPT_CACHE_PATH = os.getenv('TRANSCRIPT_CACHE_PATH', os.path.join(DATA_DIR, 'transcript_cache.db'))
+SUMMARY_CACHE_TTL = int(os.getenv('SUMMARY_CACHE_TTL', 7 * 24 * 3600)) # Seconds, 0 disables caching
+
+# Channel feed watcher (precomputes transcripts and summaries for new uploads)
+WATCH_CHANNELS = [c.strip() for c in os.getenv('WATCH_CHANNELS', '').split(',') if c.strip()] # Channel IDs or feed URLs
+WATCH_INTERVAL = int(os.getenv('WATCH_INTERVAL', 900)) # Seconds between polls
+WATCH_FEED_BASE_URL = os.getenv('WATCH_FEED_BASE_URL', 'https://www.youtube.com/feeds/videos.xml')
+WATCH_MAX_PER_POLL = int(os.getenv('WATCH_MAX_PER_POLL', 5)) # New videos precomputed per channel per poll
+
+# YouTube fetch strategies: 'hedged' starts the next strategy after TRANSCRIPT_HEDGE_DELAY seconds
+# (or as soon as the previous one fails), 'sequential' runs them strictly one after another
+TRANSCRIPT_FETCH_MODE = os.getenv('TRANSCRIPT_FETCH_MODE', 'hedged').lower()
+TRANSCRIPT_HEDGE_DELAY = float(os.getenv('TRANSCRIPT_HEDGE_DELAY', 3.0))
+TRANSCRIPT_HEDGE_PARALLEL = int(os.getenv('TRANSCRIPT_HEDGE_PARALLEL', 2)) # Max strategies running at once
+# Shared by all requests; losers abandoned after a win keep their thread until their next checkpoint
+STRATEGY_WORKERS = int(os.getenv('STRATEGY_WORKERS', EXTRACTION_WORKERS_YOUTUBE * max(TRANSCRIPT_HEDGE_PARALLEL, 1))) # Threads for running fetch strategies
+# Strategy order learned from recent outcomes (per platform and cookie/no-cookie variant)
+STRATEGY_ADAPTIVE = os.getenv('STRATEGY_ADAPTIVE', 'true').lower() == 'true' # False keeps the fixed order
+STRATEGY_MIN_SAMPLES = int(os.getenv('STRATEGY_MIN_SAMPLES', 5)) # Outcomes before a strategy is reordered or skipped
+STRATEGY_SKIP_RATE = float(os.getenv('STRATEGY_SKIP_RATE', 0.1)) # Skip strategies whose recent success rate is below this
+STRATEGY_PROBE_RATE = float(os.getenv('STRATEGY_PROBE_RATE', 0.05)) # Chance a skipped strategy is tried first anyway
+
+# Shared outbound HTTP sessions (keep-alive pools keyed by upstream host and proxy)
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 5))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 15))
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 8)) # Connections kept per session
+HTTP_MAX_SESSIONS = int(os.getenv('HTTP_MAX_SESSIONS', 64))
+
+# Free proxy validation (concurrent checks after each pool refresh)
+PROXY_VALIDATION_WORKERS = int(os.getenv('PROXY_VALIDATION_WORKERS', 32)) # Checks in flight at once
+PROXY_VALIDATION_DEADLINE = float(os.getenv('PROXY_VALIDATION_DEADLINE', 6)) # Seconds for a whole validation round
+PROXY_VALIDATION_TIMEOUT = float(os.getenv('PROXY_VALIDATION_TIMEOUT', 3)) # Seconds per proxy check
+PROXY_VALIDATION_MAX_CHECKS = int(os.getenv('PROXY_VALIDATION_MAX_CHECKS', 500)) # Candidates tried per round
+PROXY_TARGET_POOL = int(os.getenv('PROXY_TARGET_POOL', 10)) # Verified proxies wanted before validation stops
+PROXY_SOURCE_TIMEOUT = float(os.getenv('PROXY_SOURCE_TIMEOUT', 2)) # Seconds per source list download
+PROXY_MAX_CANDIDATES = int(os.getenv('PROXY_MAX_CANDIDATES', 5000)) # Unverified proxies kept in the pool
+
+# Background proxy pool maintenance (requests never refresh the pool inline)
+PROXY_SOURCE_REFRESH_INTERVAL = int(os.getenv('PROXY_SOURCE_REFRESH_INTERVAL', 1800)) # Seconds between source list downloads
+PROXY_LOW_WATER = int(os.getenv('PROXY_LOW_WATER', 3)) # Validate more candidates when fewer verified proxies remain
+PROXY_RECHECK_AGE = int(os.getenv('PROXY_RECHECK_AGE', 600)) # Seconds before a verified proxy is checked again
+PROXY_MAINTAIN_INTERVAL = int(os.getenv('PROXY_MAINTAIN_INTERVAL', 30)) # Seconds between maintenance passes
+
+# Proxy pool persistence (warm restarts reuse the last verified set)
+PROXY_STATE_PATH = os.getenv('PROXY_STATE_PATH', os.path.join(DATA_DIR, 'proxy_state.json')) # Empty disables
+PROXY_STATE_SAVE_INTERVAL = int(os.getenv('PROXY_STATE_SAVE_INTERVAL', 300)) # Seconds between snapshots to disk
+PROXY_STATE_MAX_AGE = int(os.getenv('PROXY_STATE_MAX_AGE', 6 * 3600)) # Older snapshots are ignored on boot
+
+# yt-dlp cache directory (kept under DATA_DIR instead of ~/.cache)
+YTDLP_CACHE_DIR = os.getenv('YTDLP_CACHE_DIR', os.path.join(DATA_DIR, 'ytdlp_cache'))
+
+# Subtitle retrieval: 'memory' streams the selected track URL straight into the parser,
+# 'file' lets yt-dlp write a .vtt into a temp directory
+SUBTITLE_FETCH_MODE = os.getenv('SUBTITLE_FETCH_MODE', 'memory').lower()
+SUBTITLE_DOWNLOAD_TIMEOUT = float(os.getenv('SUBTITLE_DOWNLOAD_TIMEOUT', 10))
+SUBTITLE_CHUNK_SIZE = int(os.getenv('SUBTITLE_CHUNK_SIZE', 64 * 1024)) # Bytes read from the track response at a time
 
 app = Flask(__name__, static_folder='.', template_folder='.')
 CORS(app)
@@ -44,6 +135,22 @@ def add_header(response):
     response.headers["Expires"] = "0"
     return response
 
+def extract_collection_url(url):
+    """
+    Recognize YouTube playlist and channel URLs.
+
+    Returns:
+        tuple: (canonical_listing_url, 'playlist'|'channel'), or (None, None)
+    """
+    match = re.search(r'youtube\.com\/.*[?&]list=([\w-]+)', url)
+    if match:
+        return f"https://www.youtube.com/playlist?list={match.group(1)}", 'playlist'
+    match = re.search(r'youtube\.com\/(@[\w.-]+|channel\/[\w-]+|c\/[\w.-]+|user\/[\w.-]+)', url)
+    if match:
+        # The bare channel URL lists tabs, not videos
+        return f"https://www.youtube.com/{match.group(1)}/videos", 'channel'
+    return None, None
+
 def extract_video_id(url):
     """Extract video ID from YouTube, Vimeo, and TikTok URL formats"""
     patterns = [
@@ -85,61 +192,576 @@ def serve_static(path):
     """Serve static files"""
     return send_from_directory('.', path)
 
-def _parse_vtt(vtt_content):
-    """Parse VTT subtitle content to extract text with timestamps"""
-    lines = vtt_content.splitlines()
+# Cue timing line: "00:01:02.500 --> 00:01:05.000 align:start position:0%" (hours optional)
+_VTT_TIMING_RE = re.compile(r'((?:\d+:)?\d{1,2}:\d{2})[.,](\d{1,3})\s+-->\s+((?:\d+:)?\d{1,2}:\d{2})[.,](\d{1,3})')
+_VTT_TAG_RE = re.compile(r'<[^>]+>')
+VTT_DEDUP_WINDOW = 32 # Recent caption lines remembered for roll-up deduplication
+VTT_OVERLAP_TOLERANCE = 0.5 # Seconds between cues that still count as the same caption on screen
+
+def _hms_seconds(hms):
+    """Convert "HH:MM:SS" or "MM:SS" to whole seconds."""
+    total = 0
+    for part in hms.split(':'):
+        total = total * 60 + int(part)
+    return total
+
+def _iter_text_lines(source, chunk_size=65536):
+    """Yield decoded lines from bytes, a file object or an iterator of str/bytes chunks."""
+    if isinstance(source, bytes):
+        source = [source]
+    elif hasattr(source, 'read'):
+        stream = source
+        source = iter(lambda: stream.read(chunk_size), stream.read(0))
+
+    decoder = None
+    pending = ''
+    for chunk in source:
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+            chunk = decoder.decode(chunk)
+        if not chunk:
+            continue
+        lines = (pending + chunk).splitlines(True)
+        # The last line may continue in the next chunk (including a split \r\n)
+        pending = lines.pop() if not lines[-1].endswith('\n') else ''
+        yield from lines
+    if decoder is not None:
+        pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+def iter_vtt_segments(source):
+    """
+    Stream WebVTT cues as (start, end, text) segments in a single pass.
+
+    source can be the whole file as str/bytes, an open file (text or binary) or an
+    iterator of str/bytes chunks (e.g. a streamed HTTP response), so a multi-hour
+    track never has to be split into a list of lines. start/end are seconds; text
+    is the cue's lines with markup removed, joined by newlines. Header, NOTE/STYLE
+    blocks and cue identifiers are skipped.
+    """
+    timing_match = _VTT_TIMING_RE.match
+    tag_sub = _VTT_TAG_RE.sub
+    whole_seconds = {} # Consecutive cues share most "HH:MM:SS" prefixes
+    timing = None
     text_lines = []
-    seen_lines = set()
-    
-    current_timestamp = None
-    
-    for line in lines:
-        line = line.strip()
+    lines = io.StringIO(source, newline=None) if isinstance(source, str) else _iter_text_lines(source)
+    for raw in lines:
+        line = raw.strip()
         if not line:
+            if raw.strip('\r\n'):
+                continue # Whitespace-only lines (common in auto-captions) don't end a cue
+            # A truly empty line ends the cue
+            if text_lines:
+                yield timing[0], timing[1], '\n'.join(text_lines)
+                text_lines = []
+            timing = None
             continue
-        
-        # Skip headers
-        if line.startswith('WEBVTT') or line.startswith('Kind:') or line.startswith('Language:'):
-            continue
-            
-        # Extract timestamp (lines containing -->)
         if '-->' in line:
-            # Format: 00:00:00.000 --> 00:00:05.000
-            try:
-                start_time = line.split('-->')[0].strip()
-                # Convert 00:00:00.000 to 00:00 format
-                parts = start_time.split(':')
-                if len(parts) >= 2:
-                    # Take minutes and seconds, ignore milliseconds
-                    minutes = parts[-2]
-                    seconds = parts[-1].split('.')[0]
-                    current_timestamp = f"[{minutes}:{seconds}]"
-            except:
-                pass
-            continue
-            
-        # Skip sequence numbers
-        if line.isdigit():
+            match = timing_match(line)
+            if match:
+                if text_lines:
+                    yield timing[0], timing[1], '\n'.join(text_lines)
+                    text_lines = []
+                start_hms, start_fraction, end_hms, end_fraction = match.groups()
+                start = whole_seconds.get(start_hms)
+                if start is None:
+                    start = whole_seconds[start_hms] = _hms_seconds(start_hms)
+                end = whole_seconds.get(end_hms)
+                if end is None:
+                    end = whole_seconds[end_hms] = _hms_seconds(end_hms)
+                timing = (start + int(start_fraction) / 10 ** len(start_fraction),
+                          end + int(end_fraction) / 10 ** len(end_fraction))
             continue
-            
-        # Remove HTML-like tags
-        clean_line = re.sub(r'<[^>]+>', '', line)
-        clean_line = clean_line.strip()
-        
-        if not clean_line:
-            continue
-            
-        # Add to text if not duplicate
-        if clean_line not in seen_lines:
-            if current_timestamp:
-                text_lines.append(f"{current_timestamp} {clean_line}")
-                # Only use timestamp for the first line of a block to avoid clutter
-                current_timestamp = None 
+        if timing is None:
+            continue # Header, NOTE/STYLE/REGION block or cue identifier
+        if '<' in line:
+            line = tag_sub('', line).strip()
+            if not line:
+                continue
+        text_lines.append(line)
+    if text_lines:
+        yield timing[0], timing[1], '\n'.join(text_lines)
+
+def _format_timestamp(seconds):
+    """[MM:SS], or [H:MM:SS] past the first hour."""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"[{hours}:{minutes:02d}:{seconds:02d}]"
+    return f"[{minutes:02d}:{seconds:02d}]"
+
+def render_flat_transcript(segments, window=VTT_DEDUP_WINDOW, tolerance=VTT_OVERLAP_TOLERANCE):
+    """
+    Render segments as the flat transcript text used throughout the app:
+    "[MM:SS] line line [MM:SS] line ...".
+
+    Auto-captions "roll up": each line is repeated in the next one or two cues, which
+    overlap or abut the cue that introduced it, and progressive captions grow a line
+    word by word. A line is dropped only if a cue ending within `tolerance` seconds of
+    this cue's start already showed it, and a line that extends the previous one by
+    whole words replaces it ("Yes" is not merged into "Yesterday"). Phrases genuinely
+    said again later (choruses, repeated instructions) are kept. Only the last
+    `window` distinct lines are remembered.
+    """
+    parts = [] # [timestamp or None, line]
+    recent = OrderedDict() # line -> end of the latest cue that showed it
+    last_shown_until = None # End of the cue that last added or grew parts[-1]
+    for start, end, text in segments:
+        first = True
+        for line in text.split('\n'):
+            # Skip bare numbers (sequence numbers in malformed files)
+            if line.isdigit():
+                continue
+            shown_until = recent.pop(line, None)
+            recent[line] = end
+            if len(recent) > window:
+                recent.popitem(last=False)
+            if shown_until is not None and shown_until >= start - tolerance:
+                continue # Rolled-up repeat of a line still on screen
+            if (parts and last_shown_until >= start - tolerance
+                    and (line == parts[-1][1] or line.startswith(parts[-1][1] + ' '))):
+                # Progressive caption: the previous line grew by whole words
+                parts[-1][1] = line
+                last_shown_until = end
+                continue
+            # Only use timestamp for the first line of a block to avoid clutter
+            parts.append([_format_timestamp(start) if first else None, line])
+            last_shown_until = end
+            first = False
+    return " ".join(f"{timestamp} {line}" if timestamp else line for timestamp, line in parts)
+
+def format_transcript_items(transcript_list):
+    """Render youtube-transcript-api items (dicts with 'start' and 'text') as flat transcript text."""
+    formatted_lines = []
+    for item in transcript_list:
+        start = item['start']
+        minutes = int(start // 60)
+        seconds = int(start % 60)
+        timestamp = f"[{minutes:02d}:{seconds:02d}]"
+        formatted_lines.append(f"{timestamp} {item['text']}")
+    return " ".join(formatted_lines)
+
+# A rendered timestamp, e.g. "[01:05] " or "[1:02:05] "
+_FLAT_TIMESTAMP_RE = re.compile(r'\[(?:\d+:)?\d+:\d{2}\] ')
+
+def fit_transcript(transcript_text, max_chars=MAX_TRANSCRIPT_LENGTH):
+    """
+    Cut flat transcript text to max_chars before a timestamp, so a prompt never ends
+    mid-line or mid-timestamp. Text that fits is returned as is.
+    """
+    if len(transcript_text) <= max_chars:
+        return transcript_text
+    cut = transcript_text.rfind(' [', 0, max_chars + 1)
+    while cut > 0 and not _FLAT_TIMESTAMP_RE.match(transcript_text, cut + 1):
+        cut = transcript_text.rfind(' [', 0, cut) # Bracketed caption text such as "[Music]"
+    return transcript_text[:cut] if cut > 0 else transcript_text[:max_chars] # No timestamp (e.g. description fallback)
+
+def _parse_vtt(vtt_content):
+    """
+    Parse VTT subtitle content to extract text with timestamps.
+
+    vtt_content is anything iter_vtt_segments accepts: a str, or the byte chunks of a
+    streamed download, which are parsed as they arrive.
+    """
+    return render_flat_transcript(iter_vtt_segments(vtt_content))
+
+class _TimeoutHTTPAdapter(requests.adapters.HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to requests made without one."""
+    def __init__(self, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+class HttpSessionRegistry:
+    """
+    Shared pooled requests sessions for all outbound HTTP calls.
+
+    Sessions are keyed by (upstream host, proxy, cookie set), so repeat calls to the
+    same host through the same proxy reuse a keep-alive connection instead of paying
+    a fresh TCP/TLS handshake. Each session has a bounded connection pool and default
+    (connect, read) timeouts; the number of sessions is bounded too, evicting the
+    least recently used one because proxies churn.
+    """
+    def __init__(self, max_sessions=64, pool_maxsize=8, connect_timeout=5.0, read_timeout=15.0):
+        self.max_sessions = max_sessions
+        self.pool_maxsize = pool_maxsize
+        self.timeout = (connect_timeout, read_timeout)
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0, 'evicted': 0}
+
+    @staticmethod
+    def _host(url):
+        parsed = urlparse(url if '://' in url else f"https://{url}")
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def get(self, url, proxy=None, cookie_set=None):
+        """Return the shared session for the host of url, optionally through proxy."""
+        key = (self._host(url), proxy, cookie_set.key if cookie_set else None)
+        evicted = []
+        with self.lock:
+            session = self.sessions.get(key)
+            if session is not None:
+                self.sessions.move_to_end(key)
+                self.stats['reused'] += 1
+                return session
+            session = requests.Session()
+            adapter = _TimeoutHTTPAdapter(timeout=self.timeout, pool_connections=1, pool_maxsize=self.pool_maxsize)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            if proxy:
+                session.proxies = {'http': proxy, 'https': proxy}
+            if cookie_set:
+                cookie_set.copy_into(session.cookies)
+            self.sessions[key] = session
+            self.stats['created'] += 1
+            while len(self.sessions) > self.max_sessions:
+                evicted.append(self.sessions.popitem(last=False)[1])
+                self.stats['evicted'] += 1
+        for stale in evicted:
+            stale.close()
+        return session
+
+    def discard_proxy(self, proxy):
+        """Close all sessions that go through a proxy (e.g. after it failed)."""
+        with self.lock:
+            keys = [key for key in self.sessions if key[1] == proxy]
+            stale = [self.sessions.pop(key) for key in keys]
+            self.stats['evicted'] += len(stale)
+        for session in stale:
+            session.close()
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, open=len(self.sessions))
+
+# Global session registry shared by proxy refresh/validation, transcript API and subtitle downloads
+http_sessions = HttpSessionRegistry(
+    max_sessions=HTTP_MAX_SESSIONS,
+    pool_maxsize=HTTP_POOL_MAXSIZE,
+    connect_timeout=HTTP_CONNECT_TIMEOUT,
+    read_timeout=HTTP_READ_TIMEOUT
+)
+
+class IndexedSet:
+    """Set with O(1) add, remove and uniform random choice: a list plus each item's position."""
+    def __init__(self, items=()):
+        self.items = []
+        self.positions = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        if item in self.positions:
+            return False
+        self.positions[item] = len(self.items)
+        self.items.append(item)
+        return True
+
+    def discard(self, item):
+        position = self.positions.pop(item, None)
+        if position is None:
+            return False
+        # Move the last item into the hole instead of shifting the list
+        last = self.items.pop()
+        if position < len(self.items):
+            self.items[position] = last
+            self.positions[last] = position
+        return True
+
+    def choice(self):
+        return random.choice(self.items) if self.items else None
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+class ProxyHealth:
+    """Moving averages of one proxy's success rate and latency (checks and real requests)."""
+    __slots__ = ('url', 'success_rate', 'latency', 'checked_at', 'uses', 'failures')
+
+    def __init__(self, url, latency=None, checked_at=0):
+        self.url = url
+        self.success_rate = 1.0 # Optimistic start, like cookie sets
+        self.latency = latency
+        self.checked_at = checked_at
+        self.uses = 0
+        self.failures = 0
+
+ProxySnapshot = namedtuple('ProxySnapshot', ['verified', 'cum_weights', 'candidates'])
+
+class ProxyPool:
+    """
+    Candidate and verified proxies, indexed by protocol and scored by health.
+
+    Every proxy is indexed under 'any' and, unless it is SOCKS, under 'http', so a
+    protocol filter is a dictionary lookup and removal is constant time. Verified
+    proxies carry a ProxyHealth; selection among them is weighted by success rate
+    over latency, so the fastest reliable proxies carry most of the traffic. A proxy
+    whose success rate falls below MIN_SUCCESS_RATE is dropped from the pool.
+
+    Writers are serialized by a lock and finish by publishing a new immutable
+    ProxySnapshot (tuples of URLs and cumulative weights per index). Readers (pick and
+    the views) only read the current snapshot, so selection never takes the lock and
+    never sees a half-applied update.
+
+    The verified tuples are small and republished on every change. The candidate
+    tuples (up to PROXY_MAX_CANDIDATES) are only rebuilt when a refresh changes them
+    or once the dropped candidates still listed there exceed STALE_CANDIDATES of the
+    snapshot. A dropped candidate therefore costs amortized constant time. Readers
+    skip stale candidates by checking the live index.
+    """
+    SUCCESS_ALPHA = 0.3 # Weight of the latest outcome in the success rate average
+    LATENCY_ALPHA = 0.3 # Weight of the latest check or request in the latency average
+    MIN_SUCCESS_RATE = 0.5 # Two failures in a row drop a proxy
+    MIN_WEIGHT = 0.05 # Slow or flaky proxies still get an occasional chance to recover
+    DEFAULT_LATENCY = 1.0 # Seconds assumed until a proxy has been timed
+    STALE_CANDIDATES = 0.1 # Share of dropped candidates the published tuples may still list
+    PICK_TRIES = 8 # Random draws before pick gives up skipping stale candidates
+    INDEXES = ('any', 'http')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.candidates = {index: IndexedSet() for index in self.INDEXES}
+        self.verified = {index: IndexedSet() for index in self.INDEXES}
+        self.health = {}
+        self.stale_candidates = 0 # Dropped since the candidate tuples were last published
+        empty = {index: () for index in self.INDEXES}
+        self.snapshot = ProxySnapshot(empty, empty, empty)
+
+    @staticmethod
+    def _indexes(url):
+        return ('any',) if url.startswith('socks') else ('any', 'http')
+
+    def _publish(self, candidates_changed=False):
+        """
+        Publish the current state to readers. Call with the lock held.
+
+        The candidate tuples are rebuilt if candidates_changed, or if enough dropped
+        candidates have piled up in them (see STALE_CANDIDATES).
+        """
+        verified, cum_weights = {}, {}
+        for index in self.INDEXES:
+            urls = tuple(self.verified[index])
+            total = 0.0
+            cumulative = []
+            for url in urls:
+                health = self.health[url]
+                total += max(health.success_rate, self.MIN_WEIGHT) / (health.latency or self.DEFAULT_LATENCY)
+                cumulative.append(total)
+            verified[index] = urls
+            cum_weights[index] = tuple(cumulative)
+        published = self.snapshot.candidates
+        if candidates_changed or self.stale_candidates > len(published['any']) * self.STALE_CANDIDATES:
+            candidates = {index: tuple(self.candidates[index]) for index in self.INDEXES}
+            self.stale_candidates = 0
+        else:
+            candidates = published
+        self.snapshot = ProxySnapshot(verified, cum_weights, candidates)
+
+    def set_candidates(self, urls):
+        """Replace the unverified candidates (verified proxies are kept)."""
+        candidates = {index: IndexedSet() for index in self.INDEXES}
+        for url in urls:
+            for index in self._indexes(url):
+                candidates[index].add(url)
+        with self.lock:
+            self.candidates = candidates
+            self._publish(candidates_changed=True)
+
+    def merge_candidates(self, added, removed, limit=None):
+        """
+        Apply a source refresh in place: add new candidates (up to `limit` in total) and
+        drop the ones no source lists any more. Verified proxies and their health are kept.
+
+        Returns:
+            int: Candidates actually added.
+        """
+        count = 0
+        with self.lock:
+            for url in removed:
+                if url not in self.health:
+                    for index in self._indexes(url):
+                        self.candidates[index].discard(url)
+            for url in added:
+                if limit is not None and len(self.candidates['any']) >= limit:
+                    break
+                for index in self._indexes(url):
+                    if self.candidates[index].add(url) and index == 'any':
+                        count += 1
+            self._publish(candidates_changed=True)
+        return count
+
+    def add_verified(self, url, latency=None):
+        """Record a proxy that passed a check (and how long the check took)."""
+        with self.lock:
+            self._add_verified(url, latency)
+            self._publish()
+
+    def reset_verified(self, entries):
+        """Replace the verified set with (url, latency) entries, e.g. after a full revalidation."""
+        with self.lock:
+            self.verified = {index: IndexedSet() for index in self.INDEXES}
+            self.health = {}
+            for url, latency in entries:
+                self._add_verified(url, latency)
+            self._publish()
+
+    def _add_verified(self, url, latency):
+        health = self.health.get(url)
+        if health is None:
+            health = self.health[url] = ProxyHealth(url)
+            for index in self._indexes(url):
+                self.verified[index].add(url)
+        health.checked_at = time.time()
+        self._update_latency(health, latency)
+
+    def _update_latency(self, health, latency):
+        if latency is not None:
+            if health.latency is None:
+                health.latency = latency
             else:
-                text_lines.append(clean_line)
-            seen_lines.add(clean_line)
-            
-    return " ".join(text_lines)
+                health.latency += self.LATENCY_ALPHA * (latency - health.latency)
+
+    def record(self, url, success, latency=None):
+        """
+        Update a proxy's success rate after it was used, and its latency average with
+        how long a successful request took (if measured).
+
+        Returns:
+            bool: True if the proxy was dropped.
+        """
+        with self.lock:
+            health = self.health.get(url)
+            if health is None:
+                if success or url not in self.candidates['any']:
+                    return False
+                self._remove(url)
+                self._publish()
+                return True
+            health.uses += 1
+            outcome = 1.0 if success else 0.0
+            health.success_rate += self.SUCCESS_ALPHA * (outcome - health.success_rate)
+            dropped = False
+            if success:
+                health.checked_at = time.time()
+                self._update_latency(health, latency)
+            else:
+                health.failures += 1
+                if health.success_rate < self.MIN_SUCCESS_RATE:
+                    self._remove(url)
+                    dropped = True
+            self._publish()
+            return dropped
+
+    def remove(self, url):
+        with self.lock:
+            self._remove(url)
+            self._publish()
+
+    def _remove(self, url):
+        """Drop a proxy from every index. Call with the lock held; the caller publishes."""
+        self.health.pop(url, None)
+        for index in self._indexes(url):
+            self.verified[index].discard(url)
+            if self.candidates[index].discard(url) and index == 'any':
+                self.stale_candidates += 1
+
+    def export(self):
+        """JSON-serializable copy of the candidates and verified proxies with their health."""
+        with self.lock:
+            return {
+                'candidates': list(self.candidates['any']),
+                'verified': [
+                    {'url': h.url, 'success_rate': h.success_rate, 'latency': h.latency,
+                     'checked_at': h.checked_at, 'uses': h.uses, 'failures': h.failures}
+                    for h in self.health.values()
+                ]
+            }
+
+    def restore(self, state):
+        """
+        Load an export(). Restored proxies keep their scores but count as unchecked,
+        so the next maintenance pass re-verifies them.
+        """
+        candidates = {index: IndexedSet() for index in self.INDEXES}
+        for url in state.get('candidates', []):
+            for index in self._indexes(url):
+                candidates[index].add(url)
+        with self.lock:
+            self.candidates = candidates
+            self.verified = {index: IndexedSet() for index in self.INDEXES}
+            self.health = {}
+            for entry in state.get('verified', []):
+                health = ProxyHealth(entry['url'], latency=entry.get('latency'))
+                health.success_rate = entry.get('success_rate', 1.0)
+                health.uses = entry.get('uses', 0)
+                health.failures = entry.get('failures', 0)
+                self.health[health.url] = health
+                for index in self._indexes(health.url):
+                    self.verified[index].add(health.url)
+            self._publish(candidates_changed=True)
+
+    def pick(self, protocol_filter=None):
+        """A verified proxy weighted by score, else a random candidate, else None. Lock-free."""
+        snapshot = self.snapshot # Read once: writers replace it, never modify it
+        index = 'http' if protocol_filter == 'http' else 'any'
+        verified = snapshot.verified[index]
+        if verified:
+            return random.choices(verified, cum_weights=snapshot.cum_weights[index])[0]
+        candidates = snapshot.candidates[index]
+        if not candidates:
+            return None
+        live = self.candidates[index]
+        for _ in range(self.PICK_TRIES):
+            url = random.choice(candidates)
+            if url in live: # The snapshot may still list a dropped candidate
+                return url
+        return url
+
+    def is_candidate(self, url):
+        """True if url is still a candidate (the published tuples may lag behind). Lock-free."""
+        return url in self.candidates['any']
+
+    def candidate_urls(self, index='any'):
+        """Published candidates without the ones dropped since (a tuple). Lock-free."""
+        published = self.snapshot.candidates[index]
+        if not self.stale_candidates:
+            return published
+        live = self.candidates[index]
+        return tuple(url for url in published if url in live)
+
+    def stale(self, max_age):
+        """Verified proxies not confirmed in the last max_age seconds."""
+        cutoff = time.time() - max_age
+        with self.lock:
+            return [url for url, health in self.health.items() if health.checked_at < cutoff]
+
+    def get_stats(self, top=5):
+        with self.lock:
+            fastest = sorted(self.health.values(), key=lambda h: h.latency or self.DEFAULT_LATENCY)[:top]
+            return {
+                'candidates': len(self.candidates['any']),
+                'verified': len(self.verified['any']),
+                'verified_http': len(self.verified['http']),
+                'fastest': [
+                    {'proxy': h.url, 'latency': round(h.latency, 3) if h.latency is not None else None,
+                     'success_rate': round(h.success_rate, 3), 'uses': h.uses, 'failures': h.failures}
+                    for h in fastest
+                ]
+            }
 
 class FreeProxyManager:
     """
@@ -150,12 +772,67 @@ class FreeProxyManager:
     2. Validating these proxies to ensure they work with YouTube.
     3. maintaining a list of verified working proxies.
     4. Rotating through proxies to avoid IP bans.
+
+    A background maintainer thread (started by the first get_proxy call) does the
+    refreshing and validation, so get_proxy always answers from the ready pool.
+    Proxies live in a ProxyPool that scores them by success rate and latency.
     """
-    def __init__(self):
-        self.proxies = []
+    # Source 1: GitHub Proxy Lists (Prioritize SOCKS)
+    SOURCES = [
+        "https://raw.githubusercontent.com/TheSpeedX/SOCKS-List/master/socks5.txt",
+        "https://raw.githubusercontent.com/TheSpeedX/SOCKS-List/master/socks4.txt",
+        "https://raw.githubusercontent.com/monosans/proxy-list/main/proxies/socks5.txt",
+        "https://raw.githubusercontent.com/monosans/proxy-list/main/proxies/socks4.txt",
+        "https://raw.githubusercontent.com/roosterkid/openproxylist/main/SOCKS5_RAW.txt",
+        "https://raw.githubusercontent.com/roosterkid/openproxylist/main/SOCKS4_RAW.txt",
+        # HTTP proxies are often unreliable for HTTPS, put them last
+        "https://raw.githubusercontent.com/TheSpeedX/SOCKS-List/master/http.txt", 
+        "https://raw.githubusercontent.com/monosans/proxy-list/main/proxies/http.txt",
+    ]
+    CHECK_URL = 'https://www.youtube.com/results?search_query=test'
+
+    def __init__(self, refresh_interval=PROXY_SOURCE_REFRESH_INTERVAL, low_water=PROXY_LOW_WATER,
+                 recheck_age=PROXY_RECHECK_AGE, maintain_interval=PROXY_MAINTAIN_INTERVAL,
+                 state_path=None, save_interval=PROXY_STATE_SAVE_INTERVAL):
+        self.pool = ProxyPool()
         self.last_update = 0
-        self.working_proxy = None
-        self.verified_proxies = []
+        self.source_state = {} # source URL -> proxies it lists, ETag/Last-Modified and last fetch time
+        self.state_path = state_path
+        self.save_interval = save_interval
+        self.last_saved = time.time()
+        self.refresh_interval = refresh_interval
+        self.low_water = low_water
+        self.recheck_age = recheck_age
+        self.maintain_interval = maintain_interval
+        self.refresh_sources = True
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.start_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.source_lock = threading.Lock() # source_state is written by the sync or async refresher and read by save_state
+        self.stats = {'refreshes': 0, 'top_ups': 0, 'rechecked': 0, 'dropped': 0, 'last_maintenance': None}
+
+    @property
+    def proxies(self):
+        """All candidate proxy URLs (tuple from the current snapshot)."""
+        return self.pool.candidate_urls()
+
+    @proxies.setter
+    def proxies(self, urls):
+        self.pool.set_candidates(urls)
+
+    @property
+    def verified_proxies(self):
+        """Verified proxy URLs (tuple from the current snapshot)."""
+        return self.pool.snapshot.verified['any']
+
+    @verified_proxies.setter
+    def verified_proxies(self, urls):
+        self.pool.reset_verified((url, None) for url in urls)
+
+    def _count(self, stat, amount=1):
+        with self.stats_lock:
+            self.stats[stat] += amount
         
     def get_proxy(self, protocol_filter=None):
         """
@@ -164,34 +841,13 @@ class FreeProxyManager:
         Args:
             protocol_filter (str): Optional. 'http' to enforce HTTP/HTTPS proxies only.
         """
-        # If we have a known working proxy, try it first
-        if self.working_proxy:
-            if not protocol_filter or (protocol_filter == 'http' and not self.working_proxy['http'].startswith('socks')):
-                return self.working_proxy
-            
-        # If we have verified proxies, return one
-        if self.verified_proxies:
-            candidates = self.verified_proxies
-            if protocol_filter == 'http':
-                candidates = [p for p in candidates if not p.startswith('socks')]
-            
-            if candidates:
-                proxy = random.choice(candidates)
-                return {'http': proxy, 'https': proxy}
-            
-        # Update pool if empty or old (older than 30 minutes)
-        if not self.proxies or time.time() - self.last_update > 1800:
-            self._refresh_proxies()
-            
-        # If we still have no verified proxies, try unverified ones as fallback
-        if self.proxies:
-            candidates = self.proxies
-            if protocol_filter == 'http':
-                candidates = [p for p in candidates if not p.startswith('socks')]
-                
-            if candidates:
-                proxy = random.choice(candidates)
-                return {'http': proxy, 'https': proxy}
+        # Refresh and validation happen in the background, never on the request path
+        self.start_maintainer()
+        
+        # Verified proxies weighted by score; unverified ones as fallback
+        proxy = self.pool.pick(protocol_filter)
+        if proxy:
+            return {'http': proxy, 'https': proxy}
         return None
         
     def _refresh_proxies(self):
@@ -199,112 +855,260 @@ class FreeProxyManager:
         Fetch fresh proxies from multiple free sources.
         
         Sources include various GitHub repositories that maintain lists of free HTTP, SOCKS4, and SOCKS5 proxies.
+        All lists are downloaded in parallel with conditional requests, so an unchanged
+        list costs a 304; changed lists are merged into the pool in place.
         """
         print("🔄 Refreshing free proxy list from multiple sources...")
-        self.proxies = []
-        self.verified_proxies = []
-        
-        # Source 1: GitHub Proxy Lists (Prioritize SOCKS)
-        github_sources = [
-            "https://raw.githubusercontent.com/TheSpeedX/SOCKS-List/master/socks5.txt",
-            "https://raw.githubusercontent.com/TheSpeedX/SOCKS-List/master/socks4.txt",
-            "https://raw.githubusercontent.com/monosans/proxy-list/main/proxies/socks5.txt",
-            "https://raw.githubusercontent.com/monosans/proxy-list/main/proxies/socks4.txt",
-            "https://raw.githubusercontent.com/roosterkid/openproxylist/main/SOCKS5_RAW.txt",
-            "https://raw.githubusercontent.com/roosterkid/openproxylist/main/SOCKS4_RAW.txt",
-            # HTTP proxies are often unreliable for HTTPS, put them last
-            "https://raw.githubusercontent.com/TheSpeedX/SOCKS-List/master/http.txt", 
-            "https://raw.githubusercontent.com/monosans/proxy-list/main/proxies/http.txt",
-        ]
+        started = time.time()
         
-        for url in github_sources:
-            # Stop if we have enough proxies
-            if len(self.proxies) > 2000:
-                break
-
+        def fetch(url):
             try:
-                print(f"📥 Fetching from {url}...")
-                resp = requests.get(url, timeout=2)
-                if resp.status_code == 200:
-                    # Extract IP:Port patterns
-                    matches = re.findall(r'(\d+\.\d+\.\d+\.\d+:\d+)', resp.text)
-                    print(f"   Found {len(matches)} proxies")
-                    
-                    # Determine protocol based on URL
-                    protocol = "http"
-                    if "socks5" in url:
-                        protocol = "socks5"
-                    elif "socks4" in url:
-                        protocol = "socks4"
-                        
-                    # Add valid looking proxies
-                    for proxy in matches:
-                        self.proxies.append(f"{protocol}://{proxy}")
+                resp = http_sessions.get(url).get(url, headers=self._source_headers(url), timeout=PROXY_SOURCE_TIMEOUT)
+                return url, resp.status_code, resp.text if resp.status_code == 200 else '', resp.headers
             except Exception as e:
                 print(f"⚠️ Failed to fetch from {url}: {e}")
-                continue
-
-        # Deduplicate
-        self.proxies = list(set(self.proxies))
+                return url, None, '', {}
         
-        # Sort to put HTTP proxies first (more reliable protocol-wise)
-        self.proxies.sort(key=lambda x: 1 if x.startswith('socks') else 0)
+        with ThreadPoolExecutor(max_workers=len(self.SOURCES), thread_name_prefix='proxy-source') as executor:
+            responses = list(executor.map(fetch, self.SOURCES))
+        changed, unchanged = self._merge_sources(responses)
+        if not changed and not unchanged:
+            return # Keep the current pool; the maintainer tries again on its next pass
         
-        print(f"✅ Total unique proxies found: {len(self.proxies)}")
+        self.last_update = time.time()
+        self._count('refreshes')
+        print(f"✅ Sources refreshed in {time.time() - started:.2f}s: {changed} changed, {unchanged} unchanged, "
+              f"{len(self.proxies)} candidates")
         
         # Validate a subset to find working ones immediately
-        self._validate_initial_batch()
-        
-        self.last_update = time.time()
-
-    def _validate_initial_batch(self):
+        if changed:
+            self._validate_initial_batch()
+
+    def _source_headers(self, url):
+        """Conditional request headers from the last download of a source."""
+        with self.source_lock:
+            state = dict(self.source_state.get(url) or {})
+        headers = {}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+        return headers
+
+    def _merge_sources(self, responses):
         """
-        Validate a batch of proxies to find some working ones quickly.
+        Merge source downloads, given as (url, status_code, text, headers), into the pool.
+
+        Only lists that changed are parsed. Their new entries are added and entries no
+        source lists any more are dropped, without rebuilding the pool or touching the
+        health of verified proxies.
+
+        Returns:
+            tuple: (changed, unchanged) source counts.
         """
-        print("🕵️ Validating random subset of proxies...")
-        
-        # Take top 50 (mostly HTTP due to sort) and some random ones
-        top_proxies = self.proxies[:50]
-        random_proxies = random.sample(self.proxies[50:], min(50, len(self.proxies[50:]))) if len(self.proxies) > 50 else []
-        
-        test_batch = top_proxies + random_proxies
-        random.shuffle(test_batch)
+        added, removed = [], set()
+        changed = unchanged = 0
+        for url, status_code, text, headers in responses:
+            if status_code == 304:
+                with self.source_lock:
+                    self.source_state.setdefault(url, {})['fetched_at'] = time.time()
+                unchanged += 1
+                continue
+            if status_code != 200:
+                if status_code is not None:
+                    print(f"⚠️ Failed to fetch from {url}: HTTP {status_code}")
+                continue
+            proxies = self._parse_proxy_list(url, text)
+            current = set(proxies)
+            with self.source_lock:
+                state = self.source_state.setdefault(url, {})
+                previous = set(state.get('proxies', ()))
+                state.update(
+                    proxies=list(dict.fromkeys(proxies)),
+                    etag=headers.get('ETag'),
+                    last_modified=headers.get('Last-Modified'),
+                    fetched_at=time.time()
+                )
+            added.extend(p for p in proxies if p not in previous)
+            removed |= previous - current
+            changed += 1
+        if removed:
+            # Still fine if another source lists it
+            with self.source_lock:
+                for state in self.source_state.values():
+                    removed.difference_update(state.get('proxies', ()))
+        if added or removed:
+            self.pool.merge_candidates(added, removed, limit=PROXY_MAX_CANDIDATES)
+        return changed, unchanged
+
+    @staticmethod
+    def _parse_proxy_list(url, text):
+        """Turn a raw proxy list from one of the sources into proxy URLs."""
+        # Extract IP:Port patterns
+        matches = re.findall(r'(\d+\.\d+\.\d+\.\d+:\d+)', text)
+        print(f"   Found {len(matches)} proxies")
+        
+        # Determine protocol based on URL
+        protocol = "http"
+        if "socks5" in url:
+            protocol = "socks5"
+        elif "socks4" in url:
+            protocol = "socks4"
+            
+        # Add valid looking proxies
+        return [f"{protocol}://{proxy}" for proxy in matches]
 
-        
-        # Limit the number of checks to avoid hanging for too long
-        max_checks = 15 
-        
-        for i, proxy_url in enumerate(test_batch):
-            if i >= max_checks:
-                print(f"⚠️ Reached maximum validation checks ({max_checks}). Stopping validation.")
-                break
+    def _validate_initial_batch(self, target=PROXY_TARGET_POOL, deadline=PROXY_VALIDATION_DEADLINE,
+                                workers=PROXY_VALIDATION_WORKERS):
+        """
+        Validate candidates concurrently until `target` proxies work or `deadline` seconds pass.
 
-            if self._check_proxy(proxy_url):
-                self.verified_proxies.append(proxy_url)
-                print(f"   ✅ Working proxy found: {proxy_url}")
-                if len(self.verified_proxies) >= 3: # Stop after finding 3 good ones (reduced from 5)
+        Up to `workers` checks run at once; each finished check is replaced by the next
+        candidate. Checks still running at the deadline are abandoned, not waited for.
+        """
+        print(f"🕵️ Validating proxies ({workers} at a time, up to {deadline:g}s)...")
+        started = time.time()
+        candidates = (p for p in self._validation_batch() if p not in self.pool.health)
+        pending = {}
+        checked = 0
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='proxy-check')
+        try:
+            while len(self.verified_proxies) < target:
+                while len(pending) < workers:
+                    proxy_url = next(candidates, None)
+                    if proxy_url is None:
+                        break
+                    pending[executor.submit(self._timed_check, proxy_url)] = proxy_url
+                remaining = started + deadline - time.time()
+                if not pending or remaining <= 0:
                     break
-            
-            if i % 5 == 0:
-                print(f"   Checked {i} proxies...")
-        
-        print(f"🎉 Found {len(self.verified_proxies)} verified working proxies")
+                done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    proxy_url = pending.pop(future)
+                    checked += 1
+                    ok, latency = future.result()
+                    if ok and len(self.verified_proxies) < target:
+                        self.pool.add_verified(proxy_url, latency)
+                        print(f"   ✅ Working proxy found: {proxy_url} ({latency:.2f}s)")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        print(f"🎉 Found {len(self.verified_proxies)} verified working proxies "
+              f"({checked} checked in {time.time() - started:.1f}s)")
+
+    def _validation_batch(self, limit=PROXY_VALIDATION_MAX_CHECKS):
+        """Order the candidates to validate after a refresh, most promising first."""
+        # 50 HTTP proxies (more reliable protocol-wise) and 50 random ones first, then the rest of the pool
+        top_proxies = list(self.pool.candidate_urls('http')[:50])
+        top = set(top_proxies)
+        rest = [p for p in self.pool.candidate_urls('any') if p not in top]
+        random_proxies = random.sample(rest, len(rest))
+        
+        test_batch = top_proxies + random_proxies[:50]
+        random.shuffle(test_batch)
+        return (test_batch + random_proxies[50:])[:limit]
+
+    def _timed_check(self, proxy_url):
+        """Run _check_proxy and time it: (works, seconds)."""
+        started = time.time()
+        ok = self._check_proxy(proxy_url)
+        return ok, time.time() - started
 
     def _check_proxy(self, proxy_url):
         """
         Check if a proxy actually works with YouTube.
         """
         try:
-            proxies = {'http': proxy_url, 'https': proxy_url}
-            # Reduced timeout from 5s to 3s to fail faster
-            resp = requests.get('https://www.youtube.com/results?search_query=test', proxies=proxies, timeout=3)
-            return resp.status_code == 200
+            # A working proxy keeps its pooled connection for the transcript fetch that follows
+            resp = http_sessions.get(self.CHECK_URL, proxy=proxy_url).get(self.CHECK_URL, timeout=PROXY_VALIDATION_TIMEOUT)
+            if resp.status_code == 200:
+                return True
         except:
+            pass
+        http_sessions.discard_proxy(proxy_url)
+        return False
+
+    async def refresh_async(self, target=PROXY_TARGET_POOL, deadline=PROXY_VALIDATION_DEADLINE,
+                            workers=PROXY_VALIDATION_WORKERS):
+        """
+        Non-blocking refresh for the ASGI server: fetch all sources and validate
+        candidates concurrently with httpx, with the same target and deadline as
+        _validate_initial_batch.
+        """
+        import httpx # Only needed in async serving mode
+        
+        print("🔄 Refreshing free proxy list from multiple sources (async)...")
+        async with httpx.AsyncClient(timeout=PROXY_SOURCE_TIMEOUT) as client:
+            responses = await asyncio.gather(
+                *(client.get(url, headers=self._source_headers(url)) for url in self.SOURCES), return_exceptions=True
+            )
+        
+        downloads = []
+        for url, resp in zip(self.SOURCES, responses):
+            if isinstance(resp, Exception):
+                print(f"⚠️ Failed to fetch from {url}: {resp}")
+            else:
+                downloads.append((url, resp.status_code, resp.text if resp.status_code == 200 else '', resp.headers))
+        changed, unchanged = self._merge_sources(downloads)
+        if not changed and not unchanged:
+            return # Keep the current pool; try again on the next cycle
+        self.last_update = time.time()
+        self._count('refreshes')
+        if not changed:
+            return # Every list answered 304: nothing new to validate
+        
+        # New candidates only, added to the scored pool; httpx has no SOCKS4 support
+        candidates = iter([p for p in self._validation_batch()
+                           if not p.startswith('socks4') and p not in self.pool.health])
+        loop = asyncio.get_running_loop()
+        stop_at = loop.time() + deadline
+        pending = {}
+        try:
+            while len(self.verified_proxies) < target:
+                while len(pending) < workers:
+                    proxy_url = next(candidates, None)
+                    if proxy_url is None:
+                        break
+                    pending[asyncio.ensure_future(self._timed_check_async(proxy_url))] = proxy_url
+                remaining = stop_at - loop.time()
+                if not pending or remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    proxy_url = pending.pop(task)
+                    ok, latency = task.result()
+                    if ok and len(self.verified_proxies) < target:
+                        self.pool.add_verified(proxy_url, latency)
+        finally:
+            for task in pending:
+                task.cancel()
+        print(f"🎉 Found {len(self.verified_proxies)} verified working proxies")
+
+    async def _timed_check_async(self, proxy_url):
+        """Run _check_proxy_async and time it: (works, seconds)."""
+        started = time.time()
+        ok = await self._check_proxy_async(proxy_url)
+        return ok, time.time() - started
+
+    async def _check_proxy_async(self, proxy_url):
+        """
+        Check if a proxy actually works with YouTube, without blocking a thread.
+        """
+        import httpx
+        
+        try:
+            async with httpx.AsyncClient(proxy=proxy_url, timeout=PROXY_VALIDATION_TIMEOUT) as client:
+                resp = await client.get(self.CHECK_URL)
+                return resp.status_code == 200
+        except Exception:
             return False
 
     def mark_failed(self, proxy_dict):
         """
-        Mark a proxy as failed so it isn't used again immediately.
+        Record a failed request through a proxy.
+        
+        Unverified proxies are dropped right away; verified ones lose score and are
+        dropped once their success rate falls below ProxyPool.MIN_SUCCESS_RATE.
         
         Args:
             proxy_dict (dict): The proxy dictionary that failed.
@@ -312,61 +1116,517 @@ class FreeProxyManager:
         if not proxy_dict:
             return
         proxy_url = proxy_dict.get('http')
-        
-        if proxy_url in self.verified_proxies:
-            self.verified_proxies.remove(proxy_url)
-            
-        if proxy_url in self.proxies:
-            self.proxies.remove(proxy_url)
-            
-        if self.working_proxy == proxy_dict:
-            self.working_proxy = None
+        http_sessions.discard_proxy(proxy_url)
+        if self.pool.record(proxy_url, False):
+            self._count('dropped')
 
-    def report_success(self, proxy_url):
+    def report_success(self, proxy_url, latency=None):
         """
         Report a proxy as working so it's preferred next time.
+
+        Args:
+            proxy_url (str): The proxy that served the request.
+            latency (float): Optional. Seconds the request took, fed into the latency average.
         """
         if not proxy_url:
             return
             
-        # Add to verified list if not already there
-        if proxy_url not in self.verified_proxies:
-            self.verified_proxies.append(proxy_url)
-            
-        # Set as current working proxy
-        self.working_proxy = {'http': proxy_url, 'https': proxy_url}
+        # Add to the verified set if not already there
+        if proxy_url not in self.pool.health:
+            self.pool.add_verified(proxy_url)
+        self.pool.record(proxy_url, True, latency)
+
+    def _recheck_verified(self):
+        """
+        Check again the verified proxies not confirmed in the last recheck_age seconds
+        and drop the ones that stopped working.
+        """
+        stale = self.pool.stale(self.recheck_age)
+        if not stale:
+            return
+        with ThreadPoolExecutor(max_workers=min(len(stale), PROXY_VALIDATION_WORKERS), thread_name_prefix='proxy-check') as executor:
+            results = list(executor.map(self._timed_check, stale))
+        
+        dead = 0
+        for proxy_url, (ok, latency) in zip(stale, results):
+            if ok:
+                self.pool.add_verified(proxy_url, latency)
+            else:
+                self.pool.remove(proxy_url)
+                dead += 1
+        self._count('rechecked', len(stale))
+        self._count('dropped', dead)
+        print(f"🔁 Re-checked {len(stale)} verified proxies, dropped {dead}")
+
+    def maintain_once(self):
+        """
+        One maintenance pass: download the sources when the pool is empty or due for a
+        refresh, re-check verified proxies before they go stale, and validate more
+        candidates when the verified set is below the low-water mark.
+        """
+        if self.refresh_sources and (not self.proxies or time.time() - self.last_update > self.refresh_interval):
+            self._refresh_proxies()
+        self._recheck_verified()
+        if len(self.verified_proxies) < self.low_water and self.proxies:
+            print(f"📉 {len(self.verified_proxies)} verified proxies left (low-water mark {self.low_water}), validating more...")
+            self._count('top_ups')
+            self._validate_initial_batch()
+        if self.state_path and time.time() - self.last_saved > self.save_interval:
+            self.save_state()
+        with self.stats_lock:
+            self.stats['last_maintenance'] = time.time()
+
+    def save_state(self):
+        """Snapshot the pool, scores and source state to state_path (atomically)."""
+        if not self.state_path:
+            return False
+        state = self.pool.export()
+        if not state['candidates'] and not state['verified']:
+            return False # Nothing worth keeping; don't overwrite a useful snapshot
+        with self.source_lock:
+            # Copied under the lock: the async refresher may be merging a download meanwhile
+            sources = {url: dict(source, proxies=list(source.get('proxies', ()))) for url, source in self.source_state.items()}
+        state.update(saved_at=time.time(), last_update=self.last_update, sources=sources)
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp" # Per process: workers sharing the path don't clobber each other
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+            self.last_saved = time.time()
+            print(f"💾 Saved proxy pool ({len(state['verified'])} verified, {len(state['candidates'])} candidates)")
+            return True
+        except Exception as e:
+            print(f"⚠️ Failed to save proxy pool: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
 
-# Global proxy manager instance
-proxy_manager = FreeProxyManager()
+    def load_state(self, max_age=PROXY_STATE_MAX_AGE):
+        """
+        Restore the pool saved by save_state, if it is recent enough.
 
-def generate_gemini_content(prompt):
+        Restored verified proxies are usable right away and re-checked by the
+        maintainer's first pass (both entry points start it on boot); the source
+        timestamps and validators keep a warm restart from downloading unchanged
+        lists again.
+        """
+        if not self.state_path or not os.path.exists(self.state_path):
+            return False
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            age = time.time() - state.get('saved_at', 0)
+            if age > max_age:
+                print(f"⚠️ Ignoring proxy pool snapshot from {age / 3600:.1f}h ago")
+                return False
+            self.pool.restore(state)
+            self.last_update = state.get('last_update', 0)
+            with self.source_lock:
+                self.source_state = dict(state.get('sources', {}))
+            print(f"♻️ Restored proxy pool ({len(self.verified_proxies)} verified, {len(self.proxies)} candidates)")
+            return True
+        except Exception as e:
+            print(f"⚠️ Failed to restore proxy pool: {e}")
+            return False
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                self.maintain_once()
+            except Exception as e:
+                print(f"⚠️ Proxy maintenance failed: {e}")
+            self.stop_event.wait(self.maintain_interval)
+
+    def start_maintainer(self, refresh_sources=True):
+        """
+        Start the background maintainer if it isn't running.
+
+        Args:
+            refresh_sources (bool): False when something else (e.g. the async server's
+                refresher) downloads the source lists; the thread then only re-checks
+                and tops up the verified set.
+        """
+        if self.thread and self.thread.is_alive():
+            return
+        with self.start_lock:
+            if self.thread and self.thread.is_alive():
+                return
+            print(f"🧰 Starting proxy pool maintainer (every {self.maintain_interval}s)")
+            self.refresh_sources = refresh_sources
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._run, name='proxy-maintainer')
+            self.thread.daemon = True
+            self.thread.start()
+
+    def stop_maintainer(self):
+        self.stop_event.set()
+
+    def get_stats(self):
+        with self.stats_lock:
+            stats = dict(self.stats)
+        return dict(
+            stats,
+            pool=self.pool.get_stats(),
+            maintainer_running=bool(self.thread and self.thread.is_alive())
+        )
+
+# Global proxy manager instance, warm-started from the last snapshot and saved again on shutdown
+proxy_manager = FreeProxyManager(state_path=PROXY_STATE_PATH or None)
+proxy_manager.load_state()
+atexit.register(proxy_manager.save_state)
+
+def _save_state_and_exit(signum, frame):
     """
-    Generate content using Gemini API with automatic model fallback.
-    Prioritizes: 2.0 Flash -> 2.0 Flash Lite -> Flash Latest
+    SIGTERM handler for `python3 app.py` (how Render stops the service): atexit hooks
+    don't run when the process is killed by a signal, so snapshot first, then exit.
+    """
+    print("🛑 SIGTERM received, saving proxy pool before exit...")
+    atexit.unregister(proxy_manager.save_state)
+    proxy_manager.save_state()
+    sys.exit(0)
+
+class TieredCache:
+    """
+    Two-tier cache: an in-process LRU in front of an on-disk SQLite store.
+
+    Entries expire after `ttl` seconds. Both tiers are size-bounded: the memory
+    tier evicts the least recently used entry, the disk tier evicts the least
+    recently accessed rows. Disk entries survive process restarts, so a
+    redeployed instance still answers repeat requests without refetching.
+
+    Keys are tuples (e.g. (platform, video_id)); values must be JSON-serializable.
+    """
+    def __init__(self, name, path, ttl, memory_entries=128, disk_entries=5000):
+        self.name = name
+        self.path = path
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+        self.db = None
+        if path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                self.db = sqlite3.connect(path, check_same_thread=False)
+                self.db.execute('PRAGMA journal_mode=WAL')
+                self.db.execute(
+                    f'CREATE TABLE IF NOT EXISTS {name} '
+                    '(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+                )
+                self.db.execute(f'CREATE INDEX IF NOT EXISTS {name}_accessed ON {name} (accessed_at)')
+                self.db.commit()
+            except Exception as e:
+                print(f"⚠️ Cache '{name}': SQLite store unavailable, using memory only: {e}")
+                self.db = None
+
+    @staticmethod
+    def _key(key):
+        return ':'.join(str(part) for part in key)
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss or expired entry."""
+        if self.ttl <= 0:
+            return None
+        k = self._key(key)
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(k)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at < self.ttl:
+                    self.memory.move_to_end(k)
+                    self.stats['memory_hits'] += 1
+                    return value
+                del self.memory[k]
+
+            if self.db is not None:
+                try:
+                    row = self.db.execute(
+                        f'SELECT value, created_at FROM {self.name} WHERE key = ?', (k,)
+                    ).fetchone()
+                    if row and now - row[1] < self.ttl:
+                        self.db.execute(f'UPDATE {self.name} SET accessed_at = ? WHERE key = ?', (now, k))
+                        self.db.commit()
+                        value = json.loads(row[0])
+                        self._remember(k, row[1], value)
+                        self.stats['disk_hits'] += 1
+                        return value
+                    if row:
+                        self.db.execute(f'DELETE FROM {self.name} WHERE key = ?', (k,))
+                        self.db.commit()
+                except Exception as e:
+                    print(f"⚠️ Cache '{self.name}': disk read failed: {e}")
+
+            self.stats['misses'] += 1
+            return None
+
+    def set(self, key, value):
+        """Store value under key in both tiers."""
+        if self.ttl <= 0:
+            return
+        k = self._key(key)
+        now = time.time()
+        with self.lock:
+            self._remember(k, now, value)
+            self.stats['writes'] += 1
+            if self.db is not None:
+                try:
+                    self.db.execute(
+                        f'INSERT OR REPLACE INTO {self.name} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                        (k, json.dumps(value), now, now)
+                    )
+                    # Evict least recently accessed rows beyond the size bound (expired rows go first)
+                    self.db.execute(f'DELETE FROM {self.name} WHERE created_at < ?', (now - self.ttl,))
+                    count = self.db.execute(f'SELECT COUNT(*) FROM {self.name}').fetchone()[0]
+                    if count > self.disk_entries:
+                        self.db.execute(
+                            f'DELETE FROM {self.name} WHERE key IN '
+                            f'(SELECT key FROM {self.name} ORDER BY accessed_at ASC LIMIT ?)',
+                            (count - self.disk_entries,)
+                        )
+                        self.stats['evictions'] += count - self.disk_entries
+                    self.db.commit()
+                except Exception as e:
+                    print(f"⚠️ Cache '{self.name}': disk write failed: {e}")
+
+    def delete(self, key):
+        k = self._key(key)
+        with self.lock:
+            self.memory.pop(k, None)
+            if self.db is not None:
+                try:
+                    self.db.execute(f'DELETE FROM {self.name} WHERE key = ?', (k,))
+                    self.db.commit()
+                except Exception as e:
+                    print(f"⚠️ Cache '{self.name}': disk delete failed: {e}")
+
+    def _remember(self, k, created_at, value):
+        # Caller holds self.lock
+        self.memory[k] = (created_at, value)
+        self.memory.move_to_end(k)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self.memory)
+            if self.db is not None:
+                try:
+                    stats['disk_entries'] = self.db.execute(f'SELECT COUNT(*) FROM {self.name}').fetchone()[0]
+                except Exception:
+                    stats['disk_entries'] = None
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 3) if lookups else 0.0
+        return stats
+
+class ExtractionSaturated(Exception):
+    """Raised when a platform's extraction pool and its wait queue are both full."""
+    def __init__(self, platform, retry_after):
+        super().__init__(f"Extraction capacity for {platform} is saturated, retry in {retry_after}s")
+        self.platform = platform
+        self.retry_after = retry_after
+
+class BoundedExecutor:
     """
+    Fixed-size thread pool with a bounded wait queue (one bulkhead per platform).
+
+    At most max_workers extractions run at once and at most max_queue more wait for a
+    worker; anything beyond that is rejected immediately with ExtractionSaturated
+    instead of piling up threads until the instance runs out of memory.
+    """
+    def __init__(self, name, max_workers, max_queue, retry_after=5):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"extract-{name}")
+        self.slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.stats = {'submitted': 0, 'rejected': 0}
+
+    def submit(self, fn, *args, **kwargs):
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.stats['rejected'] += 1
+            raise ExtractionSaturated(self.name, self.retry_after)
+        with self.lock:
+            self.pending += 1
+            self.stats['submitted'] += 1
+        try:
+            future = self.executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda f: self._release())
+        return future
+
+    def _release(self):
+        with self.lock:
+            self.pending -= 1
+        self.slots.release()
+
+    def is_saturated(self):
+        with self.lock:
+            return self.pending >= self.max_workers + self.max_queue
+
+    def get_stats(self):
+        with self.lock:
+            return dict(
+                self.stats,
+                running=min(self.pending, self.max_workers),
+                queued=max(self.pending - self.max_workers, 0),
+                max_workers=self.max_workers,
+                max_queue=self.max_queue
+            )
+
+# Per-platform bulkheads, so a slow platform can't starve the others of workers
+extraction_pools = {
+    'youtube': BoundedExecutor('youtube', EXTRACTION_WORKERS_YOUTUBE, EXTRACTION_QUEUE_SIZE, EXTRACTION_RETRY_AFTER),
+    'vimeo': BoundedExecutor('vimeo', EXTRACTION_WORKERS_VIMEO, EXTRACTION_QUEUE_SIZE, EXTRACTION_RETRY_AFTER),
+    'tiktok': BoundedExecutor('tiktok', EXTRACTION_WORKERS_TIKTOK, EXTRACTION_QUEUE_SIZE, EXTRACTION_RETRY_AFTER)
+}
+
+# Hedged fetch strategies run here rather than on a per-request pool, so abandoned
+# losers stay counted until they actually stop. No queue: a full pool means no hedge.
+strategy_pool = BoundedExecutor('strategy', STRATEGY_WORKERS, 0, EXTRACTION_RETRY_AFTER)
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key onto one in-flight fetch.
+
+    The first caller for a key (the leader) starts the work in a background thread,
+    or on the given executor; callers arriving while it runs (followers) wait on the
+    same future instead of starting their own fetch. The key is released as soon as
+    the work finishes.
+    """
+    def __init__(self):
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.stats = {'leaders': 0, 'followers': 0}
+
+    def submit(self, key, fn, executor=None):
+        """
+        Returns:
+            tuple: (future, is_leader)
+
+        Raises:
+            ExtractionSaturated: If the executor rejected the leader's work.
+        """
+        with self.lock:
+            future = self.inflight.get(key)
+            if future is not None:
+                self.stats['followers'] += 1
+                return future, False
+            future = Future()
+            self.inflight[key] = future
+            self.stats['leaders'] += 1
+
+        def worker():
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self.lock:
+                    self.inflight.pop(key, None)
+
+        if executor is not None:
+            try:
+                executor.submit(worker)
+            except Exception as e:
+                # Followers may already be waiting on this future
+                with self.lock:
+                    self.inflight.pop(key, None)
+                future.set_exception(e)
+                raise
+            return future, True
+
+        t = threading.Thread(target=worker)
+        t.daemon = True # Daemon thread dies when main process dies (though Flask workers persist)
+        t.start()
+        return future, True
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, inflight=len(self.inflight))
+
+# Global in-flight fetch registry, keyed by (platform, video_id)
+transcript_flights = SingleFlight()
+
+# Global transcript cache instance, keyed by (platform, video_id)
+transcript_cache = TieredCache(
+    'transcripts',
+    TRANSCRIPT_CACHE_PATH,
+    TRANSCRIPT_CACHE_TTL,
+    memory_entries=TRANSCRIPT_CACHE_MEMORY_ENTRIES,
+    disk_entries=TRANSCRIPT_CACHE_DISK_ENTRIES
+)
+
+# Global summary cache, keyed by a hash of the summary prompt (same SQLite file, own table)
+summary_cache = TieredCache(
+    'summaries',
+    TRANSCRIPT_CACHE_PATH,
+    SUMMARY_CACHE_TTL,
+    memory_entries=TRANSCRIPT_CACHE_MEMORY_ENTRIES,
+    disk_entries=TRANSCRIPT_CACHE_DISK_ENTRIES
+)
+
+# Gemini models tried in order until one succeeds
+GEMINI_MODELS = [
+    'gemini-3-flash-preview', # Preview alias
+    'gemini-2.5-flash',      # Latest Flash
+    'gemini-2.5-flash-lite',
+    'gemini-2.0-flash',      # Stable Flash 2.0
+    'gemini-2.0-flash-lite',
+    'gemini-2.0-flash-exp',  # Experimental Flash
+    'gemini-flash-latest',   # Generic latest alias
+    'gemini-2.5-pro',        # Pro model (likely lower quota but worth a shot)
+    'gemini-2.0-pro-exp-02-05',
+    'gemini-exp-1206',
+    'gemini-2.5-flash-preview-tts' # Fallback
+]
+
+def _configure_gemini():
     api_key = os.getenv('GEMINI_API_KEY')
     if not api_key:
         raise Exception("API_KEY_INVALID: API key not configured")
         
     genai.configure(api_key=api_key)
-    
-    models_to_try = [
-        'gemini-3-flash-preview', # Preview alias
-        'gemini-2.5-flash',      # Latest Flash
-        'gemini-2.5-flash-lite',
-        'gemini-2.0-flash',      # Stable Flash 2.0
-        'gemini-2.0-flash-lite',
-        'gemini-2.0-flash-exp',  # Experimental Flash
-        'gemini-flash-latest',   # Generic latest alias
-        'gemini-2.5-pro',        # Pro model (likely lower quota but worth a shot)
-        'gemini-2.0-pro-exp-02-05',
-        'gemini-exp-1206',
-        'gemini-2.5-flash-preview-tts' # Fallback
-    ]
+
+def _log_gemini_failure(model_name, e):
+    error_str = str(e)
+    if "404" in error_str or "not found" in error_str.lower():
+        print(f"⚠️ Gemini: Model {model_name} not found (skipping).")
+    elif "429" in error_str or "quota" in error_str.lower():
+        print(f"⚠️ Gemini: Quota exceeded for {model_name} (skipping).")
+    else:
+        print(f"⚠️ Gemini: Failed with model {model_name}: {e}")
+
+def _raise_gemini_failure(last_error):
+    if last_error:
+        print(f"❌ All Gemini models failed. Last error: {last_error}")
+        raise last_error
+    else:
+        raise Exception("No Gemini models available to try.")
+
+def generate_gemini_content(prompt):
+    """
+    Generate content using Gemini API with automatic model fallback.
+    Prioritizes: 2.0 Flash -> 2.0 Flash Lite -> Flash Latest
+    """
+    _configure_gemini()
     
     last_error = None
     
-    for model_name in models_to_try:
+    for model_name in GEMINI_MODELS:
         try:
             print(f"🔄 Gemini: Attempting with model: {model_name}")
             model = genai.GenerativeModel(model_name)
@@ -375,221 +1635,840 @@ def generate_gemini_content(prompt):
             return response
             
         except Exception as e:
-            error_str = str(e)
-            if "404" in error_str or "not found" in error_str.lower():
-                print(f"⚠️ Gemini: Model {model_name} not found (skipping).")
-            elif "429" in error_str or "quota" in error_str.lower():
-                print(f"⚠️ Gemini: Quota exceeded for {model_name} (skipping).")
-            else:
-                print(f"⚠️ Gemini: Failed with model {model_name}: {e}")
-            
+            _log_gemini_failure(model_name, e)
             last_error = e
             continue
             
-    if last_error:
-        print(f"❌ All Gemini models failed. Last error: {last_error}")
-        raise last_error
-    else:
-        raise Exception("No Gemini models available to try.")
+    _raise_gemini_failure(last_error)
 
-def _get_youtube_transcript_with_cookies(video_id):
+async def generate_gemini_content_async(prompt):
     """
-    Extract transcript and metadata from YouTube video.
-    
-    Returns:
-        tuple: (transcript_text, metadata_dict, cookie_count)
+    Async variant of generate_gemini_content for the ASGI server (asgi_app.py).
+    Uses the non-blocking Gemini client with the same model fallback order.
     """
+    _configure_gemini()
     
-    # Try up to 3 times with different proxies
-    max_retries = 3
     last_error = None
-    start_time = time.time()
-    video_url = f"https://www.youtube.com/watch?v={video_id}"
-    
-    print(f"🔍 DEBUG: Starting transcript fetch for {video_id}")
     
-    # Handle cookies
-    cookies_content = os.getenv('YOUTUBE_COOKIES')
-    cookies_file = None
-    if cookies_content:
+    for model_name in GEMINI_MODELS:
         try:
-            fd, cookies_file = tempfile.mkstemp(suffix='.txt', text=True)
-            with os.fdopen(fd, 'w') as f:
-                f.write(cookies_content)
-            print("🔍 DEBUG: Created temporary cookies file")
+            print(f"🔄 Gemini: Attempting with model: {model_name}")
+            model = genai.GenerativeModel(model_name)
+            response = await model.generate_content_async(prompt)
+            print(f"✅ Gemini: Success with model: {model_name}")
+            return response
+            
         except Exception as e:
-            print(f"⚠️ DEBUG: Failed to create cookies file: {e}")
-            cookies_file = None
-    else:
-        print("🔍 DEBUG: No YOUTUBE_COOKIES found in env")
+            _log_gemini_failure(model_name, e)
+            last_error = e
+            continue
             
-    # Default metadata
-    metadata = {
-        'title': 'Unknown Title',
-        'uploader': 'Unknown Uploader',
-        'upload_date': None,
-        'view_count': 0,
-        'channel_follower_count': 0,
-        'description': ''
+    _raise_gemini_failure(last_error)
+
+class CookieSet:
+    """One validated, read-only cookie set for a platform, with its recent success rate."""
+    def __init__(self, platform, name, jar, size):
+        self.platform = platform
+        self.name = name
+        self.key = f"{platform}:{name}"
+        self.jar = jar
+        self.size = size
+        self.success_rate = 1.0 # Exponential moving average, optimistic start
+        self.uses = 0
+        self.failures = 0
+
+    def copy_into(self, jar):
+        """Copy the cookies into another jar (e.g. a yt-dlp instance or requests session)."""
+        for cookie in self.jar:
+            jar.set_cookie(copy.copy(cookie))
+        return jar
+
+class CookieJarManager:
+    """
+    Loads platform cookies once at startup and rotates between cookie sets.
+
+    Each platform reads its base variable (e.g. YOUTUBE_COOKIES) plus numbered extras
+    (YOUTUBE_COOKIES_2 ... YOUTUBE_COOKIES_9). Every set is parsed and validated once
+    into a shared jar that is never written to; consumers get copies of its cookies
+    instead of a temp file to re-parse. Sets are picked at random weighted by their
+    recent success rate, so volume is spread across accounts and a throttled session
+    is used less until it recovers.
+    """
+    PLATFORMS = {'youtube': 'YOUTUBE_COOKIES', 'vimeo': 'VIMEO_COOKIES', 'tiktok': 'TIKTOK_COOKIES'}
+    MAX_SETS = 9
+    SUCCESS_ALPHA = 0.2 # Weight of the latest outcome in the moving average
+    MIN_WEIGHT = 0.05 # Throttled sets still get an occasional chance to recover
+
+    def __init__(self, environ=None):
+        self.sets = {platform: [] for platform in self.PLATFORMS}
+        self.lock = threading.Lock()
+        self.load(os.environ if environ is None else environ)
+
+    def load(self, environ):
+        for platform, var in self.PLATFORMS.items():
+            names = [var] + [f"{var}_{i}" for i in range(2, self.MAX_SETS + 1)]
+            loaded = []
+            for name in names:
+                content = environ.get(name)
+                if not content:
+                    continue
+                cookie_set = self._parse(platform, name, content)
+                if cookie_set:
+                    loaded.append(cookie_set)
+            self.sets[platform] = loaded
+            if loaded:
+                print(f"🍪 Loaded {len(loaded)} {platform} cookie set(s): {', '.join(c.name for c in loaded)}")
+            else:
+                print(f"🔍 DEBUG: No {var} found in env")
+
+    def _parse(self, platform, name, content):
+        try:
+            jar = yt_dlp.cookies.YoutubeDLCookieJar()
+            jar.load(io.StringIO(content))
+        except Exception as e:
+            print(f"⚠️ Invalid cookies in {name} (skipping): {e}")
+            return None
+        if not len(jar):
+            print(f"⚠️ No cookies found in {name} (skipping). Is it in Netscape format?")
+            return None
+        expired = sum(1 for cookie in jar if cookie.is_expired())
+        if expired:
+            print(f"⚠️ {name}: {expired}/{len(jar)} cookies have expired")
+        return CookieSet(platform, name, jar, len(content))
+
+    def acquire(self, platform):
+        """Pick a cookie set for a request, or None if the platform has none configured."""
+        with self.lock:
+            candidates = self.sets.get(platform) or []
+            if not candidates:
+                return None
+            weights = [max(c.success_rate, self.MIN_WEIGHT) for c in candidates]
+            cookie_set = random.choices(candidates, weights=weights)[0]
+            cookie_set.uses += 1
+            return cookie_set
+
+    def report(self, cookie_set, success):
+        """Record whether a request using cookie_set succeeded."""
+        if not cookie_set:
+            return
+        with self.lock:
+            outcome = 1.0 if success else 0.0
+            cookie_set.success_rate += self.SUCCESS_ALPHA * (outcome - cookie_set.success_rate)
+            if not success:
+                cookie_set.failures += 1
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                platform: [
+                    {'name': c.name, 'cookies': len(c.jar), 'uses': c.uses, 'failures': c.failures,
+                     'success_rate': round(c.success_rate, 3)}
+                    for c in sets
+                ]
+                for platform, sets in self.sets.items()
+            }
+
+# Global cookie manager, loaded once at startup
+cookie_manager = CookieJarManager()
+
+def _fetch_transcript_api(video_id, cookie_set=None, proxies=None):
+    """
+    Fetch an English transcript with YouTubeTranscriptApi using a shared cookie set.
+
+    Equivalent to YouTubeTranscriptApi.get_transcript, but it runs on the pooled
+    session for (youtube.com, proxy, cookie set), which already holds a copy of the
+    parsed cookies, instead of a one-shot session re-reading a cookie file.
+    """
+    proxy_url = proxies.get('https') if proxies else None
+    http_client = http_sessions.get('https://www.youtube.com', proxy=proxy_url, cookie_set=cookie_set)
+    transcript_list = TranscriptListFetcher(http_client).fetch(video_id)
+    return transcript_list.find_transcript(('en',)).fetch()
+
+class YtDlpEngine:
+    """
+    Keeps warm, reusable yt-dlp instances per extraction profile.
+
+    Building a YoutubeDL (extractor registry, cookie jar, networking handlers) costs
+    tens of milliseconds of CPU. The engine checks instances out to one thread at a
+    time and returns them to an idle pool keyed by (profile, options), so repeat
+    attempts reuse both the instance and its keep-alive connections. The subtitles
+    profile never downloads the player JS, so there are no player or signature
+    artifacts to cache; instances only point yt-dlp's cache directory at
+    YTDLP_CACHE_DIR so it stays under DATA_DIR.
+
+    Profiles:
+        subtitles: Subtitle/metadata only. Extraction runs without format processing
+                   and skips DASH/HLS manifests, translated caption lists and player JS.
+    """
+    PROFILES = {
+        'subtitles': {
+            'quiet': True,
+            'no_warnings': True,
+            'skip_download': True,
+            'ignore_no_formats_error': True,
+            'extractor_args': {'youtube': {'skip': ['dash', 'hls', 'translated_subs'], 'player_skip': ['js']}},
+        },
+        # Metadata-only listing of playlist/channel entries (no per-video extraction)
+        'flat': {
+            'quiet': True,
+            'no_warnings': True,
+            'skip_download': True,
+            'extract_flat': 'in_playlist',
+        },
     }
 
-    # Check if video is live or was live using yt-dlp first (without proxy if possible, or with)
-    # This avoids wasting time on Method 1 if we know we want to block live videos
+    def __init__(self, cache_dir=None, max_idle_per_key=2, max_keys=32):
+        self.cache_dir = cache_dir
+        self.max_idle_per_key = max_idle_per_key
+        self.max_keys = max_keys
+        self.idle = OrderedDict() # key -> [YoutubeDL, ...], least recently used first
+        self.lock = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0, 'closed': 0}
+
+    def _key(self, profile, options):
+        return (profile, json.dumps(options, sort_keys=True, default=str))
+
+    def _build(self, profile, options):
+        params = copy.deepcopy(self.PROFILES[profile])
+        for name, value in options.items():
+            if name == 'extractor_args':
+                # Merge per-extractor args on top of the profile's (e.g. player_client)
+                for ie_name, args in value.items():
+                    params.setdefault('extractor_args', {}).setdefault(ie_name, {}).update(args)
+            elif name != 'cookie_set':
+                params[name] = value
+        if self.cache_dir:
+            params['cachedir'] = self.cache_dir
+        ydl = yt_dlp.YoutubeDL(params)
+        if options.get('cookie_set'):
+            options['cookie_set'].copy_into(ydl.cookiejar)
+        with self.lock:
+            self.stats['created'] += 1
+        return ydl
+
+    @contextmanager
+    def acquire(self, profile='subtitles', **options):
+        """Check out a YoutubeDL for exclusive use; it returns to the idle pool afterwards."""
+        key = self._key(profile, dict(options, cookie_set=options['cookie_set'].key if options.get('cookie_set') else None))
+        ydl = None
+        with self.lock:
+            pool = self.idle.get(key)
+            if pool:
+                ydl = pool.pop()
+                self.idle.move_to_end(key)
+                self.stats['reused'] += 1
+        if ydl is None:
+            ydl = self._build(profile, options)
+        elif options.get('cookie_set'):
+            # The last user may have cleared the jar or picked up response cookies;
+            # every checkout starts from the set's cookies again
+            ydl.cookiejar.clear()
+            options['cookie_set'].copy_into(ydl.cookiejar)
+
+        healthy = False
+        try:
+            yield ydl
+            healthy = True
+        finally:
+            to_close = []
+            with self.lock:
+                pool = self.idle.setdefault(key, [])
+                self.idle.move_to_end(key)
+                if healthy and len(pool) < self.max_idle_per_key:
+                    pool.append(ydl)
+                else:
+                    to_close.append(ydl)
+                while len(self.idle) > self.max_keys:
+                    _, evicted = self.idle.popitem(last=False)
+                    to_close.extend(evicted)
+            for stale in to_close:
+                try:
+                    stale.close()
+                except Exception:
+                    pass
+            if to_close:
+                with self.lock:
+                    self.stats['closed'] += len(to_close)
+
+    def extract(self, url, profile='subtitles', **options):
+        """
+        Extract video info without format processing, following URL redirects
+        (e.g. vm.tiktok.com short links) that unprocessed extraction leaves unresolved.
+        """
+        with self.acquire(profile, **options) as ydl:
+            info = ydl.extract_info(url, download=False, process=False)
+            for _ in range(3):
+                if info.get('_type') not in ('url', 'url_transparent'):
+                    break
+                resolved = ydl.extract_info(info['url'], download=False, process=False, ie_key=info.get('ie_key'))
+                if info['_type'] == 'url_transparent':
+                    for field, value in info.items():
+                        if field not in ('_type', 'url', 'ie_key') and value is not None:
+                            resolved.setdefault(field, value)
+                info = resolved
+            return info, ydl.cookiejar
+
+    def list_entries(self, url, limit, profile='flat', **options):
+        """
+        List up to limit entries of a playlist or channel without extracting each video.
+        Entries are paged lazily, so only the pages needed for limit are fetched.
+
+        Returns:
+            tuple: (info, entries)
+        """
+        with self.acquire(profile, **options) as ydl:
+            info = ydl.extract_info(url, download=False, process=False)
+            entries = info.get('entries') or []
+            if hasattr(entries, 'getslice'):
+                entries = entries.getslice(0, limit)
+            else:
+                entries = list(itertools.islice(entries, limit))
+            return info, entries
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, idle=sum(len(pool) for pool in self.idle.values()))
+
+# Global yt-dlp engine with a persistent cache directory
+ytdlp_engine = YtDlpEngine(cache_dir=YTDLP_CACHE_DIR)
+
+# yt-dlp options that change how an instance connects or authenticates (passed to the engine);
+# format selection options are irrelevant to subtitle-only extraction and are dropped
+_ENGINE_OPTION_KEYS = ('proxy', 'cookie_set', 'socket_timeout', 'retries', 'force_ipv4', 'extractor_args')
+
+def _probe_youtube_video(video_url):
+    """
+    Fetch YouTube video info once per request, without format processing.
+
+    Returns:
+        dict: Raw yt-dlp info (metadata, live status, subtitle tracks), or None if the probe failed.
+    """
     try:
-         print(f"🔍 Checking if video {video_id} is live/VOD...")
-         with yt_dlp.YoutubeDL({'quiet': True, 'skip_download': True}) as ydl:
-            info = ydl.extract_info(video_url, download=False)
-            if info.get('is_live') or info.get('was_live'):
-                print(f"⚠️ Video {video_id} is/was live. Blocking as per configuration.")
-                raise Exception("LIVE_VIDEO_NOT_SUPPORTED")
+        print(f"🔍 Probing {video_url} (live check, metadata, subtitles)...")
+        info, _ = ytdlp_engine.extract(video_url)
+        return info
     except Exception as e:
-        if "LIVE_VIDEO_NOT_SUPPORTED" in str(e):
-            raise e
-        # Ignore other errors here (e.g. network), let the main loop handle it or fail later
-        print(f"⚠️ Live check failed (ignoring): {e}")
-        pass
-
-    # METHOD 1: Try YouTubeTranscriptApi (Fastest)
-    method_1_error = None
-    method_1_5_error = None
-    last_error = None
+        # Ignore errors here (e.g. network), let the strategies handle it or fail later
+        print(f"⚠️ Probe failed (ignoring): {e}")
+        return None
 
+def _is_live_info(info):
+    """Check yt-dlp info for a live or previously live video (works on unprocessed info too)."""
+    return bool(
+        info.get('is_live') or info.get('was_live')
+        or info.get('live_status') in ('is_live', 'was_live', 'post_live')
+    )
+
+def _select_subtitle_track(info, lang='en', ext='vtt'):
+    """
+    Pick the subtitle track we would download from yt-dlp info.
+
+    Manual subtitles are preferred over automatic captions, and an exact language
+    match over regional variants (e.g. 'en-GB').
+
+    Returns:
+        dict: {'lang', 'ext', 'url', 'automatic'} or None if no matching track exists.
+    """
+    for key, automatic in (('subtitles', False), ('automatic_captions', True)):
+        tracks = info.get(key) or {}
+        langs = [lang] + sorted(l for l in tracks if l.startswith(f"{lang}-"))
+        for track_lang in langs:
+            for fmt in tracks.get(track_lang) or []:
+                if fmt.get('ext') == ext and fmt.get('url'):
+                    return {'lang': track_lang, 'ext': ext, 'url': fmt['url'], 'automatic': automatic}
+    return None
+
+def _download_subtitle_track(track, proxy_url=None, cookies=None):
+    """
+    Open a subtitle track over a pooled session and stream its body.
+
+    The request is made (and its status checked) right away; the body is read in
+    SUBTITLE_CHUNK_SIZE chunks as the caller consumes them, so iter_vtt_segments
+    parses while the track downloads and the whole file is never held in memory.
+    The response goes back to the pool once the chunks are exhausted or the
+    iterator is closed.
+
+    Returns:
+        iterator: Raw byte chunks of the track.
+    """
+    session = http_sessions.get(track['url'], proxy=proxy_url)
+    resp = session.get(track['url'], cookies=cookies, timeout=SUBTITLE_DOWNLOAD_TIMEOUT, stream=True)
     try:
-        print(f"🚀 Attempting Method 1: YouTubeTranscriptApi for {video_id}...")
-        
-        # Try direct connection first
+        resp.raise_for_status()
+    except Exception:
+        resp.close()
+        raise
+
+    def chunks():
         try:
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id, cookies=cookies_file)
+            yield from resp.iter_content(chunk_size=SUBTITLE_CHUNK_SIZE)
+        finally:
+            resp.close()
+    return chunks()
+
+def _extract_with_subtitles(ydl_opts, video_url, info=None):
+    """
+    Extract video info and its English VTT subtitles with yt-dlp.
+
+    In 'memory' mode (SUBTITLE_FETCH_MODE) the selected track URL is taken from the
+    extracted info and streamed (see _download_subtitle_track); in 'file' mode yt-dlp
+    writes the .vtt into a temp directory and it is read back. If info is given (e.g.
+    the shared probe) the page is not extracted again.
+
+    Returns:
+        tuple: (info, vtt_content or None if no English track exists). vtt_content is
+        a str in 'file' mode and an iterator of byte chunks in 'memory' mode; either
+        can be passed to _parse_vtt.
+    """
+    if SUBTITLE_FETCH_MODE == 'file':
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ydl_opts = dict(ydl_opts, **{
+                'skip_download': True,
+                'writesubtitles': True,
+                'writeautomaticsub': True,
+                'subtitleslangs': ['en'],
+                'subtitlesformat': 'vtt',
+                'outtmpl': os.path.join(temp_dir, '%(id)s'),
+                'cachedir': YTDLP_CACHE_DIR,
+            })
+            cookie_set = ydl_opts.pop('cookie_set', None)
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                if cookie_set:
+                    cookie_set.copy_into(ydl.cookiejar)
+                if info is not None:
+                    info = ydl.process_ie_result(copy.deepcopy(info), download=True)
+                else:
+                    info = ydl.extract_info(video_url, download=True)
+            for filename in os.listdir(temp_dir):
+                if filename.endswith('.vtt'):
+                    with open(os.path.join(temp_dir, filename), 'r', encoding='utf-8') as f:
+                        return info, f.read()
+            return info, None
+
+    cookies = None
+    if info is None:
+        info, cookies = ytdlp_engine.extract(
+            video_url, **{k: v for k, v in ydl_opts.items() if k in _ENGINE_OPTION_KEYS}
+        )
+    track = _select_subtitle_track(info)
+    if not track:
+        return info, None
+    return info, _download_subtitle_track(track, proxy_url=ydl_opts.get('proxy'), cookies=cookies)
+
+def _extract_after_probe(ydl_opts, video_url, probe_info):
+    """
+    Try the shared probe's subtitle track, then fall back to the strategy's own extraction.
+
+    The probe runs without cookies or a proxy, so its track URL is only a shortcut: if
+    downloading it fails (or the probe found no English track), the page is extracted
+    again with this strategy's ydl_opts, i.e. its cookie set and proxy.
+
+    Returns:
+        tuple: (info, vtt_content) as from _extract_with_subtitles.
+    """
+    if probe_info is not None:
+        try:
+            info, vtt_content = _extract_with_subtitles(ydl_opts, video_url, info=probe_info)
+            if vtt_content:
+                return info, vtt_content
         except Exception as e:
-            method_1_error = e
-            print(f"⚠️ Direct YouTubeTranscriptApi failed: {e}")
-            print(f"🔍 DEBUG: YouTubeTranscriptApi Exception: {e}")
-            
-            # METHOD 1.5: Try yt-dlp Direct Connection
-            print("🚀 Attempting Method 1.5: yt-dlp Direct Connection...")
-            try:
-                 with tempfile.TemporaryDirectory() as temp_dir:
-                    ydl_opts = {
-                        'skip_download': True,
-                        'writesubtitles': True,
-                        'writeautomaticsub': True,
-                        'subtitleslangs': ['en'],
-                        'subtitlesformat': 'vtt',
-                        'outtmpl': os.path.join(temp_dir, '%(id)s'),
-                        'quiet': True,
-                        'no_warnings': True,
-                        'socket_timeout': 10, # Strict 10s timeout
-                        'retries': 2,
-                        'format': 'worst',
-                        'ignore_no_formats_error': True,
-                        'allow_unplayable_formats': True,
-                        'force_ipv4': True,
-                        'allow_unplayable_formats': True,
-                        'force_ipv4': True,
-                    }
-                    if cookies_file:
-                        ydl_opts['cookiefile'] = cookies_file
-                        print("🔍 DEBUG: Using cookies for yt-dlp")
-                            
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        try:
-                            info = ydl.extract_info(video_url, download=True)
-                        except Exception as e:
-                            # If blocked (e.g. 403 or Sign in confirmed), try one more time WITHOUT cookies
-                            # YouTube sometimes aggressively blocks Datacenter IPs when logged in
-                            if cookies_file and ("Sign in" in str(e) or "403" in str(e) or "private" in str(e).lower()):
-                                print("⚠️ Cookies might be causing block. Retrying WITHOUT cookies...")
-                                ydl_opts.pop('cookiefile', None)
-                                with yt_dlp.YoutubeDL(ydl_opts) as ydl_retry:
-                                    info = ydl_retry.extract_info(video_url, download=True)
-                            else:
-                                raise e
-                        
-                        # Extract metadata
-                        metadata['title'] = info.get('title', 'Unknown Title')
-                        metadata['uploader'] = info.get('uploader', 'Unknown Uploader')
-                        metadata['upload_date'] = info.get('upload_date')
-                        metadata['view_count'] = info.get('view_count', 0)
-                        metadata['channel_follower_count'] = info.get('channel_follower_count', 0)
-                        metadata['description'] = info.get('description', '')
-                        metadata['thumbnail'] = info.get('thumbnail', '')
-                        
-                        vtt_file = None
-                        files_in_dir = os.listdir(temp_dir)
-                        for filename in files_in_dir:
-                            if filename.endswith('.vtt'):
-                                vtt_file = os.path.join(temp_dir, filename)
-                                break
-                        if vtt_file:
-                            with open(vtt_file, 'r', encoding='utf-8') as f:
-                                print("✅ Method 1.5 Success! yt-dlp direct worked.")
-                                return _parse_vtt(f.read()), metadata, 0
-                        else:
-                            raise Exception("Method 1.5: No transcript file downloaded (likely no subs found)")
-            except Exception as ydl_e:
-                method_1_5_error = ydl_e
-                print(f"⚠️ Method 1.5 failed: {ydl_e}")
-                print("🔄 Falling back to proxies...")
-
-            # Try with proxies
-            transcript_list = None
-            for attempt in range(3):
-                if time.time() - start_time > 45: # Global timeout safety (leave buffer for response)
-                    print("⚠️ Method 1 Proxy loop timed out")
-                    break
-                    
-                proxy = proxy_manager.get_proxy()
-                if not proxy:
-                    break
-                print(f"   Retrying YouTubeTranscriptApi with proxy {proxy['http']}...")
+            print(f"⚠️ Probe's subtitle track failed ({e}), extracting the page again...")
+    return _extract_with_subtitles(ydl_opts, video_url)
+
+class StrategyHealth:
+    """Moving averages of one strategy's success rate and time per attempt."""
+    __slots__ = ('key', 'success_rate', 'latency', 'samples', 'skipped', 'probes')
+
+    def __init__(self, key):
+        self.key = key
+        self.success_rate = None
+        self.latency = None # Seconds per attempt, successful or not
+        self.samples = 0
+        self.skipped = 0
+        self.probes = 0
+
+class StrategyStats:
+    """
+    Learns which transcript strategies work from where the app runs.
+
+    Outcomes are kept per key, '<platform>/<cookies|no cookies>/<strategy>', as moving
+    averages of success rate and time per attempt. Once a strategy has
+    STRATEGY_MIN_SAMPLES outcomes it is ordered by expected time per success
+    (latency / success rate). One whose success rate falls below STRATEGY_SKIP_RATE
+    is skipped: it only runs as a last resort, or first on an occasional probe
+    (STRATEGY_PROBE_RATE), so it is picked up again if it starts working.
+    Strategies without enough outcomes keep their default order, ahead of the
+    learned ones, so they collect samples.
+    """
+    SUCCESS_ALPHA = 0.2 # Weight of the latest outcome in the success rate average
+    LATENCY_ALPHA = 0.2 # Weight of the latest attempt in the latency average
+    MIN_WEIGHT = 0.05 # Floor on the success rate when estimating time per success
+
+    def __init__(self, min_samples=STRATEGY_MIN_SAMPLES, skip_rate=STRATEGY_SKIP_RATE,
+                 probe_rate=STRATEGY_PROBE_RATE):
+        self.min_samples = min_samples
+        self.skip_rate = skip_rate
+        self.probe_rate = probe_rate
+        self.health = {}
+        self.lock = threading.Lock()
+
+    def record(self, key, success, latency):
+        """Record one finished attempt of the strategy at `key`."""
+        with self.lock:
+            health = self.health.get(key)
+            if health is None:
+                health = self.health[key] = StrategyHealth(key)
+            outcome = 1.0 if success else 0.0
+            if health.samples == 0:
+                health.success_rate, health.latency = outcome, latency
+            else:
+                health.success_rate += self.SUCCESS_ALPHA * (outcome - health.success_rate)
+                health.latency += self.LATENCY_ALPHA * (latency - health.latency)
+            health.samples += 1
+
+    def _decide(self, health):
+        """'unknown', 'learned', 'probe' or 'skip' for one strategy. Call with the lock held."""
+        if health is None or health.samples < self.min_samples:
+            return 'unknown'
+        if health.success_rate >= self.skip_rate:
+            return 'learned'
+        if random.random() < self.probe_rate:
+            health.probes += 1
+            return 'probe'
+        health.skipped += 1
+        return 'skip'
+
+    def should_run(self, key):
+        """False if the strategy at `key` keeps failing, except on an occasional probe."""
+        with self.lock:
+            return self._decide(self.health.get(key)) != 'skip'
+
+    def plan(self, prefix, strategies):
+        """
+        Order (name, fn) strategies for one request.
+
+        Returns:
+            tuple: (to_run, last_resort) lists of (name, fn).
+        """
+        learned, unknown, probes, last_resort = [], [], [], []
+        with self.lock:
+            for position, strategy in enumerate(strategies):
+                health = self.health.get(f"{prefix}/{strategy[0]}")
+                decision = self._decide(health)
+                if decision == 'learned':
+                    cost = health.latency / max(health.success_rate, self.MIN_WEIGHT)
+                    learned.append((cost, position, strategy))
+                elif decision == 'probe':
+                    probes.append(strategy)
+                elif decision == 'skip':
+                    last_resort.append(strategy)
+                else:
+                    unknown.append(strategy)
+        learned.sort(key=lambda entry: entry[:2])
+        return probes + unknown + [strategy for _, _, strategy in learned], last_resort
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                key: {
+                    'success_rate': round(h.success_rate, 3), 'latency': round(h.latency, 3),
+                    'samples': h.samples, 'skipped': h.skipped, 'probes': h.probes,
+                }
+                for key, h in sorted(self.health.items())
+            }
+
+# Global strategy stats, shared by all requests
+strategy_stats = StrategyStats()
+
+# Method 1.5's retry without cookies after a cookie block is learned like a strategy
+NO_COOKIE_RETRY_KEY = 'youtube/no cookies/Method 1.5 retry'
+
+def _retry_without_cookies(ydl_opts, video_url, blocked_error):
+    """
+    Retry a cookie-blocked yt-dlp extraction without cookies.
+
+    With STRATEGY_ADAPTIVE the retry is learned like a strategy: it is skipped
+    (re-raising blocked_error) while it keeps getting blocked from this host. With
+    the fixed order it always runs and nothing is recorded.
+
+    Returns:
+        tuple: (info, vtt_content) as from _extract_with_subtitles.
+    """
+    if STRATEGY_ADAPTIVE and not strategy_stats.should_run(NO_COOKIE_RETRY_KEY):
+        print("⏭️ Skipping the retry without cookies (it keeps failing from here)")
+        raise blocked_error
+    print("⚠️ Cookies might be causing block. Retrying WITHOUT cookies...")
+    ydl_opts = dict(ydl_opts)
+    ydl_opts.pop('cookie_set', None)
+    retry_started = time.time()
+    try:
+        result = _extract_with_subtitles(ydl_opts, video_url)
+    except Exception as retry_error:
+        if STRATEGY_ADAPTIVE and _is_block_error(retry_error):
+            strategy_stats.record(NO_COOKIE_RETRY_KEY, False, time.time() - retry_started)
+        raise
+    if STRATEGY_ADAPTIVE:
+        strategy_stats.record(NO_COOKIE_RETRY_KEY, True, time.time() - retry_started) # Got past the block
+    return result
+
+def _is_block_error(error):
+    """True if a yt-dlp error looks like YouTube refusing this client (sign-in wall, 403)."""
+    message = str(error)
+    return "Sign in" in message or "403" in message or "private" in message.lower()
+
+def _run_strategy_inline(fn, cancel):
+    """Run a strategy on the calling thread, returning its outcome as a finished Future."""
+    future = Future()
+    try:
+        future.set_result(fn(cancel))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+def _run_strategies_hedged(strategies, deadline, hedge_delay=None, max_parallel=None, stats_prefix=None):
+    """
+    Run transcript fetch strategies with hedging; the first valid transcript wins.
+
+    Strategies start in order. The next one is launched when the previous one
+    fails, or once `hedge_delay` seconds pass without a result, up to
+    `max_parallel` running at once. When a strategy succeeds, the cancel event is
+    set so running losers stop at their next checkpoint and unstarted ones never run.
+    With max_parallel=1 this is the plain sequential cascade.
+
+    Strategies run on the shared strategy_pool, so losers still running after the
+    call returns keep holding a worker there. When the pool is full, a backup waits
+    for the running strategies instead of being hedged. When nothing of ours is
+    running, the strategy runs on the calling thread, which its platform pool
+    already counts.
+
+    With `stats_prefix` (e.g. 'youtube/cookies'), the order comes from strategy_stats.
+    Strategies it skips are launched only after all the others have failed. Finished
+    attempts are recorded there only when some strategy wins: if all of them fail
+    (e.g. the video has no captions), the failures say nothing about the strategies.
+
+    Args:
+        strategies (list): (name, fn) pairs. fn(cancel_event) returns (transcript_text, info_or_None).
+        deadline (float): Absolute time.time() after which no result is awaited.
+        stats_prefix (str): Optional. Key prefix for learning the order of these strategies.
+
+    Returns:
+        tuple: (strategy_name, transcript_text, info_or_None)
+    """
+    if hedge_delay is None:
+        hedge_delay = TRANSCRIPT_HEDGE_DELAY
+    if max_parallel is None:
+        max_parallel = TRANSCRIPT_HEDGE_PARALLEL if TRANSCRIPT_FETCH_MODE == 'hedged' else 1
+    max_parallel = max(1, max_parallel)
+
+    strategies = list(strategies)
+    last_resort = []
+    learning = bool(stats_prefix) and STRATEGY_ADAPTIVE
+    if learning:
+        planned, last_resort = strategy_stats.plan(stats_prefix, strategies)
+        if planned != strategies:
+            skipped = f" (skipping {', '.join(name for name, _ in last_resort)})" if last_resort else ""
+            print(f"🧭 Strategy order for {stats_prefix}: {', '.join(name for name, _ in planned)}{skipped}")
+        strategies = planned
+
+    cancel = threading.Event()
+    pending = {}
+    started_at = {}
+    errors = []
+    outcomes = [] # (name, success, seconds) of finished attempts
+    next_index = 0
+    next_launch_at = 0
+
+    try:
+        while True:
+            now = time.time()
+            if not pending and next_index >= len(strategies) and last_resort:
+                print(f"🔁 Trying skipped strategies as a last resort: {', '.join(name for name, _ in last_resort)}")
+                strategies, last_resort = strategies + last_resort, []
+            while next_index < len(strategies) and len(pending) < max_parallel and (not pending or now >= next_launch_at):
+                name, fn = strategies[next_index]
                 try:
-                    transcript_list = YouTubeTranscriptApi.get_transcript(video_id, cookies=cookies_file, proxies=proxy)
-                    proxy_manager.report_success(proxy['http'])
-                    print("   ✅ Proxy success!")
-                    break
-                except Exception as pe:
-                    print(f"   ❌ Proxy failed: {pe}")
-                    proxy_manager.mark_failed(proxy)
-            
-            if not transcript_list:
-                raise Exception("All YouTubeTranscriptApi attempts failed")
-
-        # Parse transcript
-        formatted_lines = []
-        for item in transcript_list:
-            start = item['start']
-            minutes = int(start // 60)
-            seconds = int(start % 60)
-            timestamp = f"[{minutes:02d}:{seconds:02d}]"
-            formatted_lines.append(f"{timestamp} {item['text']}")
+                    future = strategy_pool.submit(fn, cancel)
+                except ExtractionSaturated:
+                    if pending:
+                        # No spare worker for a hedge: wait for the running strategies
+                        next_launch_at = float('inf')
+                        break
+                    future = _run_strategy_inline(fn, cancel)
+                next_index += 1
+                if pending:
+                    print(f"⏩ Hedging: starting {name} while {', '.join(pending.values())} still running")
+                pending[future] = name
+                started_at[future] = now
+                next_launch_at = now + hedge_delay
+
+            if not pending:
+                break
+            remaining = deadline - now
+            if remaining <= 0:
+                print(f"⚠️ Strategy deadline reached with {', '.join(pending.values())} still running")
+                errors.append(('timeout', Exception("Global timeout reached")))
+                break
+
+            timeout = remaining
+            if next_index < len(strategies) and len(pending) < max_parallel:
+                timeout = min(timeout, max(0.0, next_launch_at - now))
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                elapsed = time.time() - started_at.pop(future)
+                try:
+                    full_text, info = future.result()
+                    if not full_text:
+                        raise Exception("Parsed transcript is empty")
+                except Exception as e:
+                    print(f"⚠️ Strategy {name} failed: {e}")
+                    errors.append((name, e))
+                    outcomes.append((name, False, elapsed))
+                    # A failure frees the slot for the next strategy immediately
+                    next_launch_at = 0
+                    continue
+                if learning:
+                    outcomes.append((name, True, elapsed))
+                    for outcome_name, success, seconds in outcomes:
+                        strategy_stats.record(f"{stats_prefix}/{outcome_name}", success, seconds)
+                print(f"🏁 Strategy {name} won")
+                return name, full_text, info
+
+        error_msg = "All transcript strategies failed."
+        for name, e in errors:
+            error_msg += f" {name} Error: {e}."
+        raise Exception(error_msg)
+
+    finally:
+        cancel.set()
+        for future in pending:
+            future.cancel()
+
+def _get_youtube_transcript_with_cookies(video_id):
+    """
+    Extract transcript and metadata from YouTube video.
+    
+    Returns:
+        tuple: (transcript_text, metadata_dict, cookie_count)
+    """
+    
+    # Try up to 3 times with different proxies
+    max_retries = 3
+    start_time = time.time()
+    deadline = start_time + 45 # Global timeout safety (leave buffer for response)
+    video_url = f"https://www.youtube.com/watch?v={video_id}"
+    
+    print(f"🔍 DEBUG: Starting transcript fetch for {video_id}")
+    
+    # Default metadata
+    metadata = {
+        'title': 'Unknown Title',
+        'uploader': 'Unknown Uploader',
+        'upload_date': None,
+        'view_count': 0,
+        'channel_follower_count': 0,
+        'description': ''
+    }
+
+    def fill_metadata(info):
+        metadata['title'] = info.get('title', 'Unknown Title')
+        metadata['uploader'] = info.get('uploader', 'Unknown Uploader')
+        metadata['upload_date'] = info.get('upload_date')
+        metadata['view_count'] = info.get('view_count', 0)
+        metadata['channel_follower_count'] = info.get('channel_follower_count', 0)
+        metadata['description'] = info.get('description', '')
+        metadata['thumbnail'] = info.get('thumbnail', '')
+
+    # Probe the video once and share the result: it feeds the live check and the
+    # metadata dict, and its subtitle track is tried before the yt-dlp strategies
+    # extract the page with their own cookies/proxy (see _extract_after_probe).
+    # Checking live status first also avoids wasting time on videos we block anyway
+    probe_info = _probe_youtube_video(video_url)
+    if probe_info:
+        if _is_live_info(probe_info):
+            print(f"⚠️ Video {video_id} is/was live. Blocking as per configuration.")
+            raise Exception("LIVE_VIDEO_NOT_SUPPORTED")
+        fill_metadata(probe_info)
+
+    # Pick one of the preloaded cookie sets (None if no YOUTUBE_COOKIES configured)
+    cookie_set = cookie_manager.acquire('youtube')
+    cookies_blocked = []
+    if cookie_set:
+        print(f"🔍 DEBUG: Using cookie set {cookie_set.name}")
             
-        full_text = " ".join(formatted_lines)
+    def method_1(cancel):
+        # METHOD 1: Try YouTubeTranscriptApi (Fastest)
+        print(f"🚀 Attempting Method 1: YouTubeTranscriptApi for {video_id}...")
+        transcript_list = _fetch_transcript_api(video_id, cookie_set=cookie_set)
+        full_text = format_transcript_items(transcript_list)
         print(f"✅ Method 1 Success! Extracted {len(full_text)} chars")
-        
-        # Fetch metadata separately since API didn't give it
+        return full_text, None
+
+    def method_1_5(cancel):
+        # METHOD 1.5: Try yt-dlp Direct Connection
+        print("🚀 Attempting Method 1.5: yt-dlp Direct Connection...")
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'socket_timeout': 10, # Strict 10s timeout
+            'retries': 2,
+            'format': 'worst',
+            'ignore_no_formats_error': True,
+            'allow_unplayable_formats': True,
+            'force_ipv4': True,
+        }
+        if cookie_set:
+            ydl_opts['cookie_set'] = cookie_set
+            print("🔍 DEBUG: Using cookies for yt-dlp")
+                
         try:
-            with yt_dlp.YoutubeDL({'quiet': True, 'skip_download': True}) as ydl:
-                info = ydl.extract_info(video_url, download=False)
-                metadata['title'] = info.get('title', 'Unknown Title')
-                metadata['uploader'] = info.get('uploader', 'Unknown Uploader')
-                metadata['upload_date'] = info.get('upload_date')
-                metadata['view_count'] = info.get('view_count', 0)
-                metadata['channel_follower_count'] = info.get('channel_follower_count', 0)
-                metadata['description'] = info.get('description', '')
-                metadata['thumbnail'] = info.get('thumbnail', '')
-        except:
-            pass
-            
-        return full_text, metadata, len(cookies_content) if cookies_content else 0
-        
-    except Exception as e:
-        print(f"⚠️ Method 1 failed: {e}")
-        
-    # METHOD 2: yt-dlp with Proxy Rotation
-    try:
+            info, vtt_content = _extract_after_probe(ydl_opts, video_url, probe_info)
+        except Exception as e:
+            # If blocked (e.g. 403 or Sign in confirmed), try one more time WITHOUT cookies
+            # YouTube sometimes aggressively blocks Datacenter IPs when logged in
+            # (unless that keeps failing from here too)
+            if not (cookie_set and not cancel.is_set() and _is_block_error(e)):
+                raise e
+            cookies_blocked.append(e)
+            info, vtt_content = _retry_without_cookies(ydl_opts, video_url, e)
+        
+        if vtt_content:
+            print("✅ Method 1.5 Success! yt-dlp direct worked.")
+            return _parse_vtt(vtt_content), info
+        else:
+            raise Exception("Method 1.5: No transcript file downloaded (likely no subs found)")
+
+    def method_1_proxy(cancel):
+        # Try YouTubeTranscriptApi with proxies
+        for attempt in range(3):
+            if cancel.is_set() or time.time() > deadline:
+                break
+                
+            proxy = proxy_manager.get_proxy()
+            if not proxy:
+                break
+            print(f"   Retrying YouTubeTranscriptApi with proxy {proxy['http']}...")
+            try:
+                request_started = time.time()
+                transcript_list = _fetch_transcript_api(video_id, cookie_set=cookie_set, proxies=proxy)
+                proxy_manager.report_success(proxy['http'], time.time() - request_started)
+                print("   ✅ Proxy success!")
+                full_text = format_transcript_items(transcript_list)
+                print(f"✅ Method 1 Success! Extracted {len(full_text)} chars")
+                return full_text, None
+            except Exception as pe:
+                print(f"   ❌ Proxy failed: {pe}")
+                proxy_manager.mark_failed(proxy)
+        
+        raise Exception("All YouTubeTranscriptApi attempts failed")
+
+    def method_2(cancel):
+        # METHOD 2: yt-dlp with Proxy Rotation
+        last_error = None
         for attempt in range(max_retries):
             # 45s cutoff to ensure we respond before 60s/100s gateway timeouts
-            if time.time() - start_time > 45: 
+            if cancel.is_set() or time.time() > deadline:
                 print("⚠️ Method 2 timed out")
                 break
                 
@@ -600,84 +2479,62 @@ def _get_youtube_transcript_with_cookies(video_id):
             proxy_url = proxies['http']
             print(f"🚀 Attempt {attempt+1}/{max_retries}: Fetching transcript via proxy {proxy_url}")
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                try:
-                    ydl_opts = {
-                        'skip_download': True,
-                        'writesubtitles': True,
-                        'writeautomaticsub': True,
-                        'subtitleslangs': ['en'],
-                        'subtitlesformat': 'vtt',
-                        'outtmpl': os.path.join(temp_dir, '%(id)s'),
-                        'quiet': False,
-                        'no_warnings': False,
-                        'socket_timeout': 30,
-                        'retries': 2,
-                        'force_ipv4': True,
-                        'format': 'worst',
-                        'extractor_args': {'youtube': {'player_client': ['web', 'android']}},
-                        'ignore_no_formats_error': True,
-                        'allow_unplayable_formats': True,
-                        'proxy': proxy_url
-                    }
-                    if cookies_file:
-                        ydl_opts['cookiefile'] = cookies_file
-                    
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        info = ydl.extract_info(video_url, download=True)
-                        
-                        # Extract metadata
-                        metadata['title'] = info.get('title', 'Unknown Title')
-                        metadata['uploader'] = info.get('uploader', 'Unknown Uploader')
-                        metadata['upload_date'] = info.get('upload_date')
-                        metadata['view_count'] = info.get('view_count', 0)
-                        metadata['channel_follower_count'] = info.get('channel_follower_count', 0)
-                        metadata['description'] = info.get('description', '')
-                        metadata['thumbnail'] = info.get('thumbnail', '')
-                        
-                        vtt_file = None
-                        files_in_dir = os.listdir(temp_dir)
-                        for filename in files_in_dir:
-                            if filename.endswith('.vtt'):
-                                vtt_file = os.path.join(temp_dir, filename)
-                                break
-                        
-                        if vtt_file:
-                            print(f"✅ Success! Downloaded VTT file via proxy")
-                            with open(vtt_file, 'r', encoding='utf-8') as f:
-                                vtt_content = f.read()
-                            full_text = _parse_vtt(vtt_content)
-                            if not full_text:
-                                raise Exception("Parsed transcript is empty")
-                            
-                            proxy_manager.report_success(proxy_url)
-                            return full_text, metadata, len(cookies_content) if cookies_content else 0
-                        else:
-                            raise Exception("No subtitle file downloaded")
+            try:
+                ydl_opts = {
+                    'quiet': False,
+                    'no_warnings': False,
+                    'socket_timeout': 30,
+                    'retries': 2,
+                    'force_ipv4': True,
+                    'format': 'worst',
+                    'extractor_args': {'youtube': {'player_client': ['web', 'android']}},
+                    'ignore_no_formats_error': True,
+                    'allow_unplayable_formats': True,
+                    'proxy': proxy_url
+                }
+                if cookie_set:
+                    ydl_opts['cookie_set'] = cookie_set
+                
+                request_started = time.time()
+                info, vtt_content = _extract_after_probe(ydl_opts, video_url, probe_info)
+                
+                if vtt_content:
+                    print(f"✅ Success! Downloaded VTT file via proxy")
+                    full_text = _parse_vtt(vtt_content) # Streamed tracks finish downloading here
+                    if not full_text:
+                        raise Exception("Parsed transcript is empty")
                     
-                except Exception as e:
-                    print(f"❌ Attempt {attempt+1} failed: {str(e)}")
-                    last_error = e
-                    proxy_manager.mark_failed(proxies)
-        
-        # If we get here, all attempts failed.
-        # Report ALL errors to help diagnostics
-        error_msg = f"Failed after {max_retries} attempts."
-        if method_1_5_error:
-            error_msg += f" Method 1.5 Error: {method_1_5_error}."
-        if last_error:
-            error_msg += f" Method 2 Last Error: {last_error}."
-        if method_1_error and not method_1_5_error:
-            error_msg += f" Method 1 Error: {method_1_error}."
+                    proxy_manager.report_success(proxy_url, time.time() - request_started)
+                    return full_text, info
+                else:
+                    raise Exception("No subtitle file downloaded")
+                
+            except Exception as e:
+                print(f"❌ Attempt {attempt+1} failed: {str(e)}")
+                last_error = e
+                proxy_manager.mark_failed(proxies)
+        
+        raise Exception(f"Failed after {max_retries} attempts. Last Error: {last_error}")
+
+    try:
+        strategy, full_text, info = _run_strategies_hedged([
+            ('Method 1', method_1),
+            ('Method 1.5', method_1_5),
+            ('Method 1 Proxy', method_1_proxy),
+            ('Method 2', method_2),
+        ], deadline, stats_prefix=f"youtube/{'cookies' if cookie_set else 'no cookies'}")
+
+        # Metadata already came from the probe; only strategies that had to extract
+        # the page themselves (probe failed) provide it here
+        if info and not probe_info:
+            fill_metadata(info)
             
-        raise Exception(error_msg)
+        cookie_manager.report(cookie_set, not cookies_blocked)
+        return full_text, metadata, cookie_set.size if cookie_set else 0
         
-    finally:
-        if cookies_file and os.path.exists(cookies_file):
-            try:
-                os.unlink(cookies_file)
-            except:
-                pass
+    except Exception:
+        cookie_manager.report(cookie_set, False)
+        raise
 
 
 def _fetch_vimeo_transcript(video_id):
@@ -686,192 +2543,430 @@ def _fetch_vimeo_transcript(video_id):
     """
     print(f"🔍 DEBUG: Starting Vimeo transcript fetch for {video_id}")
     
-    cookies_content = os.getenv('VIMEO_COOKIES')
-    cookies_file = None
-    
-    if cookies_content:
-        try:
-            fd, cookies_file = tempfile.mkstemp(suffix='.txt', text=True)
-            with os.fdopen(fd, 'w') as f:
-                f.write(cookies_content)
-            print("🔍 DEBUG: Created temporary Vimeo cookies file")
-        except Exception as e:
-            print(f"⚠️ DEBUG: Failed to create Vimeo cookies file: {e}")
-            cookies_file = None
-    else:
-        print("🔍 DEBUG: No VIMEO_COOKIES found in env")
+    cookie_set = cookie_manager.acquire('vimeo')
 
     try:
-        with tempfile.TemporaryDirectory() as temp_dir:
-            ydl_opts = {
-                'skip_download': True,
-                'writesubtitles': True,
-                'writeautomaticsub': True,
-                'subtitleslangs': ['en'],
-                'subtitlesformat': 'vtt',
-                'outtmpl': os.path.join(temp_dir, '%(id)s'),
-                'quiet': False,
-                'no_warnings': False,
-            }
-            if cookies_file:
-                ydl_opts['cookiefile'] = cookies_file
-                
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(f"https://vimeo.com/{video_id}", download=True)
-                
-                # Extract metadata
-                metadata = {
-                    'title': info.get('title', 'Unknown Title'),
-                    'uploader': info.get('uploader', 'Unknown Uploader'),
-                    'upload_date': info.get('upload_date'),
-                    'view_count': info.get('view_count', 0),
-                    'channel_follower_count': 0,
-                    'description': info.get('description', ''),
-                    'thumbnail': info.get('thumbnail', '')
-                }
-                
-                vtt_file = None
-                files_in_dir = os.listdir(temp_dir)
-                for filename in files_in_dir:
-                    if filename.endswith('.vtt'):
-                        vtt_file = os.path.join(temp_dir, filename)
-                        break
-                
-                if vtt_file:
-                    with open(vtt_file, 'r', encoding='utf-8') as f:
-                        print("✅ Vimeo Success! Downloaded VTT file.")
-                        return _parse_vtt(f.read()), metadata, len(cookies_content) if cookies_content else 0
-                else:
-                     raise Exception("No subtitle file downloaded from Vimeo")
-                     
+        ydl_opts = {
+            'quiet': False,
+            'no_warnings': False,
+        }
+        if cookie_set:
+            ydl_opts['cookie_set'] = cookie_set
+            
+        info, vtt_content = _extract_with_subtitles(ydl_opts, f"https://vimeo.com/{video_id}")
+        
+        # Extract metadata
+        metadata = {
+            'title': info.get('title', 'Unknown Title'),
+            'uploader': info.get('uploader', 'Unknown Uploader'),
+            'upload_date': info.get('upload_date'),
+            'view_count': info.get('view_count', 0),
+            'channel_follower_count': 0,
+            'description': info.get('description', ''),
+            'thumbnail': info.get('thumbnail', '')
+        }
+        
+        # Parsed before checking: a streamed track is only known to be empty once read
+        full_text = _parse_vtt(vtt_content) if vtt_content else ""
+        if full_text:
+            print("✅ Vimeo Success! Downloaded VTT file.")
+            cookie_manager.report(cookie_set, True)
+            return full_text, metadata, cookie_set.size if cookie_set else 0
+        else:
+             raise Exception("No subtitle file downloaded from Vimeo")
+             
     except Exception as e:
         print(f"❌ Vimeo fetch failed: {e}")
+        cookie_manager.report(cookie_set, False)
         raise e
-        
-    finally:
-        if cookies_file and os.path.exists(cookies_file):
-            try:
-                os.unlink(cookies_file)
-            except:
-                pass
 
 
 
 def _fetch_tiktok_transcript(video_id):
     """
     Fetch transcript from TikTok using yt-dlp and cookies.
+
+    The direct connection and the proxy attempts run as two strategies through
+    _run_strategies_hedged, so their order is learned per cookie variant like
+    YouTube's (e.g. direct is skipped while TikTok blocks this host).
     """
     print(f"🔍 DEBUG: Starting TikTok transcript fetch for {video_id}")
     
-    cookies_content = os.getenv('TIKTOK_COOKIES')
-    cookies_file = None
-    
-    if cookies_content:
-        try:
-            fd, cookies_file = tempfile.mkstemp(suffix='.txt', text=True)
-            with os.fdopen(fd, 'w') as f:
-                f.write(cookies_content)
-            print("🔍 DEBUG: Created temporary TikTok cookies file")
-        except Exception as e:
-            print(f"⚠️ DEBUG: Failed to create TikTok cookies file: {e}")
-            cookies_file = None
+    cookie_set = cookie_manager.acquire('tiktok')
+    max_retries = 5 # Proxies tried by the proxy strategy
+    deadline = time.time() + 45 # Global timeout safety (leave buffer for response)
+
+    # Construct URL based on ID format
+    if video_id.isdigit():
+        target_url = f"https://www.tiktok.com/@user/video/{video_id}"
     else:
-        print("🔍 DEBUG: No TIKTOK_COOKIES found in env")
+        # Short ID (e.g. ZNRkprvPT) -> use vm.tiktok.com
+        target_url = f"https://vm.tiktok.com/{video_id}"
+
+    def fetch(proxy_url):
+        ydl_opts = {
+            'quiet': False,
+            'no_warnings': False,
+            'socket_timeout': 30,
+        }
+        if cookie_set:
+            ydl_opts['cookie_set'] = cookie_set
+        if proxy_url:
+            ydl_opts['proxy'] = proxy_url
+
+        info, vtt_content = _extract_with_subtitles(ydl_opts, target_url)
+
+        # Check for subtitles
+        full_text = _parse_vtt(vtt_content) if vtt_content else ""
+        if full_text:
+            print("✅ TikTok Success! Downloaded VTT file.")
+        else:
+             # Fallback: Description is often the "text" for TikToks
+             print("⚠️ No subtitles found for TikTok. Using description/title as transcript.")
+             full_text = f"{info.get('title', '')}\n\n{info.get('description', '')}"
+
+        if not full_text:
+            raise Exception("No text content found (captions or description)")
+        return full_text, info
+
+    def direct(cancel):
+        print("🚀 TikTok: Fetching via DIRECT")
+        return fetch(None)
+
+    def via_proxies(cancel):
+        last_error = None
+        for attempt in range(max_retries):
+            if cancel.is_set() or time.time() > deadline:
+                break
+            proxies = proxy_manager.get_proxy(protocol_filter='http')
+            if not proxies:
+                break
+            proxy_url = proxies['http']
+            print(f"🚀 TikTok Attempt {attempt+1}/{max_retries}: Fetching via PROXY ({proxy_url})")
+            try:
+                request_started = time.time()
+                result = fetch(proxy_url)
+                proxy_manager.report_success(proxy_url, time.time() - request_started)
+                return result
+            except Exception as e:
+                print(f"❌ TikTok fetch failed (Attempt {attempt+1}): {e}")
+                last_error = e
+                proxy_manager.mark_failed(proxies)
+        raise Exception(f"All TikTok proxy attempts failed. Last error: {last_error}")
 
-    # Try direct connection first, then fallback to proxies
-    max_retries = 5
-    # attempts_list = [None] (Direct) + [proxies...]
-    attempts = [None] + [proxy_manager.get_proxy(protocol_filter='http') for _ in range(max_retries)]
-    
-    last_error = None
+    try:
+        strategy, full_text, info = _run_strategies_hedged([
+            ('Direct', direct),
+            ('Proxy', via_proxies),
+        ], deadline, stats_prefix=f"tiktok/{'cookies' if cookie_set else 'no cookies'}")
+    except Exception as e:
+        cookie_manager.report(cookie_set, False)
+        raise Exception(f"All TikTok attempts failed. {e}")
+
+    # Extract metadata
+    metadata = {
+        'title': info.get('title', 'Unknown TikTok'),
+        'uploader': info.get('uploader', 'Unknown User'),
+        'upload_date': info.get('upload_date'),
+        'view_count': info.get('view_count', 0),
+        'channel_follower_count': 0,
+        'description': info.get('description', ''),
+        'thumbnail': info.get('thumbnail', '')
+    }
+    cookie_manager.report(cookie_set, True)
+    return full_text, metadata, cookie_set.size if cookie_set else 0
+
+
+def _fetch_and_cache_transcript(platform, video_id):
+    """Run the platform fetcher and store the result in the transcript cache."""
+    if platform == 'vimeo':
+        full_transcript, metadata, cookie_count = _fetch_vimeo_transcript(video_id)
+    elif platform == 'tiktok':
+        full_transcript, metadata, cookie_count = _fetch_tiktok_transcript(video_id)
+    else:
+        full_transcript, metadata, cookie_count = _get_youtube_transcript_with_cookies(video_id)
+    transcript_cache.set((platform, video_id), {'transcript': full_transcript, 'metadata': metadata})
+    return full_transcript, metadata
+
+def start_transcript_fetch(platform, video_id):
+    """
+    Return the cached transcript, or start (or join) the fetch for it on the platform's pool.
+
+    Returns:
+        tuple: (cached_entry, None) on a cache hit, else (None, future of (transcript_text, metadata_dict))
+
+    Raises:
+        ExtractionSaturated: If the platform's extraction pool is full.
+    """
+    cached = transcript_cache.get((platform, video_id))
+    if cached:
+        print(f"⚡ Cache hit for {platform}:{video_id}")
+        return cached, None
+
+    future, is_leader = transcript_flights.submit(
+        (platform, video_id),
+        lambda: _fetch_and_cache_transcript(platform, video_id),
+        executor=extraction_pools.get(platform, extraction_pools['youtube'])
+    )
+    if not is_leader:
+        print(f"🔗 Joining in-flight fetch for {platform}:{video_id}")
+    return None, future
+
+def fetch_transcripts_parallel(video_ids, platform='youtube', timeout=PLAYLIST_TIMEOUT, concurrency=PLAYLIST_CONCURRENCY):
+    """
+    Fetch many transcripts at once on the platform's extraction pool, yielding each
+    result as soon as it completes. At most `concurrency` fetches are in flight, so one
+    playlist leaves workers and queue slots for single-video requests. When the pool
+    is saturated anyway, the rest wait for one of their own fetches to finish.
+
+    Yields:
+        tuple: (index, video_id, (transcript_text, metadata_dict) or Exception, cached)
+    """
+    deadline = time.time() + timeout
+    waiting = list(enumerate(video_ids))
+    running = {}
+    retry_after = 1
+    concurrency = max(1, concurrency)
+
+    while waiting or running:
+        saturated = False
+        while waiting and len(running) < concurrency:
+            index, video_id = waiting[0]
+            try:
+                cached, future = start_transcript_fetch(platform, video_id)
+            except ExtractionSaturated as e:
+                retry_after = e.retry_after
+                saturated = True
+                break
+            waiting.pop(0)
+            if cached:
+                yield index, video_id, (cached['transcript'], cached['metadata']), True
+            else:
+                running[future] = (index, video_id)
+
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        if not running:
+            # Saturated by other traffic; nothing of ours to wait on
+            time.sleep(min(retry_after, remaining))
+            continue
+        done, _ = wait(running, timeout=min(retry_after, remaining) if saturated else remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            index, video_id = running.pop(future)
+            try:
+                yield index, video_id, future.result(), False
+            except Exception as e:
+                yield index, video_id, e, False
+
+    for index, video_id in list(running.values()) + waiting:
+        yield index, video_id, Exception(f"Server Timeout ({timeout}s Limit) - Processing took too long"), False
+
+def list_collection_entries(collection_url, limit):
+    """
+    List the videos of a playlist or channel with a flat, metadata-only listing.
+
+    Returns:
+        tuple: (title, [{'video_id', 'title', 'duration'}, ...])
+    """
+    info, entries = ytdlp_engine.list_entries(collection_url, limit)
+    videos = []
+    for entry in entries:
+        if not entry or not entry.get('id') or entry.get('ie_key') not in (None, 'Youtube'):
+            continue # Nested playlists/tabs
+        videos.append({'video_id': entry['id'], 'title': entry.get('title'), 'duration': entry.get('duration')})
+    return info.get('title'), videos
+
+def fetch_transcript(platform, video_id, timeout=EXTRACTION_TIMEOUT):
+    """
+    Get a transcript via the cache, joining an in-flight fetch for the same video if there is one.
+
+    Returns:
+        tuple: (transcript_text, metadata_dict, cached)
+
+    Raises:
+        ExtractionSaturated: If the platform's extraction pool is full.
+    """
+    cached, future = start_transcript_fetch(platform, video_id)
+    if cached:
+        return cached['transcript'], cached['metadata'], True
 
     try:
-        for attempt, proxies in enumerate(attempts):
-            proxy_url = proxies['http'] if proxies else None
-            conn_type = "DIRECT" if not proxy_url else f"PROXY ({proxy_url})"
-            print(f"🚀 TikTok Attempt {attempt+1}/{len(attempts)}: Fetching via {conn_type}")
+        full_transcript, metadata = future.result(timeout=timeout)
+    except FuturesTimeoutError:
+        raise Exception(f"Server Timeout ({timeout}s Limit) - Processing took too long")
+    return full_transcript, metadata, False
 
-            with tempfile.TemporaryDirectory() as temp_dir:
-                try:
-                    ydl_opts = {
-                        'skip_download': True,
-                        'writesubtitles': True, # TikTok often has them
-                        'writeautomaticsub': True,
-                        'subtitleslangs': ['en'],
-                        'subtitlesformat': 'vtt', 
-                        'outtmpl': os.path.join(temp_dir, '%(id)s'),
-                        'quiet': False,
-                        'no_warnings': False,
-                        'socket_timeout': 30,
-                    }
-                    if cookies_file:
-                        ydl_opts['cookiefile'] = cookies_file
-                    if proxy_url:
-                        ydl_opts['proxy'] = proxy_url
-
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        # Construct generic URL using just the ID
-                        # Construct URL based on ID format
-                        if video_id.isdigit():
-                            target_url = f"https://www.tiktok.com/@user/video/{video_id}"
-                        else:
-                            # Short ID (e.g. ZNRkprvPT) -> use vm.tiktok.com
-                            target_url = f"https://vm.tiktok.com/{video_id}"
-                        
-                        info = ydl.extract_info(target_url, download=True)
-                        
-                        # Extract metadata
-                        metadata = {
-                            'title': info.get('title', 'Unknown TikTok'),
-                            'uploader': info.get('uploader', 'Unknown User'),
-                            'upload_date': info.get('upload_date'),
-                            'view_count': info.get('view_count', 0),
-                            'channel_follower_count': 0,
-                            'description': info.get('description', ''),
-                            'thumbnail': info.get('thumbnail', '')
-                        }
-                        
-                        # Check for subtitles
-                        vtt_file = None
-                        files_in_dir = os.listdir(temp_dir)
-                        for filename in files_in_dir:
-                            if filename.endswith('.vtt'):
-                                vtt_file = os.path.join(temp_dir, filename)
-                                break
-                        
-                        full_text = ""
-                        if vtt_file:
-                            with open(vtt_file, 'r', encoding='utf-8') as f:
-                                print("✅ TikTok Success! Downloaded VTT file.")
-                                full_text = _parse_vtt(f.read())
-                        else:
-                             # Fallback: Description is often the "text" for TikToks
-                             print("⚠️ No subtitles found for TikTok. Using description/title as transcript.")
-                             full_text = f"{info.get('title', '')}\n\n{info.get('description', '')}"
-
-                        if not full_text:
-                            raise Exception("No text content found (captions or description)")
-
-                        if proxy_url:
-                            proxy_manager.report_success(proxy_url)
-                            
-                        return full_text, metadata, len(cookies_content) if cookies_content else 0
+def summary_cache_key(prompt):
+    """Summaries are cached by a hash of the full prompt (transcript, length and tone)."""
+    return (hashlib.sha256(prompt.encode('utf-8')).hexdigest(),)
 
-                except Exception as e:
-                    print(f"❌ TikTok fetch failed (Attempt {attempt+1}): {e}")
-                    last_error = e
-                    if proxy_url:
-                        proxy_manager.mark_failed(proxies)
-        
-        raise Exception(f"All TikTok attempts failed. Last error: {last_error}")
+def generate_summary(transcript, length='short', tone='conversational', regenerate=False, store=False):
+    """
+    Summarize a transcript, reusing a cached summary of the identical prompt.
 
-    finally:
-        if cookies_file and os.path.exists(cookies_file):
+    Only the channel watcher stores summaries (store=True), so the cache holds the
+    precomputed summaries of watched uploads rather than every request for SUMMARY_CACHE_TTL.
+    regenerate=True skips the cached summary and always asks Gemini.
+
+    Returns:
+        tuple: (summary_text, cached)
+    """
+    prompt = build_summary_prompt(transcript, length, tone)
+    key = summary_cache_key(prompt)
+    cached = None if regenerate else summary_cache.get(key)
+    if cached:
+        return cached['summary'], True
+    response = generate_gemini_content(prompt)
+    if store:
+        summary_cache.set(key, {'summary': response.text})
+    return response.text, False
+
+async def generate_summary_async(transcript, length='short', tone='conversational', regenerate=False):
+    """Async variant of generate_summary for the ASGI server (requests never store)."""
+    prompt = build_summary_prompt(transcript, length, tone)
+    key = summary_cache_key(prompt)
+    cached = None if regenerate else summary_cache.get(key)
+    if cached:
+        return cached['summary'], True
+    response = await generate_gemini_content_async(prompt)
+    return response.text, False
+
+class ChannelFeedWatcher:
+    """
+    Polls channel Atom feeds and precomputes transcripts and summaries for new uploads.
+
+    Each poll reads every configured feed, and for the newest videos that are not
+    done yet runs the normal transcript fetch (which fills the transcript cache) and
+    the default summary (which fills the summary cache). By the time users ask for a
+    popular new upload, both are cache hits.
+
+    Finished videos (and ones that ran out of attempts) are remembered in insertion
+    order up to max_done; feeds only list recent uploads, so the oldest are dropped.
+    """
+    ATOM = '{http://www.w3.org/2005/Atom}'
+    YT = '{http://www.youtube.com/xml/schemas/2015}'
+
+    def __init__(self, channels, interval=900, feed_base_url='https://www.youtube.com/feeds/videos.xml',
+                 max_per_poll=5, max_attempts=3, summary_length='short', summary_tone='conversational',
+                 max_done=1000):
+        self.channels = channels
+        self.interval = interval
+        self.feed_base_url = feed_base_url
+        self.max_per_poll = max_per_poll
+        self.max_attempts = max_attempts
+        self.summary_length = summary_length
+        self.summary_tone = summary_tone
+        self.max_done = max_done
+        self.done = OrderedDict() # video_id -> None, oldest first
+        self.attempts = {}
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.stats = {'polls': 0, 'feed_errors': 0, 'precomputed': 0, 'failed': 0, 'last_poll': None}
+
+    def _feed_url(self, channel):
+        if channel.startswith('http'):
+            return channel
+        return f"{self.feed_base_url}?channel_id={channel}"
+
+    def _read_feed(self, channel):
+        """Return the video IDs in a channel feed, newest first."""
+        url = self._feed_url(channel)
+        resp = http_sessions.get(url).get(url, timeout=10)
+        resp.raise_for_status()
+        root = ET.fromstring(resp.content)
+        entries = []
+        for entry in root.iter(f'{self.ATOM}entry'):
+            video_id = entry.findtext(f'{self.YT}videoId')
+            if video_id:
+                entries.append((entry.findtext(f'{self.ATOM}published') or '', video_id))
+        entries.sort(reverse=True)
+        return [video_id for _, video_id in entries]
+
+    def _precompute(self, video_id):
+        transcript, metadata, cached = fetch_transcript('youtube', video_id)
+        summary, summary_cached = generate_summary(transcript, self.summary_length, self.summary_tone, store=True)
+        return cached and summary_cached
+
+    def _mark_done(self, video_id):
+        self.attempts.pop(video_id, None)
+        self.done[video_id] = None
+        while len(self.done) > self.max_done:
+            self.done.popitem(last=False)
+
+    def poll_once(self):
+        """
+        Poll every feed once.
+
+        Returns:
+            list: Video IDs precomputed during this poll.
+        """
+        self.stats['polls'] += 1
+        candidates = []
+        for channel in self.channels:
             try:
-                os.unlink(cookies_file)
-            except:
-                pass
+                new = [v for v in self._read_feed(channel) if v not in self.done]
+                candidates.extend(new[:self.max_per_poll])
+            except Exception as e:
+                self.stats['feed_errors'] += 1
+                print(f"⚠️ Watcher: failed to read feed for {channel}: {e}")
 
+        precomputed = []
+        for video_id in candidates:
+            if self.stop_event.is_set():
+                break
+            try:
+                already_cached = self._precompute(video_id)
+                self._mark_done(video_id)
+                if not already_cached:
+                    precomputed.append(video_id)
+                    self.stats['precomputed'] += 1
+                    print(f"🛰️ Watcher: precomputed transcript and summary for {video_id}")
+            except ExtractionSaturated:
+                # Leave it for the next poll rather than competing with user traffic
+                print("🚦 Watcher: extraction pool busy, deferring the rest of this poll")
+                break
+            except Exception as e:
+                self.attempts[video_id] = self.attempts.get(video_id, 0) + 1
+                self.stats['failed'] += 1
+                print(f"⚠️ Watcher: {video_id} failed (attempt {self.attempts[video_id]}): {e}")
+                if self.attempts[video_id] >= self.max_attempts:
+                    self._mark_done(video_id) # Give up on it
+        self.stats['last_poll'] = time.time()
+        return precomputed
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"⚠️ Watcher: poll failed: {e}")
+            self.stop_event.wait(self.interval)
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        print(f"🛰️ Watching {len(self.channels)} channel feed(s) every {self.interval}s")
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name='channel-watcher')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def get_stats(self):
+        return dict(self.stats, channels=len(self.channels), done=len(self.done))
+
+# Global channel watcher; only runs when WATCH_CHANNELS is configured
+channel_watcher = ChannelFeedWatcher(
+    WATCH_CHANNELS,
+    interval=WATCH_INTERVAL,
+    feed_base_url=WATCH_FEED_BASE_URL,
+    max_per_poll=WATCH_MAX_PER_POLL
+)
+if WATCH_CHANNELS:
+    channel_watcher.start()
 
 @app.route('/api/extract-transcript', methods=['POST'])
 def extract_transcript():
@@ -893,30 +2988,14 @@ def extract_transcript():
         if not video_id:
             return jsonify({'error': 'Invalid URL'}), 400
         
-            else:
-                 # Wrap YouTube extraction in a thread with timeout
-                result_queue = queue.Queue()
-                
-                def worker():
-                    try:
-                        res = _get_youtube_transcript_with_cookies(video_id)
-                        result_queue.put(('success', res))
-                    except Exception as e:
-                        result_queue.put(('error', e))
-
-                t = threading.Thread(target=worker)
-                t.daemon = True # Daemon thread dies when main process dies (though Flask workers persist)
-                t.start()
-                
-                try:
-                    # Wait 45s max
-                    result = result_queue.get(timeout=45)
-                    status, data = result
-                    if status == 'error':
-                        raise data
-                    full_transcript, metadata, cookie_count = data
-                except queue.Empty:
-                    raise Exception("Server Timeout (45s Limit) - Processing took too long")
+        try:
+            try:
+                full_transcript, metadata, cached = fetch_transcript(platform, video_id)
+            except ExtractionSaturated as e:
+                print(f"🚦 {e}")
+                response = jsonify({'error': 'SERVER_BUSY', 'retry_after': e.retry_after})
+                response.headers['Retry-After'] = str(e.retry_after)
+                return response, 503
             
             return jsonify({
                 'success': True,
@@ -925,6 +3004,7 @@ def extract_transcript():
                 'metadata': metadata, # Return full metadata object
                 'transcript': full_transcript,
                 'length': len(full_transcript),
+                'cached': bool(cached),
                 'deployment_id': DEPLOYMENT_ID
             })
             
@@ -939,6 +3019,101 @@ def extract_transcript():
         traceback.print_exc()
         return jsonify({'error': f'Critical Server Error: {str(e)} [Deployment ID: {DEPLOYMENT_ID}]'}), 500
 
+def parse_playlist_request(data):
+    """
+    Validate an /api/extract-playlist body (shared by the Flask and ASGI routes).
+
+    Returns:
+        tuple: (collection_url, 'playlist'|'channel', limit)
+
+    Raises:
+        ValueError: With the message for a 400 response.
+    """
+    collection_url, kind = extract_collection_url(data.get('url', ''))
+    if not collection_url:
+        raise ValueError('A YouTube playlist or channel URL is required')
+    try:
+        limit = max(1, min(int(data.get('limit', PLAYLIST_MAX_ENTRIES)), PLAYLIST_MAX_ENTRIES))
+    except (TypeError, ValueError):
+        raise ValueError('limit must be a number')
+    return collection_url, kind, limit
+
+def playlist_video_event(videos, completed, index, video_id, result, cached):
+    """Build the NDJSON 'video' line for one finished fetch of a playlist."""
+    event = {'type': 'video', 'index': index, 'video_id': video_id, 'completed': completed, 'total': len(videos)}
+    if isinstance(result, Exception):
+        event.update(status='error', title=videos[index]['title'], error=str(result))
+    else:
+        full_transcript, metadata = result
+        event.update(status='ok', title=metadata.get('title'), metadata=metadata,
+                     transcript=full_transcript, cached=bool(cached))
+    return event
+
+@app.route('/api/extract-playlist', methods=['POST'])
+def extract_playlist():
+    """
+    Extract transcripts for every video of a YouTube playlist or channel.
+
+    Streams newline-delimited JSON: a 'playlist' line with the entries, one 'video'
+    line per video in completion order, and a final 'done' line.
+    """
+    try:
+        collection_url, kind, limit = parse_playlist_request(request.json or {})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    print(f"📜 Listing {kind}: {collection_url} (limit {limit})")
+    try:
+        title, videos = list_collection_entries(collection_url, limit)
+    except Exception as e:
+        return jsonify({'error': f'Error listing {kind}: {str(e)}'}), 500
+    if not videos:
+        return jsonify({'error': f'No videos found in this {kind}'}), 404
+
+    def generate():
+        start = time.time()
+        yield json.dumps({'type': 'playlist', 'kind': kind, 'title': title, 'total': len(videos), 'entries': videos}) + '\n'
+        counts = {'ok': 0, 'failed': 0}
+        results = fetch_transcripts_parallel([v['video_id'] for v in videos])
+        for completed, (index, video_id, result, cached) in enumerate(results, 1):
+            event = playlist_video_event(videos, completed, index, video_id, result, cached)
+            counts['failed' if event['status'] == 'error' else 'ok'] += 1
+            yield json.dumps(event) + '\n'
+        print(f"✅ {kind} done: {counts['ok']} ok, {counts['failed']} failed in {time.time() - start:.1f}s")
+        yield json.dumps(dict(counts, type='done', elapsed=round(time.time() - start, 2))) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    """
+    Readiness probe for the load balancer.
+
+    One saturated platform must not take the whole instance out of rotation, since
+    the other platforms can still serve requests. Without arguments the probe reports
+    503 only when every extraction pool is saturated. ?platform=youtube checks a
+    single pool instead. The body always lists readiness per platform.
+    """
+    platform = request.args.get('platform')
+    if platform and platform not in extraction_pools:
+        return jsonify({'error': f'Unknown platform: {platform}'}), 400
+    saturated = [name for name, pool in extraction_pools.items() if pool.is_saturated()]
+    if platform:
+        is_ready = platform not in saturated
+    else:
+        is_ready = len(saturated) < len(extraction_pools)
+    status = {
+        'ready': is_ready,
+        'saturated': saturated,
+        'platforms': {name: name not in saturated for name in extraction_pools},
+        'pools': {name: pool.get_stats() for name, pool in extraction_pools.items()}
+    }
+    if not is_ready:
+        response = jsonify(status)
+        response.headers['Retry-After'] = str(EXTRACTION_RETRY_AFTER)
+        return response, 503
+    return jsonify(status)
+
 @app.route('/api/diagnostics', methods=['GET'])
 def diagnostics():
     """Diagnostic endpoint to check configuration"""
@@ -951,9 +3126,19 @@ def diagnostics():
         'cookies_configured': bool(cookies_content),
         'cookies_line_count': len(cookies_content.splitlines()) if cookies_content else 0,
         'cookies_has_header': cookies_content.startswith('# Netscape') if cookies_content else False,
+        'cookie_sets': cookie_manager.get_stats(),
         'gemini_api_configured': bool(os.getenv('GEMINI_API_KEY')),
         'proxy_mode': 'free_rotation',
-        'cached_proxies': len(proxy_manager.proxies)
+        'cached_proxies': len(proxy_manager.proxies),
+        'proxy_pool': proxy_manager.get_stats(),
+        'strategies': strategy_stats.get_stats(),
+        'transcript_cache': transcript_cache.get_stats(),
+        'inflight_fetches': transcript_flights.get_stats(),
+        'http_sessions': http_sessions.get_stats(),
+        'extraction_pools': {name: pool.get_stats() for name, pool in extraction_pools.items()},
+        'strategy_pool': strategy_pool.get_stats(),
+        'summary_cache': summary_cache.get_stats(),
+        'channel_watcher': channel_watcher.get_stats()
     }
     
     return jsonify(diagnostics_info)
@@ -972,16 +3157,13 @@ def summarize():
         if not transcript:
             return jsonify({'error': 'Transcript is required'}), 400
         
-        # Build prompt based on preferences
-        prompt = build_summary_prompt(transcript, length, tone)
-
-        # Generate summary using helper with fallback
-        response = generate_gemini_content(prompt)
-        summary_text = response.text
+        # Build prompt based on preferences and generate (or reuse) the summary
+        summary_text, cached = generate_summary(transcript, length, tone, regenerate=bool(data.get('regenerate')))
 
         return jsonify({
             'success': True,
-            'summary': summary_text
+            'summary': summary_text,
+            'cached': cached
         })
         
     except Exception as e:
@@ -1116,6 +3298,196 @@ Transcript:
     
     return prompt
 
+def build_chat_prompt(transcript_text, question):
+    """Build the prompt for answering a question about the video"""
+    return f"""
+        You are a helpful AI assistant answering questions about a YouTube video based on its transcript.
+        
+        TRANSCRIPT:
+        {fit_transcript(transcript_text)}
+        
+        USER QUESTION: {question}
+        
+        ANSWER (be concise and direct):
+        """
+
+def build_mindmap_prompt(transcript_text):
+    """Build the prompt for a Mermaid.js mind map (Using Graph LR for robustness)"""
+    return f"""
+        Create a Mermaid.js diagram to visualize the key concepts of this video transcript.
+        Use a Left-to-Right Graph (flowchart) style, which looks like a mind map.
+
+        Rules:
+        1. Start with `graph LR`
+        2. Define the central topic node using double circles: `root((Central Topic))`
+        3. Connect nodes using arrows `-->`.
+        4. USE QUOTED LABELS for child nodes: `id["Node Label"]`.
+        5. DO NOT use double quotes `"` INSIDE the label. Use single quotes `'` instead if needed.
+        6. Assign unique IDs to every node (e.g., A, B, C1, C2).
+        7. Keep labels concise (1-5 words).
+        8. Return ONLY the raw Mermaid syntax. Do not use markdown blocks.
+
+        Example Format:
+        graph LR
+            root((Start))
+            root --> A[Topic A]
+            root --> B[Topic B]
+            A --> A1[Detail 1]
+            A --> A2[Detail 2]
+            B --> B1[Detail 3]
+
+        TRANSCRIPT:
+        {fit_transcript(transcript_text)}
+        
+        MERMAID SYNTAX:
+        """
+
+def clean_mindmap_syntax(mermaid_syntax):
+    """Repair common formatting mistakes in model-generated Mermaid syntax"""
+    # Cleanup: Remove markdown code blocks
+    mermaid_syntax = mermaid_syntax.replace('```mermaid', '').replace('```', '').strip()
+
+    # Basic cleanup
+    if not mermaid_syntax.startswith('graph'):
+         # If model forgot 'graph LR', try to prepend it if it looks like edges
+         if '-->' in mermaid_syntax:
+             mermaid_syntax = "graph LR\n" + mermaid_syntax
+
+    # Safety: Ensure content inside [] is quoted if not already
+    # Pattern: [ followed by non-quote chars, ending with ]
+    # Replace with ["contents"]
+    # This fixes issues like [Facebook (2011)] breaking syntax
+    return re.sub(r'\[([^"\]]+?)\]', r'["\1"]', mermaid_syntax)
+
+def build_steps_prompt(transcript):
+    """Build the prompt for extracting actionable steps"""
+    return f"""Analyze the following transcript and determine if it contains instructions, a tutorial, or actionable advice.
+        
+If it DOES:
+Extract the steps into a clear, numbered list. Use bold for the step title and normal text for the details.
+Format as Markdown.
+
+If it DOES NOT (e.g. it's just a vlog or opinion piece without steps):
+Return exactly: "NO_STEPS_FOUND"
+
+Transcript:
+{transcript}"""
+
+def build_infographic_prompt(summary_text, tone):
+    """Build the SVG infographic prompt, styled after the summary tone"""
+    # Style Mapping
+    TONE_STYLE_MAP = {
+        'conversational': "Friendly, hand-drawn whiteboard sketch with colorful marker icons and arrow connectors.",
+        'professional': "Clean Swiss design, corporate blue and slate palette, minimalist flat icons, and structured grid layout.",
+        'technical': "Schematic blueprint style, detailed wireframes, monospaced fonts, and data-heavy node-and-edge diagrams.",
+        'witty': "Vibrant pop-art style, bold typography, comic-book speech bubbles, and high-contrast saturated colors.",
+        'sarcastic': "Dark humor aesthetic, 'dystopian corporate' glitch art, cynical meme-inspired layout with ironic neon accents."
+    }
+    
+    # Get style based on tone, default to conversational
+    visual_style = TONE_STYLE_MAP.get(tone, TONE_STYLE_MAP['conversational'])
+    
+    # Construct Prompt
+    return f"""
+        Create a comprehensive SVG infographic in the style: "{visual_style}"
+        
+        Task:
+        1. Extract the key concepts from the following transcript summary.
+        2. Visualize them using shapes, icons, and text appropriate for the requested style.
+        3. The Title of the infographic must include the literal string "INFOGRAPHIC".
+        
+        Visual Layout Constraints (CRITICAL):
+        - Aspect Ratio: Use a vertical 9:16 ratio (e.g., viewBox="0 0 900 1600").
+        - Safe Zones: Ensure all text and headings have at least 10% padding from all edges to prevent clipping.
+        - Heading Management: For long headings (e.g., "The AI Rube Goldberg Infographic"), force a multi-line stack or reduce font size to ensure it fits the width. Do NOT let text overflow.
+        - Text Contrast: Ensure high contrast for text on colorful blocks (e.g., use dark text on yellow/pink/orange, white text on dark backgrounds). Readability is paramount.
+        
+        Technical Requirements:
+        - Return ONLY raw SVG code.
+        - Start with <svg and end with </svg>.
+        - Width: 100%, Height: auto.
+        - Use a modern color palette compatible with the requested style.
+        
+        Transcript Summary:
+        {summary_text}
+        """
+
+def extract_svg(raw_text):
+    """Extract the SVG element from a model response, or an empty string"""
+    svg_match = re.search(r'<svg.*?</svg>', raw_text, re.DOTALL | re.IGNORECASE)
+    return svg_match.group(0) if svg_match else ""
+
+def build_quiz_prompt(transcript):
+    """Build the prompt for a 5-question quiz (forces a JSON response)"""
+    return f"""Generate a 5-question multiple choice quiz based on this transcript.
+        Return the result as a raw JSON array of objects (no markdown formatting, no code blocks).
+        
+        Format:
+        [
+            {{
+                "question": "Question text?",
+                "options": ["Option A", "Option B", "Option C", "Option D"],
+                "correct_index": 0  // 0-3 indicating the correct option
+            }}
+        ]
+
+        Transcript:
+        {transcript}"""
+
+def build_podcast_prompt(transcript, length, tone):
+    """Build the prompt for a two-host podcast dialogue"""
+    # Tone instructions for podcast
+    tone_map = {
+        'conversational': 'natural, friendly, and enthusiastic',
+        'professional': 'professional, structured, and insightful',
+        'academic': 'intellectual, precise, and analytical',
+        'witty': 'humorous, witty, and fun',
+        'sarcastic': 'sarcastic, cynical, and dryly humorous',
+        'technical': 'dense, factual, and straight to the point'
+    }
+    
+    # Length instructions for podcast
+    length_map = {
+        'short': 'Keep it brief (about 1-2 minutes reading time). Focus only on the main takeaway.',
+        'medium': 'Standard length (about 2-3 minutes reading time). Cover key points.',
+        'long': 'Detailed discussion (about 3-5 minutes reading time). Explore topics in depth.'
+    }
+    
+    selected_tone = tone_map.get(tone, tone_map['conversational'])
+    selected_length = length_map.get(length, length_map['medium'])
+    
+    return f"""Convert this transcript into an engaging podcast dialogue between two hosts, 'Alex' (Host A) and 'Jamie' (Host B).
+        
+        Settings:
+        - Tone: {selected_tone}
+        - Length: {selected_length}
+        
+        Rules:
+        1. Make it sound {selected_tone}.
+        2. Alex introduces the topic. Jamie asks insightful questions or adds details.
+        3. {selected_length}
+        4. Return the result as a JSON array of objects.
+        
+        Format:
+        [
+            {{"speaker": "Alex", "text": "Welcome back! Today we're discussing..."}},
+            {{"speaker": "Jamie", "text": "I'm excited about this one..."}}
+        ]
+        
+        Transcript:
+        {transcript}"""
+
+def parse_json_response(text):
+    """Parse a JSON model response, stripping markdown code blocks if the model ignores instructions"""
+    text = text.strip()
+    if text.startswith('```json'):
+        text = text[7:]
+    if text.startswith('```'):
+        text = text[3:]
+    if text.endswith('```'):
+        text = text[:-3]
+    return json.loads(text)
+
 @app.route('/api/features', methods=['GET'])
 def get_features():
     """Get feature flags from features.json"""
@@ -1174,16 +3546,7 @@ def chat():
 
     try:
         # Construct prompt
-        prompt = f"""
-        You are a helpful AI assistant answering questions about a YouTube video based on its transcript.
-        
-        TRANSCRIPT:
-        {transcript_text[:MAX_TRANSCRIPT_LENGTH]}
-        
-        USER QUESTION: {question}
-        
-        ANSWER (be concise and direct):
-        """
+        prompt = build_chat_prompt(transcript_text, question)
         
         answer = generate_gemini_content(prompt)
         return jsonify({'success': True, 'answer': answer})
@@ -1203,52 +3566,10 @@ def generate_mindmap():
 
     try:
         # Construct prompt for Mermaid.js (Using Graph LR for robustness)
-        prompt = f"""
-        Create a Mermaid.js diagram to visualize the key concepts of this video transcript.
-        Use a Left-to-Right Graph (flowchart) style, which looks like a mind map.
-
-        Rules:
-        1. Start with `graph LR`
-        2. Define the central topic node using double circles: `root((Central Topic))`
-        3. Connect nodes using arrows `-->`.
-        4. USE QUOTED LABELS for child nodes: `id["Node Label"]`.
-        5. DO NOT use double quotes `"` INSIDE the label. Use single quotes `'` instead if needed.
-        6. Assign unique IDs to every node (e.g., A, B, C1, C2).
-        7. Keep labels concise (1-5 words).
-        8. Return ONLY the raw Mermaid syntax. Do not use markdown blocks.
-
-        Example Format:
-        graph LR
-            root((Start))
-            root --> A[Topic A]
-            root --> B[Topic B]
-            A --> A1[Detail 1]
-            A --> A2[Detail 2]
-            B --> B1[Detail 3]
-
-        TRANSCRIPT:
-        {transcript_text[:MAX_TRANSCRIPT_LENGTH]}
-        
-        MERMAID SYNTAX:
-        """
+        prompt = build_mindmap_prompt(transcript_text)
         
         response = generate_gemini_content(prompt)
-        mermaid_syntax = response.text
-        
-        # Cleanup: Remove markdown code blocks
-        mermaid_syntax = mermaid_syntax.replace('```mermaid', '').replace('```', '').strip()
-
-        # Basic cleanup
-        if not mermaid_syntax.startswith('graph'):
-             # If model forgot 'graph LR', try to prepend it if it looks like edges
-             if '-->' in mermaid_syntax:
-                 mermaid_syntax = "graph LR\n" + mermaid_syntax
-
-        # Safety: Ensure content inside [] is quoted if not already
-        # Pattern: [ followed by non-quote chars, ending with ]
-        # Replace with ["contents"]
-        # This fixes issues like [Facebook (2011)] breaking syntax
-        mermaid_syntax = re.sub(r'\[([^"\]]+?)\]', r'["\1"]', mermaid_syntax)
+        mermaid_syntax = clean_mindmap_syntax(response.text)
         
         return jsonify({'success': True, 'mindmap': mermaid_syntax})
 
@@ -1268,17 +3589,7 @@ def extract_steps():
 
         print(f"DEBUG: Steps Transcript length: {len(transcript)} chars")
         
-        prompt = f"""Analyze the following transcript and determine if it contains instructions, a tutorial, or actionable advice.
-        
-If it DOES:
-Extract the steps into a clear, numbered list. Use bold for the step title and normal text for the details.
-Format as Markdown.
-
-If it DOES NOT (e.g. it's just a vlog or opinion piece without steps):
-Return exactly: "NO_STEPS_FOUND"
-
-Transcript:
-{transcript}"""
+        prompt = build_steps_prompt(transcript)
 
         response = generate_gemini_content(prompt)
         return jsonify({'success': True, 'steps': response.text})
@@ -1302,51 +3613,13 @@ def generate_infographic():
     print(f"📊 Generating Infographic for tone: {tone}")
     
     try:
-        # Style Mapping
-        TONE_STYLE_MAP = {
-            'conversational': "Friendly, hand-drawn whiteboard sketch with colorful marker icons and arrow connectors.",
-            'professional': "Clean Swiss design, corporate blue and slate palette, minimalist flat icons, and structured grid layout.",
-            'technical': "Schematic blueprint style, detailed wireframes, monospaced fonts, and data-heavy node-and-edge diagrams.",
-            'witty': "Vibrant pop-art style, bold typography, comic-book speech bubbles, and high-contrast saturated colors.",
-            'sarcastic': "Dark humor aesthetic, 'dystopian corporate' glitch art, cynical meme-inspired layout with ironic neon accents."
-        }
-        
-        # Get style based on tone, default to conversational
-        visual_style = TONE_STYLE_MAP.get(tone, TONE_STYLE_MAP['conversational'])
-        
-        # Construct Prompt
-        infographic_prompt = f"""
-        Create a comprehensive SVG infographic in the style: "{visual_style}"
-        
-        Task:
-        1. Extract the key concepts from the following transcript summary.
-        2. Visualize them using shapes, icons, and text appropriate for the requested style.
-        3. The Title of the infographic must include the literal string "INFOGRAPHIC".
-        
-        Visual Layout Constraints (CRITICAL):
-        - Aspect Ratio: Use a vertical 9:16 ratio (e.g., viewBox="0 0 900 1600").
-        - Safe Zones: Ensure all text and headings have at least 10% padding from all edges to prevent clipping.
-        - Heading Management: For long headings (e.g., "The AI Rube Goldberg Infographic"), force a multi-line stack or reduce font size to ensure it fits the width. Do NOT let text overflow.
-        - Text Contrast: Ensure high contrast for text on colorful blocks (e.g., use dark text on yellow/pink/orange, white text on dark backgrounds). Readability is paramount.
-        
-        Technical Requirements:
-        - Return ONLY raw SVG code.
-        - Start with <svg and end with </svg>.
-        - Width: 100%, Height: auto.
-        - Use a modern color palette compatible with the requested style.
-        
-        Transcript Summary:
-        {summary_text}
-        """
+        infographic_prompt = build_infographic_prompt(summary_text, tone)
         
         # Use same model logic (fast/flash preferred)
         infographic_response = generate_gemini_content(infographic_prompt)
         raw_text = infographic_response.text
         
-        # Extract SVG using regex
-        import re
-        svg_match = re.search(r'<svg.*?</svg>', raw_text, re.DOTALL | re.IGNORECASE)
-        infographic_text = svg_match.group(0) if svg_match else ""
+        infographic_text = extract_svg(raw_text)
         
         return jsonify({
             'success': True,
@@ -1370,33 +3643,11 @@ def generate_quiz():
         print(f"DEBUG: Quiz Transcript length: {len(transcript)} chars")
         
         # Force JSON response for the quiz
-        prompt = f"""Generate a 5-question multiple choice quiz based on this transcript.
-        Return the result as a raw JSON array of objects (no markdown formatting, no code blocks).
-        
-        Format:
-        [
-            {{
-                "question": "Question text?",
-                "options": ["Option A", "Option B", "Option C", "Option D"],
-                "correct_index": 0  // 0-3 indicating the correct option
-            }}
-        ]
-
-        Transcript:
-        {transcript}"""
+        prompt = build_quiz_prompt(transcript)
 
         response = generate_gemini_content(prompt)
         
-        # Clean up potential markdown code blocks if the model ignores instructions
-        text = response.text.strip()
-        if text.startswith('```json'):
-            text = text[7:]
-        if text.startswith('```'):
-            text = text[3:]
-        if text.endswith('```'):
-            text = text[:-3]
-            
-        return jsonify({'success': True, 'quiz': json.loads(text)})
+        return jsonify({'success': True, 'quiz': parse_json_response(response.text)})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1419,59 +3670,11 @@ def generate_podcast():
 
         print(f"DEBUG: Podcast Transcript length: {len(transcript)} chars")
         
-        # Tone instructions for podcast
-        tone_map = {
-            'conversational': 'natural, friendly, and enthusiastic',
-            'professional': 'professional, structured, and insightful',
-            'academic': 'intellectual, precise, and analytical',
-            'witty': 'humorous, witty, and fun',
-            'sarcastic': 'sarcastic, cynical, and dryly humorous',
-            'technical': 'dense, factual, and straight to the point'
-        }
-        
-        # Length instructions for podcast
-        length_map = {
-            'short': 'Keep it brief (about 1-2 minutes reading time). Focus only on the main takeaway.',
-            'medium': 'Standard length (about 2-3 minutes reading time). Cover key points.',
-            'long': 'Detailed discussion (about 3-5 minutes reading time). Explore topics in depth.'
-        }
-        
-        selected_tone = tone_map.get(tone, tone_map['conversational'])
-        selected_length = length_map.get(length, length_map['medium'])
-        
-        prompt = f"""Convert this transcript into an engaging podcast dialogue between two hosts, 'Alex' (Host A) and 'Jamie' (Host B).
-        
-        Settings:
-        - Tone: {selected_tone}
-        - Length: {selected_length}
-        
-        Rules:
-        1. Make it sound {selected_tone}.
-        2. Alex introduces the topic. Jamie asks insightful questions or adds details.
-        3. {selected_length}
-        4. Return the result as a JSON array of objects.
-        
-        Format:
-        [
-            {{"speaker": "Alex", "text": "Welcome back! Today we're discussing..."}},
-            {{"speaker": "Jamie", "text": "I'm excited about this one..."}}
-        ]
-        
-        Transcript:
-        {transcript}"""
+        prompt = build_podcast_prompt(transcript, length, tone)
 
         response = generate_gemini_content(prompt)
         
-        # Clean up potential markdown code blocks
-        text = response.text.strip()
-        if text.startswith('```json'):
-            text = text[7:]
-        if text.startswith('```'):
-            text = text[3:]
-        if text.endswith('```'):
-            text = text[:-3]
-            
-        return jsonify({'success': True, 'script': json.loads(text)})
+        return jsonify({'success': True, 'script': parse_json_response(response.text)})
         
     except Exception as e:
         print(f"❌ Error in generate_podcast: {str(e)}")
@@ -1492,6 +3695,12 @@ if __name__ == '__main__':
     
     # Get port from environment variable (for deployment) or use 5000 for local
     port = int(os.environ.get('PORT', 10000))
+
+    # Gunicorn/uvicorn exit cleanly on SIGTERM; the dev server needs a handler
+    signal.signal(signal.SIGTERM, _save_state_and_exit)
+
+    # Re-verify the restored proxies now instead of waiting for the first get_proxy()
+    proxy_manager.start_maintainer()
     
     # Run the Flask app
     # Use 0.0.0.0 to allow external connections (required for deployment)
@@ -0,0 +1,376 @@
+"""
+Async (ASGI) serving mode for the YouTube Summarizer API.
+
+Serves the same /api/* routes as app.py without holding a thread per request:
+- Gemini calls use the async Gemini client.
+- Transcript and playlist requests await the bounded per-platform extraction pools
+  instead of blocking a request thread for up to EXTRACTION_TIMEOUT (or
+  PLAYLIST_TIMEOUT) seconds.
+- The free proxy pool is refreshed and validated with non-blocking httpx.
+
+The remaining routes (pages, /api/features, /api/diagnostics, /api/ready, /share)
+answer without waiting on extraction or Gemini, so they are served by the Flask
+app mounted underneath.
+
+Run with:
+    uvicorn asgi_app:app --host 0.0.0.0 --port 10000
+"""
+import asyncio
+import contextlib
+import json
+import time
+import traceback
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+
+from app import (
+    app as flask_app,
+    logger,
+    proxy_manager,
+    extract_video_id,
+    start_transcript_fetch,
+    list_collection_entries,
+    parse_playlist_request,
+    playlist_video_event,
+    ExtractionSaturated,
+    EXTRACTION_TIMEOUT,
+    PLAYLIST_TIMEOUT,
+    PLAYLIST_CONCURRENCY,
+    DEPLOYMENT_ID,
+    generate_gemini_content_async,
+    generate_summary_async,
+    build_chat_prompt,
+    build_mindmap_prompt,
+    clean_mindmap_syntax,
+    build_steps_prompt,
+    build_infographic_prompt,
+    extract_svg,
+    build_quiz_prompt,
+    build_podcast_prompt,
+    parse_json_response,
+)
+
+PROXY_REFRESH_INTERVAL = 25 * 60 # Refresh before the pool is 30 minutes old, so requests never refresh inline
+
+async def _json_body(request):
+    try:
+        return await request.json()
+    except Exception:
+        return {}
+
+async def extract_transcript(request):
+    """Extract transcript from YouTube video"""
+    try:
+        data = await _json_body(request)
+        youtube_url = data.get('url', '')
+
+        print(f"🔍 DEBUG: /api/extract-transcript called with URL: {youtube_url}")
+
+        if not youtube_url:
+            return JSONResponse({'error': 'YouTube URL is required'}, status_code=400)
+
+        video_id, platform = extract_video_id(youtube_url)
+        if not video_id:
+            return JSONResponse({'error': 'Invalid URL'}, status_code=400)
+
+        try:
+            try:
+                cached, future = start_transcript_fetch(platform, video_id)
+            except ExtractionSaturated as e:
+                print(f"🚦 {e}")
+                return JSONResponse(
+                    {'error': 'SERVER_BUSY', 'retry_after': e.retry_after},
+                    status_code=503,
+                    headers={'Retry-After': str(e.retry_after)}
+                )
+
+            if cached:
+                full_transcript, metadata = cached['transcript'], cached['metadata']
+            else:
+                # Shield the shared future: a timed-out request must not cancel it for other waiters
+                try:
+                    full_transcript, metadata = await asyncio.wait_for(
+                        asyncio.shield(asyncio.wrap_future(future)), EXTRACTION_TIMEOUT
+                    )
+                except asyncio.TimeoutError:
+                    raise Exception(f"Server Timeout ({EXTRACTION_TIMEOUT}s Limit) - Processing took too long")
+
+            return JSONResponse({
+                'success': True,
+                'video_id': video_id,
+                'title': metadata['title'],
+                'metadata': metadata,
+                'transcript': full_transcript,
+                'length': len(full_transcript),
+                'cached': bool(cached),
+                'deployment_id': DEPLOYMENT_ID
+            })
+
+        except Exception as e:
+            if "LIVE_VIDEO_NOT_SUPPORTED" in str(e):
+                return JSONResponse({'error': 'LIVE_VIDEO_NOT_SUPPORTED'}, status_code=400)
+            return JSONResponse({'error': f'Error fetching transcript: {str(e)} [Deployment ID: {DEPLOYMENT_ID}]'}, status_code=500)
+
+    except Exception as e:
+        logger.error(f"Critical Error in extract-transcript: {str(e)}")
+        traceback.print_exc()
+        return JSONResponse({'error': f'Critical Server Error: {str(e)} [Deployment ID: {DEPLOYMENT_ID}]'}, status_code=500)
+
+async def _fetch_transcripts_async(video_ids, platform='youtube', timeout=PLAYLIST_TIMEOUT, concurrency=PLAYLIST_CONCURRENCY):
+    """
+    Async counterpart of fetch_transcripts_parallel: the same per-request cap and
+    saturation handling, but the extraction futures are awaited on the event loop.
+
+    Yields:
+        tuple: (index, video_id, (transcript_text, metadata_dict) or Exception, cached)
+    """
+    deadline = time.time() + timeout
+    waiting = list(enumerate(video_ids))
+    running = {}
+    retry_after = 1
+    concurrency = max(1, concurrency)
+
+    while waiting or running:
+        saturated = False
+        while waiting and len(running) < concurrency:
+            index, video_id = waiting[0]
+            try:
+                cached, future = start_transcript_fetch(platform, video_id)
+            except ExtractionSaturated as e:
+                retry_after = e.retry_after
+                saturated = True
+                break
+            waiting.pop(0)
+            if cached:
+                yield index, video_id, (cached['transcript'], cached['metadata']), True
+            else:
+                # Shielded: a disconnect or timeout here must not cancel a fetch other requests share
+                running[asyncio.shield(asyncio.wrap_future(future))] = (index, video_id)
+
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        if not running:
+            # Saturated by other traffic; nothing of ours to wait on
+            await asyncio.sleep(min(retry_after, remaining))
+            continue
+        done, _ = await asyncio.wait(running, timeout=min(retry_after, remaining) if saturated else remaining,
+                                     return_when=asyncio.FIRST_COMPLETED)
+        for future in done:
+            index, video_id = running.pop(future)
+            try:
+                yield index, video_id, future.result(), False
+            except Exception as e:
+                yield index, video_id, e, False
+
+    for index, video_id in list(running.values()) + waiting:
+        yield index, video_id, Exception(f"Server Timeout ({timeout}s Limit) - Processing took too long"), False
+
+async def extract_playlist(request):
+    """
+    Extract transcripts for every video of a YouTube playlist or channel.
+
+    Streams the same newline-delimited JSON as the Flask route, awaiting each
+    video's extraction future instead of holding a thread for the whole playlist.
+    """
+    try:
+        collection_url, kind, limit = parse_playlist_request(await _json_body(request))
+    except ValueError as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+
+    print(f"📜 Listing {kind}: {collection_url} (limit {limit})")
+    try:
+        title, videos = await asyncio.to_thread(list_collection_entries, collection_url, limit)
+    except Exception as e:
+        return JSONResponse({'error': f'Error listing {kind}: {str(e)}'}, status_code=500)
+    if not videos:
+        return JSONResponse({'error': f'No videos found in this {kind}'}, status_code=404)
+
+    async def generate():
+        start = time.time()
+        yield json.dumps({'type': 'playlist', 'kind': kind, 'title': title, 'total': len(videos), 'entries': videos}) + '\n'
+        counts = {'ok': 0, 'failed': 0}
+        completed = 0
+        async for index, video_id, result, cached in _fetch_transcripts_async([v['video_id'] for v in videos]):
+            completed += 1
+            event = playlist_video_event(videos, completed, index, video_id, result, cached)
+            counts['failed' if event['status'] == 'error' else 'ok'] += 1
+            yield json.dumps(event) + '\n'
+        print(f"✅ {kind} done: {counts['ok']} ok, {counts['failed']} failed in {time.time() - start:.1f}s")
+        yield json.dumps(dict(counts, type='done', elapsed=round(time.time() - start, 2))) + '\n'
+
+    return StreamingResponse(generate(), media_type='application/x-ndjson')
+
+async def summarize(request):
+    """Summarize text using Gemini API with customizable length and tone"""
+    try:
+        data = await _json_body(request)
+        transcript = data.get('transcript', '')
+        length = data.get('length', 'short')
+        tone = data.get('tone', 'conversational')
+
+        print(f"📝 Generating SUMMARY with Tone: {tone}, Length: {length}")
+
+        if not transcript:
+            return JSONResponse({'error': 'Transcript is required'}, status_code=400)
+
+        summary_text, cached = await generate_summary_async(transcript, length, tone, regenerate=bool(data.get('regenerate')))
+        return JSONResponse({'success': True, 'summary': summary_text, 'cached': cached})
+
+    except Exception as e:
+        error_message = str(e)
+        if 'API_KEY_INVALID' in error_message or 'invalid API key' in error_message.lower():
+            return JSONResponse({'error': 'Invalid API key in .env file. Please check your GEMINI_API_KEY.'}, status_code=401)
+        return JSONResponse({'error': f'Error generating summary: {error_message}'}, status_code=500)
+
+async def chat(request):
+    """Chat with the video content using Gemini"""
+    data = await _json_body(request)
+    transcript_text = data.get('transcript')
+    question = data.get('question')
+
+    if not transcript_text or not question:
+        return JSONResponse({'error': 'Missing transcript or question'}, status_code=400)
+
+    try:
+        response = await generate_gemini_content_async(build_chat_prompt(transcript_text, question))
+        return JSONResponse({'success': True, 'answer': response.text})
+    except Exception as e:
+        logger.error(f"Chat error: {str(e)}")
+        return JSONResponse({'error': str(e)}, status_code=500)
+
+async def generate_mindmap(request):
+    """Generates a Mermaid.js mind map from the transcript"""
+    data = await _json_body(request)
+    transcript_text = data.get('transcript')
+
+    if not transcript_text:
+        return JSONResponse({'error': 'Missing transcript'}, status_code=400)
+
+    try:
+        response = await generate_gemini_content_async(build_mindmap_prompt(transcript_text))
+        return JSONResponse({'success': True, 'mindmap': clean_mindmap_syntax(response.text)})
+    except Exception as e:
+        logger.error(f"Mind map error: {str(e)}")
+        return JSONResponse({'error': str(e)}, status_code=500)
+
+async def extract_steps(request):
+    """Extract actionable steps from the transcript"""
+    try:
+        data = await _json_body(request)
+        transcript = data.get('transcript', '')
+
+        if not transcript:
+            return JSONResponse({'error': 'Transcript is required'}, status_code=400)
+
+        response = await generate_gemini_content_async(build_steps_prompt(transcript))
+        return JSONResponse({'success': True, 'steps': response.text})
+    except Exception as e:
+        print(f"❌ Error in steps route: {str(e)}")
+        return JSONResponse({'error': str(e)}, status_code=500)
+
+async def generate_infographic(request):
+    data = await _json_body(request)
+    summary_text = data.get('summary', '')
+    tone = data.get('tone', 'conversational')
+
+    if not summary_text:
+        return JSONResponse({'error': 'Summary text is required'}, status_code=400)
+
+    print(f"📊 Generating Infographic for tone: {tone}")
+
+    try:
+        response = await generate_gemini_content_async(build_infographic_prompt(summary_text, tone))
+        return JSONResponse({'success': True, 'infographic': extract_svg(response.text)})
+    except Exception as e:
+        print(f"❌ Error generating infographic: {e}")
+        return JSONResponse({'error': str(e)}, status_code=500)
+
+async def generate_quiz(request):
+    """Generate a 5-question quiz from the transcript"""
+    try:
+        data = await _json_body(request)
+        transcript = data.get('transcript', '')
+
+        if not transcript:
+            return JSONResponse({'error': 'Transcript is required'}, status_code=400)
+
+        response = await generate_gemini_content_async(build_quiz_prompt(transcript))
+        return JSONResponse({'success': True, 'quiz': parse_json_response(response.text)})
+    except Exception as e:
+        return JSONResponse({'error': str(e)}, status_code=500)
+
+async def generate_podcast(request):
+    """Generate a podcast dialogue script from the transcript"""
+    try:
+        data = await _json_body(request)
+        transcript = data.get('transcript', '')
+        length = data.get('length', 'medium')
+        tone = data.get('tone', 'conversational')
+
+        print(f"🎙️ Generating podcast with Tone: {tone}, Length: {length}")
+
+        if not transcript:
+            return JSONResponse({'error': 'Transcript is required'}, status_code=400)
+
+        response = await generate_gemini_content_async(build_podcast_prompt(transcript, length, tone))
+        return JSONResponse({'success': True, 'script': parse_json_response(response.text)})
+    except Exception as e:
+        print(f"❌ Error in generate_podcast: {str(e)}")
+        return JSONResponse({'error': str(e)}, status_code=500)
+
+async def _keep_proxies_fresh():
+    """Refresh the free proxy pool in the background so no request has to wait for it."""
+    while True:
+        try:
+            await proxy_manager.refresh_async()
+        except Exception as e:
+            print(f"⚠️ Async proxy refresh failed: {e}")
+        await asyncio.sleep(PROXY_REFRESH_INTERVAL)
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # Started before serving so the proxies restored by load_state() are re-verified
+    # right away. Sources are downloaded by the async refresher; the thread only
+    # re-checks and tops up.
+    proxy_manager.start_maintainer(refresh_sources=False)
+    refresher = asyncio.create_task(_keep_proxies_fresh())
+    print("🚀 YouTube Summarizer Server Starting (async mode)...")
+    try:
+        yield
+    finally:
+        refresher.cancel()
+        proxy_manager.stop_maintainer()
+        proxy_manager.save_state()
+
+routes = [
+    Route('/api/extract-transcript', extract_transcript, methods=['POST']),
+    Route('/api/extract-playlist', extract_playlist, methods=['POST']),
+    Route('/api/summarize', summarize, methods=['POST']),
+    Route('/api/chat', chat, methods=['POST']),
+    Route('/api/mindmap', generate_mindmap, methods=['POST']),
+    Route('/api/steps', extract_steps, methods=['POST']),
+    Route('/api/generate-infographic', generate_infographic, methods=['POST']),
+    Route('/api/quiz', generate_quiz, methods=['POST']),
+    Route('/api/podcast', generate_podcast, methods=['POST']),
+    # Everything else answers without waiting on extraction or Gemini; served by the Flask app as-is
+    Mount('/', app=WSGIMiddleware(flask_app)),
+]
+
+app = Starlette(
+    routes=routes,
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])], # Same as CORS(app)
+    lifespan=lifespan
+)
+
+if __name__ == '__main__':
+    import os
+    import uvicorn
+
+    port = int(os.environ.get('PORT', 10000))
+    uvicorn.run(app, host='0.0.0.0', port=port)
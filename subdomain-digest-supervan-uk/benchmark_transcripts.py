@@ -0,0 +1,215 @@
+"""
+Benchmark caption parsing and transcript formatting.
+
+Runs every parser on the sample track (test_download/ZJ_xq1_fqVQ.en.vtt) and on
+synthetic YouTube-style auto-caption files (roll-up cues with word timing tags)
+of 1, 3 and 10 hours, and reports throughput, peak memory and output size:
+
+- VTT: the original splitlines parser, _parse_vtt on a str, iter_vtt_segments
+  over the open file (file mode), and _parse_vtt over SUBTITLE_CHUNK_SIZE byte
+  chunks, the way _download_subtitle_track streams a track in memory mode.
+- Method 1: format_transcript_items over youtube-transcript-api items built from
+  the same cues.
+
+Save a run and compare later ones against it to catch regressions locally:
+
+    python benchmark_transcripts.py
+    python benchmark_transcripts.py --hours 1 3 --save bench.json
+    python benchmark_transcripts.py --compare bench.json --tolerance 0.25
+"""
+import sys
+import os
+import argparse
+import json
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import format_transcript_items, iter_vtt_segments, render_flat_transcript, _parse_vtt, SUBTITLE_CHUNK_SIZE
+
+SAMPLE_VTT = os.path.join('test_download', 'ZJ_xq1_fqVQ.en.vtt')
+
+WORDS = ("so today we are going to look at the new bike and I think it is really good "
+         "but you know what the price is a bit high for what you get honestly "
+         "let me show you the engine and the brakes right here").split()
+
+def legacy_parse_vtt(vtt_content):
+    """_parse_vtt before the streaming parser, kept as the baseline."""
+    lines = vtt_content.splitlines()
+    text_lines = []
+    seen_lines = set()
+    current_timestamp = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('WEBVTT') or line.startswith('Kind:') or line.startswith('Language:'):
+            continue
+        if '-->' in line:
+            try:
+                start_time = line.split('-->')[0].strip()
+                parts = start_time.split(':')
+                if len(parts) >= 2:
+                    minutes = parts[-2]
+                    seconds = parts[-1].split('.')[0]
+                    current_timestamp = f"[{minutes}:{seconds}]"
+            except:
+                pass
+            continue
+        if line.isdigit():
+            continue
+        clean_line = re.sub(r'<[^>]+>', '', line)
+        clean_line = clean_line.strip()
+        if not clean_line:
+            continue
+        if clean_line not in seen_lines:
+            if current_timestamp:
+                text_lines.append(f"{current_timestamp} {clean_line}")
+                current_timestamp = None
+            else:
+                text_lines.append(clean_line)
+            seen_lines.add(clean_line)
+    return " ".join(text_lines)
+
+def _vtt_time(seconds):
+    hours, rest = divmod(seconds, 3600)
+    minutes, rest = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{rest:06.3f}"
+
+def synthetic_vtt(hours, seed=0):
+    """A YouTube auto-caption track: every line is typed word by word, then rolls up once."""
+    rng = random.Random(seed)
+    out = ["WEBVTT\nKind: captions\nLanguage: en\n\n"]
+    previous = ''
+    t = 0.0
+    end_of_track = hours * 3600
+    while t < end_of_track:
+        if rng.random() < 0.03:
+            words = ['[Music]']
+        else:
+            words = [rng.choice(WORDS) for _ in range(rng.randint(4, 9))]
+        duration = 1.5 + rng.random() * 2
+        step = duration / len(words)
+        timed = words[0] + ''.join(
+            f"<{_vtt_time(t + step * i)}><c> {word}</c>" for i, word in enumerate(words[1:], 1)
+        )
+        out.append(f"{_vtt_time(t)} --> {_vtt_time(t + duration)} align:start position:0%\n{previous or ' '}\n{timed}\n\n")
+        t += duration
+        line = ' '.join(words)
+        out.append(f"{_vtt_time(t)} --> {_vtt_time(t + 0.01)} align:start position:0%\n{line}\n \n\n")
+        t += 0.01
+        previous = line
+    return ''.join(out)
+
+def items_from_vtt(vtt_content):
+    """youtube-transcript-api style items (one per caption line) for the Method 1 formatters."""
+    items = []
+    for start, end, text in iter_vtt_segments(vtt_content):
+        line = text.split('\n')[-1]
+        if not items or items[-1]['text'] != line:
+            items.append({'start': start, 'duration': end - start, 'text': line})
+    return items
+
+def measure(fn, repeat):
+    """Best-of-repeat wall time, then peak traced memory from one more run."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    del output
+    tracemalloc.start()
+    output = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(output)
+
+def run_case(name, vtt_path, repeat):
+    with open(vtt_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    items = items_from_vtt(content)
+    size_mb = os.path.getsize(vtt_path) / 1024 / 1024
+
+    def streamed():
+        with open(vtt_path, 'rb') as f:
+            return render_flat_transcript(iter_vtt_segments(f))
+
+    raw = content.encode('utf-8')
+
+    def response_chunks():
+        return (raw[i:i + SUBTITLE_CHUNK_SIZE] for i in range(0, len(raw), SUBTITLE_CHUNK_SIZE))
+
+    parsers = [
+        ('vtt: legacy splitlines', lambda: legacy_parse_vtt(content), size_mb, 'MB/s'),
+        ('vtt: _parse_vtt (str)', lambda: _parse_vtt(content), size_mb, 'MB/s'),
+        ('vtt: streamed from file', streamed, size_mb, 'MB/s'),
+        ('vtt: streamed chunks', lambda: _parse_vtt(response_chunks()), size_mb, 'MB/s'),
+        ('method 1: format items', lambda: format_transcript_items(items), len(items) / 1000, 'k items/s'),
+    ]
+
+    print(f"🧪 {name}: {size_mb:.1f} MB VTT, {len(items)} caption lines")
+    results = {}
+    for label, fn, work, unit in parsers:
+        elapsed, peak, output_chars = measure(fn, repeat)
+        throughput = work / elapsed
+        results[label] = {'seconds': elapsed, 'throughput': throughput, 'peak_bytes': peak, 'output_chars': output_chars}
+        print(f"   {label:<26} {throughput:9.1f} {unit:<10} {elapsed * 1000:9.1f} ms   "
+              f"peak {peak / 1024 / 1024:7.1f} MB   output {output_chars:>10,} chars")
+    return results
+
+def compare(results, baseline, tolerance):
+    """Print results that got slower or used more memory than the baseline; return how many."""
+    regressions = 0
+    for case, parsers in results.items():
+        for label, result in parsers.items():
+            before = baseline.get(case, {}).get(label)
+            if not before:
+                continue
+            if result['throughput'] < before['throughput'] * (1 - tolerance):
+                print(f"❌ {case} / {label}: throughput {result['throughput']:.1f} vs {before['throughput']:.1f}")
+                regressions += 1
+            if result['peak_bytes'] > before['peak_bytes'] * (1 + tolerance):
+                print(f"❌ {case} / {label}: peak memory {result['peak_bytes']:,} vs {before['peak_bytes']:,} bytes")
+                regressions += 1
+            if result['output_chars'] != before['output_chars']:
+                print(f"⚠️ {case} / {label}: output size {result['output_chars']:,} vs {before['output_chars']:,} chars")
+    if not regressions:
+        print(f"✅ No regressions beyond {tolerance:.0%} against the baseline")
+    return regressions
+
+def run(hours, repeat):
+    results = {}
+    if os.path.exists(SAMPLE_VTT):
+        results['sample'] = run_case('sample track', SAMPLE_VTT, repeat)
+    with tempfile.TemporaryDirectory() as tmp:
+        for h in hours:
+            path = os.path.join(tmp, f"synthetic_{h}h.vtt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(synthetic_vtt(h))
+            results[f"{h}h"] = run_case(f"synthetic {h}h auto-captions", path, repeat)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hours', type=int, nargs='+', default=[1, 3, 10], help='Synthetic track lengths')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per parser (best is reported)')
+    parser.add_argument('--save', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Fail if slower or heavier than the results in this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed slowdown/growth when comparing')
+    args = parser.parse_args()
+
+    results = run(args.hours, args.repeat)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Saved results to {args.save}")
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        sys.exit(1 if compare(results, baseline, args.tolerance) else 0)
@@ -0,0 +1,169 @@
+"""
+Benchmark per-attempt CPU and latency of a fresh yt-dlp instance vs the warm engine.
+
+Each operation is timed twice, once on a fresh YoutubeDL built with the same options
+and once on an instance checked out of the warm engine, so every comparison times
+the same work:
+
+- format processing: what every attempt did before the engine (Method 1.5 options,
+  full format/subtitle processing)
+- subtitle-only: the engine's 'subtitles' profile (unprocessed info, pick the track)
+
+Offline (default): each attempt processes a synthetic YouTube-like info dict
+(120 formats, 150 auto-caption languages), so only instance construction and
+processing are measured.
+
+Live: pass --url to run real extractions against the network.
+
+    python benchmark_ytdlp_engine.py
+    python benchmark_ytdlp_engine.py --url https://www.youtube.com/watch?v=ZJ_xq1_fqVQ --attempts 3
+"""
+import sys
+import os
+import argparse
+import copy
+import statistics
+import tempfile
+import time
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+import yt_dlp
+from app import YtDlpEngine, _select_subtitle_track
+
+# The options every attempt used before the engine existed (Method 1.5)
+LEGACY_OPTS = {
+    'skip_download': True,
+    'writesubtitles': True,
+    'writeautomaticsub': True,
+    'subtitleslangs': ['en'],
+    'subtitlesformat': 'vtt',
+    'quiet': True,
+    'no_warnings': True,
+    'socket_timeout': 10,
+    'retries': 2,
+    'format': 'worst',
+    'ignore_no_formats_error': True,
+    'allow_unplayable_formats': True,
+}
+
+def synthetic_info():
+    formats = []
+    for i in range(120):
+        height = [144, 240, 360, 480, 720, 1080][i % 6]
+        formats.append({
+            'format_id': str(100 + i),
+            'url': f"https://rr1.googlevideo.com/videoplayback?itag={100 + i}",
+            'ext': 'mp4' if i % 2 else 'webm',
+            'height': height,
+            'width': height * 16 // 9,
+            'vcodec': 'none' if i % 5 == 0 else 'avc1.4d401e',
+            'acodec': 'mp4a.40.2' if i % 3 == 0 else 'none',
+            'tbr': 100 + i * 10,
+            'protocol': 'https',
+        })
+    caption_formats = ['json3', 'srv1', 'srv2', 'srv3', 'ttml', 'vtt', 'srt']
+    automatic_captions = {
+        f"l{i:03d}": [{'ext': ext, 'url': f"https://www.youtube.com/api/timedtext?lang=l{i:03d}&fmt={ext}"} for ext in caption_formats]
+        for i in range(149)
+    }
+    automatic_captions['en'] = [{'ext': ext, 'url': f"https://www.youtube.com/api/timedtext?lang=en&fmt={ext}"} for ext in caption_formats]
+    return {
+        'id': 'ZJ_xq1_fqVQ',
+        'title': 'Synthetic benchmark video',
+        'webpage_url': 'https://www.youtube.com/watch?v=ZJ_xq1_fqVQ',
+        'extractor': 'youtube',
+        'extractor_key': 'Youtube',
+        'duration': 3600,
+        'formats': formats,
+        'subtitles': {},
+        'automatic_captions': automatic_captions,
+    }
+
+def measure(label, attempt, attempts):
+    walls, cpus = [], []
+    for _ in range(attempts):
+        wall, cpu = time.perf_counter(), time.process_time()
+        attempt()
+        walls.append((time.perf_counter() - wall) * 1000)
+        cpus.append((time.process_time() - cpu) * 1000)
+    print(f"   {label:<30} latency p50 {statistics.median(walls):8.1f} ms   max {max(walls):8.1f} ms   "
+          f"CPU p50 {statistics.median(cpus):8.1f} ms")
+    return statistics.median(walls), statistics.median(cpus)
+
+def fresh_params(profile, options, cache_dir):
+    """The params YtDlpEngine would build for (profile, options), for a fresh instance."""
+    params = copy.deepcopy(YtDlpEngine.PROFILES[profile])
+    params.update(options)
+    params['cachedir'] = cache_dir
+    return params
+
+def compare(operations, attempts, cache_dir):
+    """
+    Time each operation on a fresh instance and on a warm engine instance.
+
+    Args:
+        operations (list): (label, options, fn) where fn(ydl) does one attempt's work.
+    """
+    engine = YtDlpEngine(cache_dir=cache_dir)
+    results = {}
+    for label, options, fn in operations:
+        def fresh():
+            with yt_dlp.YoutubeDL(fresh_params('subtitles', options, cache_dir)) as ydl:
+                fn(ydl)
+
+        def warm():
+            with engine.acquire('subtitles', **options) as ydl:
+                fn(ydl)
+
+        warm() # First checkout builds the instance; later ones reuse it
+        results[label] = (measure(f"{label}: fresh", fresh, attempts), measure(f"{label}: warm", warm, attempts))
+        (fresh_wall, fresh_cpu), (warm_wall, warm_cpu) = results[label]
+        print(f"   ↳ reuse saves {fresh_wall - warm_wall:.1f} ms latency, {fresh_cpu - warm_cpu:.1f} ms CPU")
+
+    (old_wall, old_cpu), _ = results['format processing']
+    _, (new_wall, new_cpu) = results['subtitle-only']
+    print(f"📉 Per attempt, fresh + format processing -> warm + subtitle-only: "
+          f"{old_wall - new_wall:.1f} ms latency, {old_cpu - new_cpu:.1f} ms CPU")
+
+def run_offline(attempts):
+    info = synthetic_info()
+
+    def process_formats(ydl):
+        ydl.process_ie_result(copy.deepcopy(info), download=False)
+
+    def subtitle_only(ydl):
+        # Subtitle-only profile: no format processing, just pick the track
+        _select_subtitle_track(copy.deepcopy(info))
+
+    print(f"🧪 Offline benchmark ({attempts} attempts each, synthetic info dict)")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        compare([
+            ('format processing', LEGACY_OPTS, process_formats),
+            ('subtitle-only', {}, subtitle_only),
+        ], attempts, cache_dir)
+
+def run_live(url, attempts):
+    def process_formats(ydl):
+        ydl.extract_info(url, download=False)
+
+    def subtitle_only(ydl):
+        _select_subtitle_track(ydl.extract_info(url, download=False, process=False))
+
+    print(f"🌐 Live benchmark against {url} ({attempts} attempts each)")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        compare([
+            ('format processing', LEGACY_OPTS, process_formats),
+            ('subtitle-only', {}, subtitle_only),
+        ], attempts, cache_dir)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='Run live extractions against this video URL')
+    parser.add_argument('--attempts', type=int, default=20)
+    args = parser.parse_args()
+    if args.url:
+        run_live(args.url, args.attempts)
+    else:
+        run_offline(args.attempts)
@@ -0,0 +1,172 @@
+"""
+Bulk digest runner: extract and summarize a list of video URLs without going through HTTP.
+
+Reads one URL per line (blank lines and # comments are ignored), runs extraction and
+summarization with bounded concurrency, and appends one JSON result per line to the
+output file. The output doubles as the checkpoint: re-running the same command skips
+URLs that already have a result, so a crashed run resumes where it stopped.
+
+Usage:
+    python bulk_summarize.py urls.txt -o digests.jsonl --concurrency 4 --length medium --tone professional
+    python bulk_summarize.py urls.txt -o digests.jsonl --retry-failed
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from app import (
+    extract_video_id,
+    fetch_transcript,
+    generate_summary,
+    ExtractionSaturated,
+)
+
+SATURATED_RETRIES = 5 # Times a URL waits for room in the extraction pool before giving up
+
+def read_urls(path):
+    """Read unique URLs from the input file, in order."""
+    urls = []
+    seen = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            url = line.strip()
+            if not url or url.startswith('#') or url in seen:
+                continue
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+def load_checkpoint(path, retry_failed=False):
+    """
+    Return the URLs that already have a result in the output file.
+
+    A line cut short by a crash is ignored, so that URL runs again.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('status') == 'ok' or not retry_failed:
+                done.add(record['url'])
+    return done
+
+class ResultWriter:
+    """Appends results to the JSONL output, flushing each line to disk as it completes."""
+    def __init__(self, path):
+        # A crash mid-write can leave a partial last line; start on a fresh line
+        needs_newline = False
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b'\n'
+        self.file = open(path, 'a', encoding='utf-8')
+        if needs_newline:
+            self.file.write('\n')
+        self.lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+def summarize_url(url, length='short', tone='conversational'):
+    """Extract and summarize one URL, returning its result record."""
+    start = time.time()
+    video_id, platform = extract_video_id(url)
+    if not video_id:
+        return {'url': url, 'status': 'error', 'error': 'Invalid URL'}
+
+    try:
+        for attempt in range(SATURATED_RETRIES + 1):
+            try:
+                transcript, metadata, cached = fetch_transcript(platform, video_id)
+                break
+            except ExtractionSaturated as e:
+                if attempt == SATURATED_RETRIES:
+                    raise
+                time.sleep(e.retry_after)
+
+        summary, summary_cached = generate_summary(transcript, length, tone)
+        return {
+            'url': url,
+            'status': 'ok',
+            'platform': platform,
+            'video_id': video_id,
+            'title': metadata.get('title'),
+            'metadata': metadata,
+            'summary': summary,
+            'transcript_length': len(transcript),
+            'cached': bool(cached),
+            'summary_cached': summary_cached,
+            'elapsed': round(time.time() - start, 2)
+        }
+    except Exception as e:
+        return {
+            'url': url,
+            'status': 'error',
+            'platform': platform,
+            'video_id': video_id,
+            'error': str(e),
+            'elapsed': round(time.time() - start, 2)
+        }
+
+def run(input_path, output_path, concurrency=4, length='short', tone='conversational', retry_failed=False):
+    """
+    Process every URL in input_path that has no result in output_path yet.
+
+    Returns:
+        dict: Counts of 'ok', 'error' and 'skipped' URLs.
+    """
+    urls = read_urls(input_path)
+    done = load_checkpoint(output_path, retry_failed=retry_failed)
+    pending = [url for url in urls if url not in done]
+    counts = {'ok': 0, 'error': 0, 'skipped': len(urls) - len(pending)}
+
+    print(f"📋 {len(urls)} URLs, {counts['skipped']} already done, {len(pending)} to process (concurrency {concurrency})")
+    if not pending:
+        return counts
+
+    writer = ResultWriter(output_path)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {executor.submit(summarize_url, url, length, tone): url for url in pending}
+            for i, future in enumerate(as_completed(futures), 1):
+                record = future.result()
+                writer.write(record)
+                counts[record['status']] += 1
+                icon = '✅' if record['status'] == 'ok' else '❌'
+                detail = record.get('title') or record.get('error')
+                print(f"{icon} [{i}/{len(pending)}] {record['url']} - {detail}")
+    finally:
+        writer.close()
+
+    print(f"🎉 Done: {counts['ok']} summarized, {counts['error']} failed, {counts['skipped']} skipped")
+    return counts
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help='File with one video URL per line')
+    parser.add_argument('-o', '--output', default='digests.jsonl', help='JSONL output, also used to resume')
+    parser.add_argument('--concurrency', type=int, default=4, help='URLs processed at once')
+    parser.add_argument('--length', default='short', choices=['short', 'medium', 'long'])
+    parser.add_argument('--tone', default='conversational',
+                        choices=['conversational', 'professional', 'technical', 'witty', 'sarcastic'])
+    parser.add_argument('--retry-failed', action='store_true', help='Run URLs whose previous result was an error again')
+    args = parser.parse_args()
+
+    counts = run(args.input, args.output, args.concurrency, args.length, args.tone, args.retry_failed)
+    sys.exit(1 if counts['error'] else 0)
@@ -0,0 +1,20 @@
+"""
+Pytest setup shared by the test_*.py files.
+
+app.py opens its transcript cache, proxy snapshot and yt-dlp cache under DATA_DIR when
+it is imported, so point DATA_DIR at a throwaway directory first: test runs never read
+a developer's real caches or leave files behind.
+"""
+import os
+import shutil
+import tempfile
+
+_data_dir = tempfile.mkdtemp(prefix='summarizer-tests-')
+# Set explicitly: load_dotenv() never overrides variables that already exist
+os.environ['DATA_DIR'] = _data_dir
+os.environ['TRANSCRIPT_CACHE_PATH'] = os.path.join(_data_dir, 'transcript_cache.db')
+os.environ['PROXY_STATE_PATH'] = os.path.join(_data_dir, 'proxy_state.json')
+os.environ['YTDLP_CACHE_DIR'] = os.path.join(_data_dir, 'ytdlp_cache')
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_data_dir, ignore_errors=True)
@@ -0,0 +1,334 @@
+"""
+Offline proxy farm simulator for benchmarking proxy rotation policies.
+
+Simulates a population of free HTTP/SOCKS proxies, most of them dead like the real
+lists. Each live proxy has its own latency distribution and failure rate, and some
+of them are rate limited by YouTube. A stand-in YouTube endpoint answers the
+validation check and the transcript requests. The population churns while the
+benchmark runs: proxies die, new ones are published in the source lists.
+
+Each policy serves the same stream of transcript requests (up to --attempts proxies
+per transcript, like Method 1). It is fed through the real code paths:
+FreeProxyManager._merge_sources, maintain_once, get_proxy, report_success (with
+the simulated request time, like the real call sites) and mark_failed. Everything runs in-process on simulated time, so nothing touches the
+network and a run takes seconds.
+
+Policies:
+    scored   FreeProxyManager as shipped (weighted by success rate over latency)
+    uniform  the same pool and feedback, but uniform random selection
+    sticky   the pre-pool behaviour: reuse the last working proxy, otherwise a
+             random verified one; drop a proxy on its first failure
+
+    python proxy_farm_simulator.py
+    python proxy_farm_simulator.py --transcripts 5000 --alive 0.05 --churn 0.2
+    python proxy_farm_simulator.py --policies scored sticky --save farm.json
+"""
+import sys
+import os
+import argparse
+import contextlib
+import io
+import json
+import math
+import random
+import statistics
+import threading
+import time
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import FreeProxyManager, ProxyPool, PROXY_TARGET_POOL, PROXY_LOW_WATER, PROXY_VALIDATION_MAX_CHECKS
+
+SOURCES = {
+    'http': 'sim://farm/http.txt',
+    'socks4': 'sim://farm/socks4.txt',
+    'socks5': 'sim://farm/socks5.txt',
+}
+
+class SimProxy:
+    __slots__ = ('url', 'alive', 'latency', 'failure_rate', 'blocked')
+
+    def __init__(self, url, alive, latency, failure_rate, blocked):
+        self.url = url
+        self.alive = alive
+        self.latency = latency # Median seconds per request through this proxy
+        self.failure_rate = failure_rate # Chance a request through it fails anyway
+        self.blocked = blocked # Passes the check, but YouTube answers 429 to transcript requests
+
+class ProxyFarm:
+    """
+    A population of simulated proxies plus a stand-in YouTube endpoint.
+
+    The world (who is alive, churn, new proxies) and request outcomes draw from
+    separate random generators, so every policy sees the same population evolve.
+    """
+    SERVICE_TIME = 0.3 # Seconds YouTube itself takes to answer
+    JITTER = 0.3 # Log-normal sigma of per-request latency around a proxy's median
+
+    def __init__(self, size=3000, alive=0.15, blocked=0.3, latency=1.5, latency_spread=0.8,
+                 failure=0.1, protocols=(0.5, 0.2, 0.3), timeout=10, check_timeout=3, seed=1):
+        self.size = size
+        self.alive_share = alive
+        self.blocked_share = blocked
+        self.median_latency = latency
+        self.latency_spread = latency_spread
+        self.failure = failure
+        self.protocols = protocols # Shares of http, socks4, socks5
+        self.timeout = timeout
+        self.check_timeout = check_timeout
+        self.world = random.Random(seed)
+        self.rng = random.Random(seed + 1)
+        self.lock = threading.Lock() # Validation checks run on worker threads
+        self.proxies = {} # What the source lists currently carry
+        self.known = {} # Every proxy ever listed: pools keep entries the lists dropped
+        self.next_address = 0
+        self.died = 0
+        for _ in range(size):
+            self._spawn()
+
+    def _spawn(self):
+        self.next_address += 1
+        n = self.next_address
+        address = f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}:{self.world.choice((80, 1080, 3128, 8080))}"
+        protocol = self.world.choices(('http', 'socks4', 'socks5'), weights=self.protocols)[0]
+        url = f"{protocol}://{address}"
+        # Failure rates have a mean of `failure` with a long tail of flaky proxies
+        failure_rate = self.world.betavariate(1.0, 1.0 / self.failure - 1.0) if self.failure > 0 else 0.0
+        self.proxies[url] = self.known[url] = SimProxy(
+            url,
+            alive=self.world.random() < self.alive_share,
+            latency=self.world.lognormvariate(math.log(self.median_latency), self.latency_spread),
+            failure_rate=failure_rate,
+            blocked=self.world.random() < self.blocked_share,
+        )
+
+    def churn(self, fraction):
+        """Kill `fraction` of the live proxies; lists drop as many old entries and publish new ones."""
+        for proxy in list(self.proxies.values()):
+            if proxy.alive and self.world.random() < fraction:
+                proxy.alive = False
+                self.died += 1
+        for url in self.world.sample(list(self.proxies), int(len(self.proxies) * fraction)):
+            del self.proxies[url]
+        while len(self.proxies) < self.size:
+            self._spawn()
+
+    def source_responses(self):
+        """The current lists as (url, status_code, text, headers), like _refresh_proxies downloads them."""
+        lists = {protocol: [] for protocol in SOURCES}
+        for url in self.proxies:
+            protocol, address = url.split('://', 1)
+            lists[protocol].append(address)
+        return [(SOURCES[protocol], 200, '\n'.join(addresses), {}) for protocol, addresses in lists.items()]
+
+    def _request_latency(self, proxy):
+        with self.lock:
+            return proxy.latency * self.rng.lognormvariate(0, self.JITTER) + self.SERVICE_TIME
+
+    def _fails(self, proxy):
+        with self.lock:
+            return self.rng.random() < proxy.failure_rate
+
+    def check(self, proxy_url):
+        """The validation request (CHECK_URL): (works, seconds)."""
+        proxy = self.known.get(proxy_url)
+        if proxy is None or not proxy.alive:
+            return False, self.check_timeout
+        latency = self._request_latency(proxy)
+        if latency > self.check_timeout or self._fails(proxy):
+            return False, min(latency, self.check_timeout)
+        return True, latency
+
+    def fetch_transcript(self, proxy_url):
+        """A transcript request through a proxy: (ok, seconds)."""
+        proxy = self.known.get(proxy_url)
+        if proxy is None or not proxy.alive:
+            return False, self.timeout
+        latency = self._request_latency(proxy)
+        if latency > self.timeout:
+            return False, self.timeout
+        if proxy.blocked or self._fails(proxy):
+            return False, latency
+        return True, latency
+
+class SimulatedProxyManager(FreeProxyManager):
+    """FreeProxyManager whose checks go to the farm and whose maintenance is driven by the benchmark."""
+
+    def __init__(self, farm, pool=None):
+        super().__init__(low_water=PROXY_LOW_WATER, recheck_age=float('inf'))
+        self.farm = farm
+        self.refresh_sources = False # The benchmark feeds source lists through _merge_sources
+        if pool is not None:
+            self.pool = pool
+
+    def start_maintainer(self, refresh_sources=True):
+        pass # maintain_once is called between ticks instead
+
+    def _check_proxy(self, proxy_url):
+        return self.farm.check(proxy_url)[0]
+
+    def _timed_check(self, proxy_url):
+        return self.farm.check(proxy_url)
+
+    def update_sources(self):
+        self._merge_sources(self.farm.source_responses())
+
+    def maintain(self):
+        self.maintain_once()
+
+class UniformProxyPool(ProxyPool):
+    """ProxyPool that ignores scores when picking."""
+
+    def pick(self, protocol_filter=None):
+        snapshot = self.snapshot
+        index = 'http' if protocol_filter == 'http' else 'any'
+        verified = snapshot.verified[index] or snapshot.candidates[index]
+        return random.choice(verified) if verified else None
+
+class StickyRotation:
+    """The rotation FreeProxyManager used before the scored pool, for comparison."""
+
+    def __init__(self, farm):
+        self.farm = farm
+        self.proxies = []
+        self.verified_proxies = []
+        self.working_proxy = None
+
+    def get_proxy(self, protocol_filter=None):
+        if self.working_proxy:
+            return self.working_proxy
+        candidates = self.verified_proxies or self.proxies
+        if candidates:
+            proxy = random.choice(candidates)
+            return {'http': proxy, 'https': proxy}
+        return None
+
+    def report_success(self, proxy_url, latency=None):
+        if proxy_url not in self.verified_proxies:
+            self.verified_proxies.append(proxy_url)
+        self.working_proxy = {'http': proxy_url, 'https': proxy_url}
+
+    def mark_failed(self, proxy_dict):
+        proxy_url = proxy_dict.get('http')
+        if proxy_url in self.verified_proxies:
+            self.verified_proxies.remove(proxy_url)
+        if proxy_url in self.proxies:
+            self.proxies.remove(proxy_url)
+        if self.working_proxy == proxy_dict:
+            self.working_proxy = None
+
+    def update_sources(self):
+        self.proxies = list(self.farm.proxies)
+
+    def maintain(self):
+        if len(self.verified_proxies) >= PROXY_LOW_WATER:
+            return
+        for proxy_url in random.sample(self.proxies, min(len(self.proxies), PROXY_VALIDATION_MAX_CHECKS)):
+            if len(self.verified_proxies) >= PROXY_TARGET_POOL:
+                break
+            if proxy_url not in self.verified_proxies and self.farm.check(proxy_url)[0]:
+                self.verified_proxies.append(proxy_url)
+
+POLICIES = {
+    'scored': lambda farm: SimulatedProxyManager(farm),
+    'uniform': lambda farm: SimulatedProxyManager(farm, pool=UniformProxyPool()),
+    'sticky': lambda farm: StickyRotation(farm),
+}
+
+def percentile(values, p):
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[p - 1]
+
+def run_policy(name, farm_options, transcripts=2000, attempts=3, tick=50, churn=0.05, seed=1):
+    """
+    Serve `transcripts` requests with one policy. Every `tick` transcripts the farm
+    churns, the lists are fed to the policy and it runs a maintenance pass.
+    """
+    random.seed(seed)
+    farm = ProxyFarm(seed=seed, **farm_options)
+    policy = POLICIES[name](farm)
+    successes = tries = exhausted = 0
+    latencies = []
+    log = io.StringIO()
+    started = time.time()
+    with contextlib.redirect_stdout(log): # The manager's progress output
+        policy.update_sources()
+        policy.maintain()
+        for n in range(transcripts):
+            if n and n % tick == 0:
+                farm.churn(churn)
+                policy.update_sources()
+                policy.maintain()
+            elapsed = 0.0
+            for _ in range(attempts):
+                proxy = policy.get_proxy()
+                if not proxy:
+                    exhausted += 1
+                    break
+                tries += 1
+                ok, seconds = farm.fetch_transcript(proxy['http'])
+                elapsed += seconds
+                if ok:
+                    policy.report_success(proxy['http'], seconds)
+                    successes += 1
+                    latencies.append(elapsed)
+                    break
+                policy.mark_failed(proxy)
+    return {
+        'transcripts': transcripts,
+        'success_rate': successes / transcripts if transcripts else 0.0,
+        'attempts_per_success': tries / successes if successes else None,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'no_proxy': exhausted,
+        'wall_seconds': time.time() - started,
+    }
+
+def report(results):
+    def seconds(value):
+        return f"{value:6.2f}s" if value is not None else "     -"
+
+    print(f"{'policy':<10} {'success':>8} {'tries/ok':>9} {'p50':>7} {'p95':>7} {'p99':>7} {'no proxy':>9}")
+    for name, result in results.items():
+        per_success = f"{result['attempts_per_success']:.2f}" if result['attempts_per_success'] else '-'
+        print(f"{name:<10} {result['success_rate']:>8.1%} {per_success:>9} {seconds(result['p50'])} "
+              f"{seconds(result['p95'])} {seconds(result['p99'])} {result['no_proxy']:>9}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--policies', nargs='+', choices=list(POLICIES), default=list(POLICIES), help='Policies to compare')
+    parser.add_argument('--transcripts', type=int, default=2000, help='Transcript requests per policy')
+    parser.add_argument('--attempts', type=int, default=3, help='Proxies tried per transcript')
+    parser.add_argument('--proxies', type=int, default=3000, help='Entries in the source lists')
+    parser.add_argument('--alive', type=float, default=0.15, help='Share of listed proxies that are alive')
+    parser.add_argument('--blocked', type=float, default=0.3, help='Share of live proxies YouTube rate limits')
+    parser.add_argument('--latency', type=float, default=1.5, help='Median proxy latency in seconds')
+    parser.add_argument('--latency-spread', type=float, default=0.8, help='Log-normal sigma of latency across proxies')
+    parser.add_argument('--failure', type=float, default=0.1, help='Mean per-request failure rate of live proxies')
+    parser.add_argument('--timeout', type=float, default=10, help='Seconds lost on a dead proxy')
+    parser.add_argument('--churn', type=float, default=0.05, help='Share of live proxies dying per tick')
+    parser.add_argument('--tick', type=int, default=50, help='Transcripts between churn/maintenance ticks')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    parser.add_argument('--save', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    farm_options = {
+        'size': args.proxies, 'alive': args.alive, 'blocked': args.blocked, 'latency': args.latency,
+        'latency_spread': args.latency_spread, 'failure': args.failure, 'timeout': args.timeout,
+    }
+    print(f"🧪 Simulating {args.proxies} listed proxies ({args.alive:.0%} alive, {args.blocked:.0%} of those blocked), "
+          f"{args.transcripts} transcripts per policy")
+    results = {}
+    for name in args.policies:
+        results[name] = run_policy(name, farm_options, args.transcripts, args.attempts, args.tick, args.churn, args.seed)
+        print(f"✅ {name}: {results[name]['wall_seconds']:.1f}s")
+    report(results)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'options': vars(args), 'results': results}, f, indent=2)
+        print(f"💾 Saved results to {args.save}")
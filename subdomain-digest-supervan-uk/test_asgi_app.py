@@ -0,0 +1,302 @@
+import sys
+import os
+import time
+import json
+import asyncio
+import tempfile
+import threading
+from concurrent.futures import Future
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+import httpx
+import app
+import asgi_app
+from app import build_summary_prompt, summary_cache_key, FreeProxyManager, ExtractionSaturated, TieredCache
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+def _client():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=asgi_app.app), base_url='http://test')
+
+def test_summarize_uses_async_gemini():
+    prompts = []
+
+    async def fake_gemini(prompt):
+        prompts.append(prompt)
+        return FakeResponse('short summary')
+
+    original_gemini, original_cache = app.generate_gemini_content_async, app.summary_cache
+    app.generate_gemini_content_async = fake_gemini
+    app.summary_cache = TieredCache('summaries', None, 3600)
+    try:
+        body = {'transcript': 'hello', 'length': 'medium', 'tone': 'witty'}
+        prompt = build_summary_prompt('hello', 'medium', 'witty')
+
+        async def run(*bodies):
+            async with _client() as client:
+                return [(await client.post('/api/summarize', json=b)).json() for b in bodies]
+        first, second = asyncio.run(run(body, body))
+        assert first == {'success': True, 'summary': 'short summary', 'cached': False}
+        assert second == first # Requests don't fill the cache
+        assert prompts == [prompt, prompt]
+
+        # A precomputed summary is served from the cache unless a regeneration is asked for
+        app.summary_cache.set(summary_cache_key(prompt), {'summary': 'precomputed'})
+        cached, regenerated = asyncio.run(run(body, dict(body, regenerate=True)))
+        assert cached == {'success': True, 'summary': 'precomputed', 'cached': True}
+        assert regenerated == {'success': True, 'summary': 'short summary', 'cached': False}
+        assert len(prompts) == 3
+        print("✅ /api/summarize served by the async Gemini client, precomputed summaries from the cache")
+    finally:
+        app.generate_gemini_content_async, app.summary_cache = original_gemini, original_cache
+
+def test_concurrent_requests_do_not_need_threads():
+    state = {'active': 0, 'peak': 0}
+    handler_threads = set()
+
+    async def slow_gemini(prompt):
+        handler_threads.add(threading.get_ident())
+        state['active'] += 1
+        state['peak'] = max(state['peak'], state['active'])
+        await state['gate'].wait()
+        state['active'] -= 1
+        return FakeResponse('answer')
+
+    original = asgi_app.generate_gemini_content_async
+    asgi_app.generate_gemini_content_async = slow_gemini
+    try:
+        async def run():
+            state['gate'] = asyncio.Event() # Created on the test's own event loop
+            async with _client() as client:
+                requests = [asyncio.ensure_future(client.post('/api/chat', json={'transcript': 't', 'question': f'q{i}'}))
+                            for i in range(200)]
+                deadline = time.time() + 10
+                while state['peak'] < 200 and time.time() < deadline and not any(r.done() for r in requests):
+                    await asyncio.sleep(0.01)
+                state['gate'].set()
+                return await asyncio.gather(*requests), threading.get_ident()
+        responses, loop_thread = asyncio.run(run())
+        assert all(r.status_code == 200 and r.json()['answer'] == 'answer' for r in responses)
+        print(f"✅ 200 concurrent chats in flight at once on {len(handler_threads)} thread")
+        # Every request was waiting on Gemini at the same time, all on the event loop's thread
+        assert state['peak'] == 200
+        assert handler_threads == {loop_thread}
+    finally:
+        asgi_app.generate_gemini_content_async = original
+
+def test_extract_transcript_awaits_pool_future():
+    future = Future()
+    original = asgi_app.start_transcript_fetch
+    asgi_app.start_transcript_fetch = lambda platform, video_id: (None, future)
+    try:
+        async def run():
+            async with _client() as client:
+                request = asyncio.ensure_future(
+                    client.post('/api/extract-transcript', json={'url': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'})
+                )
+                await asyncio.sleep(0.1)
+                future.set_result(('[00:01] hello', {'title': 'Video'}))
+                return await request
+        resp = asyncio.run(run())
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body['transcript'] == '[00:01] hello' and body['cached'] is False
+        print("✅ /api/extract-transcript awaited the extraction future")
+    finally:
+        asgi_app.start_transcript_fetch = original
+
+def test_extract_playlist_awaits_futures_natively():
+    videos = [{'video_id': f"vid{i}", 'title': f"Title {i}", 'duration': 60} for i in range(4)]
+    futures = {v['video_id']: Future() for v in videos[1:]}
+
+    def fake_start(platform, video_id):
+        if video_id == 'vid0':
+            return {'transcript': '[00:01] cached', 'metadata': {'title': 'Title 0'}}, None
+        return None, futures[video_id]
+
+    def finish():
+        # Completes out of order on another thread, like the extraction pool would
+        time.sleep(0.1)
+        futures['vid3'].set_result(('[00:01] three', {'title': 'Title 3'}))
+        futures['vid2'].set_exception(Exception("No transcript found"))
+        time.sleep(0.1)
+        futures['vid1'].set_result(('[00:01] one', {'title': 'Title 1'}))
+
+    original = asgi_app.start_transcript_fetch, asgi_app.list_collection_entries
+    asgi_app.start_transcript_fetch = fake_start
+    asgi_app.list_collection_entries = lambda url, limit: ('My list', videos[:limit])
+    try:
+        async def run():
+            threading.Thread(target=finish, daemon=True).start()
+            async with _client() as client:
+                return await client.post('/api/extract-playlist', json={'url': 'https://www.youtube.com/playlist?list=PL1'})
+        resp = asyncio.run(run())
+        assert resp.status_code == 200
+        assert resp.headers['content-type'].startswith('application/x-ndjson')
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert lines[0]['type'] == 'playlist' and lines[0]['total'] == 4
+        assert [(l['video_id'], l['status']) for l in lines[1:-1]] == \
+            [('vid0', 'ok'), ('vid3', 'ok'), ('vid2', 'error'), ('vid1', 'ok')]
+        assert lines[1]['cached'] is True and lines[2]['transcript'] == '[00:01] three'
+        assert lines[-1] == dict(lines[-1], type='done', ok=3, failed=1)
+
+        async def bad_request():
+            async with _client() as client:
+                return await client.post('/api/extract-playlist', json={'url': 'https://www.youtube.com/watch?v=abc'})
+        assert asyncio.run(bad_request()).status_code == 400
+        print("✅ /api/extract-playlist streamed by the async route, awaiting each future")
+    finally:
+        asgi_app.start_transcript_fetch, asgi_app.list_collection_entries = original
+
+def test_extract_transcript_saturated_returns_503():
+    def saturated(platform, video_id):
+        raise ExtractionSaturated(platform, 4)
+
+    original = asgi_app.start_transcript_fetch
+    asgi_app.start_transcript_fetch = saturated
+    try:
+        async def run():
+            async with _client() as client:
+                return await client.post('/api/extract-transcript', json={'url': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'})
+        resp = asyncio.run(run())
+        assert resp.status_code == 503
+        assert resp.headers['retry-after'] == '4'
+        print("✅ Saturated pool -> 503 in async mode")
+    finally:
+        asgi_app.start_transcript_fetch = original
+
+def test_other_routes_fall_through_to_flask():
+    async def run():
+        async with _client() as client:
+            return await client.get('/api/features')
+    resp = asyncio.run(run())
+    assert resp.status_code == 200
+    assert 'ads' in resp.json()
+    print("✅ /api/features served by the mounted Flask app")
+
+class ProxyListHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = b"1.1.1.1:80\n2.2.2.2:8080\n" if 'http' in self.path else b"3.3.3.3:1080\n"
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_async_proxy_refresh():
+    server = HTTPServer(('127.0.0.1', 0), ProxyListHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base = f"http://127.0.0.1:{server.server_port}"
+        manager = FreeProxyManager()
+        manager.SOURCES = [f"{base}/socks5.txt", f"{base}/http.txt"]
+        checked = []
+
+        async def fake_check(proxy_url):
+            checked.append(proxy_url)
+            await asyncio.sleep(0.2)
+            return proxy_url.endswith(':80')
+        manager._check_proxy_async = fake_check
+
+        start = time.time()
+        asyncio.run(manager.refresh_async())
+        elapsed = time.time() - start
+        assert sorted(manager.proxies) == ['http://1.1.1.1:80', 'http://2.2.2.2:8080', 'socks5://3.3.3.3:1080']
+        assert list(manager.verified_proxies) == ['http://1.1.1.1:80']
+        assert len(checked) == 3
+        print(f"✅ Async refresh validated {len(checked)} proxies concurrently in {elapsed:.2f}s")
+        assert elapsed < 0.6
+    finally:
+        server.shutdown()
+
+def test_async_refresh_keeps_pool_health():
+    server = HTTPServer(('127.0.0.1', 0), ProxyListHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base = f"http://127.0.0.1:{server.server_port}"
+        manager = FreeProxyManager()
+        manager.SOURCES = [f"{base}/socks5.txt", f"{base}/http.txt"]
+        checked = []
+
+        async def fake_check(proxy_url):
+            checked.append(proxy_url)
+            return proxy_url.endswith(':80')
+        manager._check_proxy_async = fake_check
+
+        asyncio.run(manager.refresh_async())
+        for _ in range(20):
+            manager.report_success('http://1.1.1.1:80')
+        checked.clear()
+
+        # Every list answers 304: scores survive and nothing is re-validated
+        asyncio.run(manager.refresh_async())
+        assert manager.pool.health['http://1.1.1.1:80'].uses == 20
+        assert checked == []
+
+        # A changed list only validates proxies that aren't verified yet
+        state = manager.source_state[f"{base}/http.txt"]
+        state.update(etag=None, proxies=['http://1.1.1.1:80'])
+        manager.pool.remove('http://2.2.2.2:8080')
+        asyncio.run(manager.refresh_async())
+        assert 'http://2.2.2.2:8080' in checked
+        assert 'http://1.1.1.1:80' not in checked # Already verified and scored
+        assert manager.pool.health['http://1.1.1.1:80'].uses == 20
+        print("✅ Async refresh merges into the scored pool instead of resetting it")
+    finally:
+        server.shutdown()
+
+def test_lifespan_rechecks_restored_proxies():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'proxy_state.json')
+        saved = FreeProxyManager(state_path=path)
+        saved.pool.add_verified('http://1.1.1.1:80', latency=0.3)
+        assert saved.save_state()
+
+        manager = FreeProxyManager(state_path=path, low_water=0)
+        assert manager.load_state()
+        checked = []
+        manager._check_proxy = lambda url: checked.append(url) or True
+
+        async def no_refresh():
+            pass
+        manager.refresh_async = no_refresh
+
+        async def boot():
+            async with asgi_app.lifespan(asgi_app.app):
+                # No request has asked for a proxy: the restored one is re-verified anyway
+                for _ in range(50):
+                    if checked:
+                        break
+                    await asyncio.sleep(0.1)
+
+        original = asgi_app.proxy_manager
+        asgi_app.proxy_manager = manager
+        try:
+            asyncio.run(boot())
+        finally:
+            asgi_app.proxy_manager = original
+        assert checked == ['http://1.1.1.1:80']
+        print("✅ Lifespan starts the maintainer, which re-verifies the restored pool on boot")
+
+if __name__ == "__main__":
+    test_summarize_uses_async_gemini()
+    test_concurrent_requests_do_not_need_threads()
+    test_extract_transcript_awaits_pool_future()
+    test_extract_playlist_awaits_futures_natively()
+    test_extract_transcript_saturated_returns_503()
+    test_other_routes_fall_through_to_flask()
+    test_async_proxy_refresh()
+    test_async_refresh_keeps_pool_health()
+    test_lifespan_rechecks_restored_proxies()
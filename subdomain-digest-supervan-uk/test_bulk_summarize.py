@@ -0,0 +1,109 @@
+import sys
+import os
+import json
+import time
+import tempfile
+import threading
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+import bulk_summarize
+
+URLS = [f"https://www.youtube.com/watch?v=vid{i:08d}" for i in range(12)]
+
+def _patch(fail_ids=(), delay=0.05):
+    state = {'active': 0, 'peak': 0, 'fetched': []}
+    lock = threading.Lock()
+
+    def fake_fetch(platform, video_id):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+            state['fetched'].append(video_id)
+        time.sleep(delay)
+        with lock:
+            state['active'] -= 1
+        if video_id in fail_ids:
+            raise Exception("No transcript found")
+        return f"[00:01] transcript of {video_id}", {'title': f"Title {video_id}"}, False
+
+    bulk_summarize.fetch_transcript = fake_fetch
+    bulk_summarize.generate_summary = lambda transcript, length, tone: ('summary', False)
+    return state
+
+def _write_inputs(tmp):
+    input_path = os.path.join(tmp, 'urls.txt')
+    with open(input_path, 'w') as f:
+        f.write("# batch\n\n" + "\n".join(URLS + URLS[:2]) + "\n")
+    return input_path, os.path.join(tmp, 'out.jsonl')
+
+def _records(path):
+    records = []
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+def test_bounded_concurrency_and_output():
+    state = _patch()
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path, output_path = _write_inputs(tmp)
+        counts = bulk_summarize.run(input_path, output_path, concurrency=3)
+        records = _records(output_path)
+        assert counts == {'ok': 12, 'error': 0, 'skipped': 0}
+        assert sorted(r['url'] for r in records) == sorted(URLS)
+        assert all(r['summary'] == 'summary' for r in records)
+        print(f"✅ 12 URLs summarized, peak concurrency {state['peak']}")
+        assert state['peak'] <= 3
+
+def test_resume_after_crash_skips_done_urls():
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path, output_path = _write_inputs(tmp)
+        # Simulate a crash: 5 results written, the last line cut short
+        with open(output_path, 'w') as f:
+            for url in URLS[:5]:
+                f.write(json.dumps({'url': url, 'status': 'ok', 'summary': 'old'}) + "\n")
+            f.write('{"url": "' + URLS[5] + '", "status": "o')
+
+        state = _patch()
+        counts = bulk_summarize.run(input_path, output_path, concurrency=4)
+        assert counts['skipped'] == 5
+        assert len(state['fetched']) == 7
+        records = _records(output_path)
+        assert len(records) == 12
+        assert [r for r in records if r['status'] == 'error'] == []
+
+        # A failed URL is kept as done unless --retry-failed is given
+        with open(output_path, 'a') as f:
+            f.write(json.dumps({'url': URLS[0], 'status': 'error', 'error': 'x'}) + "\n")
+        state = _patch()
+        assert bulk_summarize.run(input_path, output_path)['skipped'] == 12
+        print("✅ Resume skipped finished URLs and re-ran the one cut short")
+
+def test_retry_failed():
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path, output_path = _write_inputs(tmp)
+        _patch(fail_ids={'vid00000003'})
+        counts = bulk_summarize.run(input_path, output_path, concurrency=4)
+        assert counts['error'] == 1
+
+        state = _patch()
+        counts = bulk_summarize.run(input_path, output_path, retry_failed=True)
+        assert counts == {'ok': 1, 'error': 0, 'skipped': 11}
+        assert state['fetched'] == ['vid00000003']
+        print("✅ --retry-failed re-ran only the failed URL")
+
+def test_invalid_url_recorded_as_error():
+    record = bulk_summarize.summarize_url('https://example.com/not-a-video')
+    assert record['status'] == 'error' and record['error'] == 'Invalid URL'
+    print("✅ Invalid URL recorded as an error")
+
+if __name__ == "__main__":
+    test_bounded_concurrency_and_output()
+    test_resume_after_crash_skips_done_urls()
+    test_retry_failed()
+    test_invalid_url_recorded_as_error()
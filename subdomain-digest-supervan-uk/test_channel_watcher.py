@@ -0,0 +1,119 @@
+import sys
+import os
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+import app
+from app import ChannelFeedWatcher, TieredCache
+
+FEED_ENTRY = """
+  <entry>
+    <id>yt:video:{video_id}</id>
+    <yt:videoId>{video_id}</yt:videoId>
+    <yt:channelId>UCtest</yt:channelId>
+    <title>Upload {video_id}</title>
+    <published>{published}</published>
+  </entry>"""
+
+class FeedHandler(BaseHTTPRequestHandler):
+    videos = []
+    requests_seen = []
+
+    def do_GET(self):
+        FeedHandler.requests_seen.append(self.path)
+        entries = ''.join(FEED_ENTRY.format(video_id=v, published=p) for v, p in FeedHandler.videos)
+        body = f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">
+  <title>Test channel</title>{entries}
+</feed>""".encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/atom+xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+def test_new_uploads_are_precomputed_into_caches():
+    server = HTTPServer(('127.0.0.1', 0), FeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    FeedHandler.videos = [('watchvid001', '2026-01-02T00:00:00+00:00'), ('watchvid000', '2026-01-01T00:00:00+00:00')]
+    FeedHandler.requests_seen.clear()
+
+    fetched, prompts = [], []
+
+    def fake_youtube(video_id):
+        fetched.append(video_id)
+        if video_id == 'watchvidbad':
+            raise Exception("No transcript found")
+        return f"[00:01] transcript {video_id}", {'title': f"Upload {video_id}"}, 0
+
+    def fake_gemini(prompt):
+        prompts.append(prompt)
+        return FakeResponse('precomputed summary')
+
+    originals = (app._get_youtube_transcript_with_cookies, app.generate_gemini_content, app.transcript_cache, app.summary_cache)
+    app._get_youtube_transcript_with_cookies = fake_youtube
+    app.generate_gemini_content = fake_gemini
+    app.transcript_cache = TieredCache('transcripts', None, 3600)
+    app.summary_cache = TieredCache('summaries', None, 3600)
+    try:
+        watcher = ChannelFeedWatcher(['UCtest'], feed_base_url=f"http://127.0.0.1:{server.server_port}/feeds/videos.xml", max_attempts=2)
+        assert watcher.poll_once() == ['watchvid001', 'watchvid000']
+        assert FeedHandler.requests_seen[0] == '/feeds/videos.xml?channel_id=UCtest'
+
+        # Users asking for the upload now get cache hits for both steps
+        client = app.app.test_client()
+        resp = client.post('/api/extract-transcript', json={'url': 'https://www.youtube.com/watch?v=watchvid001'})
+        assert resp.get_json()['cached'] is True
+        transcript = resp.get_json()['transcript']
+        resp = client.post('/api/summarize', json={'transcript': transcript})
+        assert resp.get_json() == {'success': True, 'summary': 'precomputed summary', 'cached': True}
+        assert len(prompts) == 2
+        # Asking for a regeneration skips the cache
+        resp = client.post('/api/summarize', json={'transcript': transcript, 'regenerate': True})
+        assert resp.get_json()['cached'] is False
+        assert len(prompts) == 3
+
+        # Next poll only processes the new upload; a failing one is retried up to max_attempts
+        FeedHandler.videos.insert(0, ('watchvid002', '2026-01-03T00:00:00+00:00'))
+        FeedHandler.videos.insert(0, ('watchvidbad', '2026-01-04T00:00:00+00:00'))
+        assert watcher.poll_once() == ['watchvid002']
+        assert watcher.poll_once() == []
+        assert watcher.poll_once() == []
+        assert fetched == ['watchvid001', 'watchvid000', 'watchvidbad', 'watchvid002', 'watchvidbad']
+        stats = watcher.get_stats()
+        print(f"✅ Watcher precomputed new uploads: {stats}")
+        assert stats['precomputed'] == 3 and stats['failed'] == 2
+        assert watcher.attempts == {} # Given up on, not kept around
+    finally:
+        (app._get_youtube_transcript_with_cookies, app.generate_gemini_content,
+         app.transcript_cache, app.summary_cache) = originals
+        server.shutdown()
+
+def test_done_videos_are_capped():
+    watcher = ChannelFeedWatcher([], max_done=3)
+    for i in range(10):
+        watcher._mark_done(f"capped{i:05d}")
+    assert list(watcher.done) == ['capped00007', 'capped00008', 'capped00009']
+    assert watcher.get_stats()['done'] == 3
+    print("✅ Watcher only remembers the most recent finished videos")
+
+def test_unreachable_feed_is_counted_not_raised():
+    watcher = ChannelFeedWatcher(['http://127.0.0.1:1/feed.xml'])
+    assert watcher.poll_once() == []
+    assert watcher.get_stats()['feed_errors'] == 1
+    print("✅ Unreachable feed recorded as a feed error")
+
+if __name__ == "__main__":
+    test_new_uploads_are_precomputed_into_caches()
+    test_done_videos_are_capped()
+    test_unreachable_feed_is_counted_not_raised()
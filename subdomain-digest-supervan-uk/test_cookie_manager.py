@@ -0,0 +1,60 @@
+import sys
+import os
+import random
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import CookieJarManager
+
+def netscape(name, value):
+    return f"# Netscape HTTP Cookie File\n.youtube.com\tTRUE\t/\tTRUE\t2147483647\t{name}\t{value}\n"
+
+ENVIRON = {
+    'YOUTUBE_COOKIES': netscape('SID', 'account-a'),
+    'YOUTUBE_COOKIES_2': netscape('SID', 'account-b'),
+    'YOUTUBE_COOKIES_3': 'this is not a cookie file',
+    'VIMEO_COOKIES': netscape('vuid', 'v1'),
+}
+
+def test_sets_loaded_and_validated_once():
+    manager = CookieJarManager(ENVIRON)
+    stats = manager.get_stats()
+    print(f"🍪 Loaded: {stats}")
+    assert [c['name'] for c in stats['youtube']] == ['YOUTUBE_COOKIES', 'YOUTUBE_COOKIES_2']
+    assert len(stats['vimeo']) == 1
+    assert stats['tiktok'] == []
+    assert manager.acquire('tiktok') is None
+
+def test_rotation_prefers_healthy_sets():
+    random.seed(7)
+    manager = CookieJarManager(ENVIRON)
+    healthy, throttled = manager.sets['youtube']
+    for _ in range(20):
+        manager.report(throttled, False)
+        manager.report(healthy, True)
+
+    picks = [manager.acquire('youtube').name for _ in range(1000)]
+    assert picks.count('YOUTUBE_COOKIES') > 900
+    # Throttled sets still get occasional traffic so they can recover
+    assert picks.count('YOUTUBE_COOKIES_2') > 0
+
+    for _ in range(30):
+        manager.report(throttled, True)
+    assert throttled.success_rate > 0.9
+
+def test_copies_do_not_touch_shared_jar():
+    import requests
+    manager = CookieJarManager(ENVIRON)
+    cookie_set = manager.acquire('vimeo')
+    with requests.Session() as session:
+        cookie_set.copy_into(session.cookies)
+        session.cookies.set('CONSENT', 'YES+1', domain='.youtube.com')
+        assert len(session.cookies) == 2
+    assert len(cookie_set.jar) == 1
+
+if __name__ == "__main__":
+    test_sets_loaded_and_validated_once()
+    test_rotation_prefers_healthy_sets()
+    test_copies_do_not_touch_shared_jar()
+    print("✅ Cookie manager tests passed")
@@ -0,0 +1,101 @@
+import sys
+import os
+import threading
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+import app
+from app import BoundedExecutor, ExtractionSaturated, SingleFlight
+
+def test_rejects_beyond_workers_plus_queue():
+    pool = BoundedExecutor('test', max_workers=2, max_queue=1, retry_after=7)
+    gate = threading.Event()
+    futures = [pool.submit(gate.wait, 5) for _ in range(3)]
+    assert pool.is_saturated()
+    try:
+        pool.submit(gate.wait, 5)
+        assert False, "Expected ExtractionSaturated"
+    except ExtractionSaturated as e:
+        assert e.retry_after == 7
+    gate.set()
+    for f in futures:
+        f.result(timeout=5)
+    assert not pool.is_saturated()
+    stats = pool.get_stats()
+    print(f"✅ Saturated pool rejected the 4th call: {stats}")
+    assert stats['rejected'] == 1 and stats['submitted'] == 3
+
+def test_bulkheads_are_independent():
+    slow = BoundedExecutor('tiktok', max_workers=1, max_queue=0)
+    fast = BoundedExecutor('youtube', max_workers=1, max_queue=0)
+    gate = threading.Event()
+    slow.submit(gate.wait, 5)
+    assert fast.submit(lambda: 'ok').result(timeout=5) == 'ok'
+    gate.set()
+    print("✅ A stuck TikTok pool does not block YouTube")
+
+def test_single_flight_releases_key_when_rejected():
+    flights = SingleFlight()
+    pool = BoundedExecutor('test', max_workers=1, max_queue=0)
+    gate = threading.Event()
+    pool.submit(gate.wait, 5)
+    try:
+        flights.submit('k', lambda: 1, executor=pool)
+        assert False, "Expected ExtractionSaturated"
+    except ExtractionSaturated:
+        pass
+    assert flights.get_stats()['inflight'] == 0
+    gate.set()
+    print("✅ Rejected leader does not leave a stuck in-flight entry")
+
+def test_extract_endpoint_returns_503_and_ready_flips():
+    client = app.app.test_client()
+    original = app.extraction_pools['youtube']
+    gate = threading.Event()
+    pool = BoundedExecutor('youtube', max_workers=1, max_queue=0, retry_after=3)
+    app.extraction_pools['youtube'] = pool
+    try:
+        assert client.get('/api/ready').status_code == 200
+        pool.submit(gate.wait, 5)
+        resp = client.post('/api/extract-transcript', json={'url': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'})
+        assert resp.status_code == 503
+        assert resp.headers['Retry-After'] == '3'
+        # Vimeo and TikTok can still serve, so the instance stays in rotation
+        ready = client.get('/api/ready')
+        assert ready.status_code == 200
+        assert ready.get_json()['saturated'] == ['youtube']
+        assert ready.get_json()['platforms'] == {'youtube': False, 'vimeo': True, 'tiktok': True}
+        youtube_ready = client.get('/api/ready?platform=youtube')
+        assert youtube_ready.status_code == 503
+        assert youtube_ready.headers['Retry-After'] == str(app.EXTRACTION_RETRY_AFTER)
+        assert client.get('/api/ready?platform=vimeo').status_code == 200
+        print("✅ Saturated YouTube pool -> 503 with Retry-After, only YouTube readiness down")
+    finally:
+        gate.set()
+        app.extraction_pools['youtube'] = original
+
+def test_ready_down_when_every_pool_saturated():
+    client = app.app.test_client()
+    originals = dict(app.extraction_pools)
+    gate = threading.Event()
+    try:
+        for name in originals:
+            pool = BoundedExecutor(name, max_workers=1, max_queue=0)
+            pool.submit(gate.wait, 5)
+            app.extraction_pools[name] = pool
+        ready = client.get('/api/ready')
+        assert ready.status_code == 503
+        assert not any(ready.get_json()['platforms'].values())
+        assert client.get('/api/ready?platform=unknown').status_code == 400
+        print("✅ Readiness down only once every platform is saturated")
+    finally:
+        gate.set()
+        app.extraction_pools.update(originals)
+
+if __name__ == "__main__":
+    test_rejects_beyond_workers_plus_queue()
+    test_bulkheads_are_independent()
+    test_single_flight_releases_key_when_rejected()
+    test_extract_endpoint_returns_503_and_ready_flips()
+    test_ready_down_when_every_pool_saturated()
@@ -0,0 +1,130 @@
+import sys
+import os
+import time
+import threading
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+import app
+from app import _run_strategies_hedged, BoundedExecutor
+
+def slow_strategy(delay, result=None, error=None, events=None, name=None):
+    def run(cancel):
+        if events is not None:
+            events.append(('start', name))
+        if cancel.wait(delay):
+            if events is not None:
+                events.append(('cancelled', name))
+            raise Exception("cancelled")
+        if error:
+            raise Exception(error)
+        return result, None
+    return run
+
+def test_hedge_starts_backup_after_delay():
+    events = []
+    start = time.time()
+    name, text, info = _run_strategies_hedged([
+        ('slow', slow_strategy(5, 'slow text', events=events, name='slow')),
+        ('fast', slow_strategy(0.1, 'fast text', events=events, name='fast')),
+    ], deadline=time.time() + 10, hedge_delay=0.2, max_parallel=2)
+    elapsed = time.time() - start
+    print(f"🏁 Winner: {name} in {elapsed:.2f}s")
+    assert name == 'fast' and text == 'fast text'
+    assert elapsed < 1.0
+    time.sleep(0.1)
+    assert ('cancelled', 'slow') in events
+
+def test_failure_launches_next_immediately():
+    start = time.time()
+    name, text, _ = _run_strategies_hedged([
+        ('broken', slow_strategy(0.05, error='blocked')),
+        ('empty', slow_strategy(0.05, result='')),
+        ('ok', slow_strategy(0.05, 'ok text')),
+    ], deadline=time.time() + 10, hedge_delay=5, max_parallel=1)
+    assert name == 'ok'
+    assert time.time() - start < 1.0
+
+def test_sequential_never_overlaps():
+    events = []
+    running = []
+    lock = threading.Lock()
+
+    def tracked(label, fail):
+        def run(cancel):
+            with lock:
+                running.append(label)
+                events.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(label)
+            if fail:
+                raise Exception("nope")
+            return label, None
+        return run
+
+    name, _, _ = _run_strategies_hedged([
+        ('a', tracked('a', True)),
+        ('b', tracked('b', True)),
+        ('c', tracked('c', False)),
+    ], deadline=time.time() + 10, hedge_delay=0, max_parallel=1)
+    assert name == 'c'
+    assert max(events) == 1
+
+def test_all_failures_reported():
+    try:
+        _run_strategies_hedged([
+            ('Method 1', slow_strategy(0, error='no captions')),
+            ('Method 2', slow_strategy(0, error='proxy dead')),
+        ], deadline=time.time() + 5, hedge_delay=0, max_parallel=2)
+    except Exception as e:
+        assert 'Method 1 Error: no captions' in str(e)
+        assert 'Method 2 Error: proxy dead' in str(e)
+    else:
+        raise AssertionError("Expected failure")
+
+def test_losers_stay_bounded_by_shared_pool():
+    original = app.strategy_pool
+    app.strategy_pool = BoundedExecutor('strategy', max_workers=2, max_queue=0)
+    release = threading.Event()
+
+    def stubborn(cancel):
+        # Ignores the cancel event, like a strategy stuck in a network call
+        release.wait(5)
+        raise Exception("late")
+
+    try:
+        name, _, _ = _run_strategies_hedged([
+            ('stuck', stubborn),
+            ('fast', slow_strategy(0.05, 'fast text')),
+        ], deadline=time.time() + 5, hedge_delay=0, max_parallel=2)
+        assert name == 'fast'
+        time.sleep(0.05)
+        # The abandoned loser still holds its worker after the call returned
+        assert app.strategy_pool.get_stats()['running'] == 1
+
+        app.strategy_pool.submit(release.wait, 5)
+        assert app.strategy_pool.is_saturated()
+        callers = []
+
+        def on_caller(cancel):
+            callers.append(threading.current_thread())
+            return 'inline text', None
+
+        name, text, _ = _run_strategies_hedged([('inline', on_caller)], deadline=time.time() + 5,
+                                               hedge_delay=0, max_parallel=2)
+        assert text == 'inline text'
+        assert callers == [threading.current_thread()]
+        print("✅ Abandoned losers count against the shared pool; a full pool runs inline")
+    finally:
+        release.set()
+        app.strategy_pool = original
+
+if __name__ == "__main__":
+    test_hedge_starts_backup_after_delay()
+    test_failure_launches_next_immediately()
+    test_sequential_never_overlaps()
+    test_all_failures_reported()
+    test_losers_stay_bounded_by_shared_pool()
+    print("✅ Hedged strategy tests passed")
@@ -0,0 +1,68 @@
+import sys
+import os
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import HttpSessionRegistry
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+
+    def do_GET(self):
+        KeepAliveHandler.connections.add(self.client_address)
+        body = b'ok'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_requests_to_same_host_reuse_connection():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    KeepAliveHandler.connections.clear()
+    try:
+        registry = HttpSessionRegistry()
+        base = f"http://127.0.0.1:{server.server_port}"
+        for i in range(5):
+            resp = registry.get(f"{base}/item/{i}").get(f"{base}/item/{i}")
+            assert resp.text == 'ok'
+        stats = registry.get_stats()
+        print(f"✅ 5 requests over {len(KeepAliveHandler.connections)} connection(s), stats={stats}")
+        assert len(KeepAliveHandler.connections) == 1
+        assert stats['created'] == 1 and stats['reused'] == 4
+    finally:
+        server.shutdown()
+
+def test_sessions_keyed_by_proxy_and_bounded():
+    registry = HttpSessionRegistry(max_sessions=2)
+    direct = registry.get('https://www.youtube.com/watch?v=a')
+    assert registry.get('https://www.youtube.com/api') is direct
+    proxied = registry.get('https://www.youtube.com', proxy='http://1.2.3.4:8080')
+    assert proxied is not direct
+    assert proxied.proxies == {'http': 'http://1.2.3.4:8080', 'https': 'http://1.2.3.4:8080'}
+
+    registry.get('https://vimeo.com')
+    stats = registry.get_stats()
+    assert stats['open'] == 2 and stats['evicted'] == 1
+
+    registry.discard_proxy('http://1.2.3.4:8080')
+    assert registry.get_stats()['open'] == 1
+    print("✅ Sessions keyed by host/proxy, LRU-bounded and discarded per proxy")
+
+def test_default_timeout_applied():
+    registry = HttpSessionRegistry(connect_timeout=2, read_timeout=7)
+    adapter = registry.get('https://example.com').get_adapter('https://example.com')
+    assert adapter.timeout == (2, 7)
+    print("✅ Default (connect, read) timeout applied")
+
+if __name__ == "__main__":
+    test_requests_to_same_host_reuse_connection()
+    test_sessions_keyed_by_proxy_and_bounded()
+    test_default_timeout_applied()
@@ -0,0 +1,148 @@
+import sys
+import os
+import json
+import time
+import random
+import threading
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+import app
+from app import extract_collection_url, BoundedExecutor
+
+def test_collection_urls_recognized():
+    assert extract_collection_url('https://www.youtube.com/playlist?list=PLabc_123') == \
+        ('https://www.youtube.com/playlist?list=PLabc_123', 'playlist')
+    assert extract_collection_url('https://www.youtube.com/watch?v=abc&list=PLxyz') == \
+        ('https://www.youtube.com/playlist?list=PLxyz', 'playlist')
+    assert extract_collection_url('https://www.youtube.com/@SomeChannel/featured') == \
+        ('https://www.youtube.com/@SomeChannel/videos', 'channel')
+    assert extract_collection_url('https://www.youtube.com/channel/UC123abc') == \
+        ('https://www.youtube.com/channel/UC123abc/videos', 'channel')
+    assert extract_collection_url('https://www.youtube.com/watch?v=abc') == (None, None)
+    print("✅ Playlist and channel URLs recognized")
+
+def test_flat_listing_keeps_only_videos():
+    pulled = []
+
+    def lazy_entries():
+        yield {'_type': 'url', 'ie_key': 'YoutubeTab', 'id': 'UCnested'}
+        for i in range(100):
+            pulled.append(i)
+            yield {'_type': 'url', 'ie_key': 'Youtube', 'id': f'vid{i}', 'title': f'Video {i}'}
+
+    class FakeYDL:
+        def extract_info(self, url, download=False, process=True):
+            assert process is False
+            return {'title': 'My list', 'entries': lazy_entries()}
+
+        def close(self):
+            pass
+
+    engine = app.YtDlpEngine()
+    engine._build = lambda profile, options: FakeYDL()
+    original = app.ytdlp_engine
+    app.ytdlp_engine = engine
+    try:
+        title, videos = app.list_collection_entries('https://www.youtube.com/playlist?list=PL1', 6)
+        assert title == 'My list'
+        assert [v['video_id'] for v in videos] == ['vid0', 'vid1', 'vid2', 'vid3', 'vid4']
+        # Only the entries needed for the limit are pulled from the lazy listing
+        assert len(pulled) == 5
+        print("✅ Flat listing returns video entries only")
+    finally:
+        app.ytdlp_engine = original
+
+def test_playlist_fan_out_is_parallel_and_bounded():
+    video_ids = [f"plvid{i:06d}" for i in range(50)]
+    videos = [{'video_id': v, 'title': f"Title {v}", 'duration': 60} for v in video_ids]
+    state = {'active': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    def fake_fetch(platform, video_id):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+        time.sleep(random.uniform(0.1, 0.3))
+        with lock:
+            state['active'] -= 1
+        if video_id == 'plvid000007':
+            raise Exception("No transcript found")
+        return f"[00:01] {video_id}", {'title': f"Title {video_id}"}
+
+    original_fetch = app._fetch_and_cache_transcript
+    original_list = app.list_collection_entries
+    original_pool = app.extraction_pools['youtube']
+    app._fetch_and_cache_transcript = fake_fetch
+    app.list_collection_entries = lambda url, limit: ('My list', videos[:limit])
+    pool = BoundedExecutor('youtube', max_workers=8, max_queue=4, retry_after=1)
+    app.extraction_pools['youtube'] = pool
+    try:
+        client = app.app.test_client()
+        start = time.time()
+        resp = client.post('/api/extract-playlist', json={'url': 'https://www.youtube.com/playlist?list=PL1'})
+        lines = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+        elapsed = time.time() - start
+
+        assert resp.status_code == 200
+        assert resp.mimetype == 'application/x-ndjson'
+        assert lines[0]['type'] == 'playlist' and lines[0]['total'] == 50
+        video_lines = [l for l in lines if l['type'] == 'video']
+        assert sorted(l['video_id'] for l in video_lines) == video_ids
+        assert [l['completed'] for l in video_lines] == list(range(1, 51))
+        assert [l['video_id'] for l in video_lines if l['status'] == 'error'] == ['plvid000007']
+        assert lines[-1] == dict(lines[-1], type='done', ok=49, failed=1)
+        print(f"✅ 50-video playlist in {elapsed:.2f}s (sequential would be ~10s), peak concurrency {state['peak']}")
+        # One playlist stays under its per-request cap and never fills the pool
+        assert state['peak'] <= app.PLAYLIST_CONCURRENCY < pool.max_workers
+        assert pool.get_stats()['rejected'] == 0
+        assert elapsed < 5
+    finally:
+        app._fetch_and_cache_transcript = original_fetch
+        app.list_collection_entries = original_list
+        app.extraction_pools['youtube'] = original_pool
+
+def test_playlist_leaves_room_for_single_videos():
+    release = threading.Event()
+    started = []
+
+    def fake_fetch(platform, video_id):
+        started.append(video_id)
+        release.wait(5)
+        return f"[00:01] {video_id}", {'title': video_id}
+
+    original_fetch = app._fetch_and_cache_transcript
+    original_pool = app.extraction_pools['youtube']
+    app._fetch_and_cache_transcript = fake_fetch
+    app.extraction_pools['youtube'] = BoundedExecutor('youtube', max_workers=4, max_queue=0, retry_after=1)
+    try:
+        results = app.fetch_transcripts_parallel([f"capvid{i:05d}" for i in range(20)], concurrency=2)
+        thread = threading.Thread(target=lambda: list(results))
+        thread.start()
+        time.sleep(0.2)
+        assert len(started) == 2
+        # A single-video request still gets a worker while the playlist runs
+        cached, future = app.start_transcript_fetch('youtube', 'single00001')
+        assert future is not None
+        release.set()
+        thread.join(10)
+        assert len(started) == 21
+        print("✅ Playlist capped at its concurrency; single videos still admitted")
+    finally:
+        release.set()
+        app._fetch_and_cache_transcript = original_fetch
+        app.extraction_pools['youtube'] = original_pool
+
+def test_non_collection_url_rejected():
+    client = app.app.test_client()
+    resp = client.post('/api/extract-playlist', json={'url': 'https://www.youtube.com/watch?v=abc'})
+    assert resp.status_code == 400
+    print("✅ Single-video URL rejected")
+
+if __name__ == "__main__":
+    test_collection_urls_recognized()
+    test_flat_listing_keeps_only_videos()
+    test_playlist_fan_out_is_parallel_and_bounded()
+    test_playlist_leaves_room_for_single_videos()
+    test_non_collection_url_rejected()
@@ -0,0 +1,101 @@
+import sys
+import os
+import threading
+import time
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import FreeProxyManager
+
+THREADS = 300
+ROUNDS = 50
+
+def make_manager():
+    manager = FreeProxyManager(maintain_interval=3600)
+    manager.proxies = [f"http://10.0.{i // 250}.{i % 250}:8080" for i in range(2000)] + \
+                      [f"socks5://10.1.{i // 250}.{i % 250}:1080" for i in range(500)]
+    manager.last_update = time.time()
+    for i in range(10):
+        manager.pool.add_verified(f"http://10.0.0.{i}:8080", latency=0.1 + i / 10)
+    return manager
+
+def run_threads(target):
+    errors = []
+    start = threading.Barrier(THREADS)
+
+    def worker(n):
+        try:
+            start.wait()
+            target(n)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+def test_concurrent_reads_and_writes():
+    manager = make_manager()
+    stable = [f"http://10.0.0.{i}:8080" for i in range(5)] # Only ever reported as working
+    picked = []
+
+    def hammer(n):
+        for r in range(ROUNDS):
+            proxy = manager.get_proxy(protocol_filter='http' if r % 2 else None)
+            assert proxy is not None
+            picked.append(proxy['http'])
+            manager.report_success(stable[(n + r) % len(stable)])
+            # Unverified candidates fail and get dropped while others read
+            manager.mark_failed({'http': f"http://10.0.{4 + n // 250}.{n % 250}:8080"})
+            if r % 10 == 0:
+                manager.get_stats()
+
+    def churn():
+        # The maintainer side: revalidation swaps while requests are running
+        for i in range(50):
+            manager.pool.add_verified(f"http://10.0.0.{5 + i % 5}:8080", latency=0.5)
+            manager.proxies = list(manager.proxies)
+
+    churner = threading.Thread(target=churn)
+    churner.start()
+    start = time.time()
+    try:
+        errors = run_threads(hammer)
+    finally:
+        churner.join()
+        manager.stop_maintainer()
+    elapsed = time.time() - start
+
+    assert errors == [], errors[:3]
+    assert len(picked) == THREADS * ROUNDS
+    # No lost updates: every success report on the stable proxies was counted
+    assert sum(manager.pool.health[url].uses for url in stable) == THREADS * ROUNDS
+    # Indexes stay consistent with the health table
+    pool = manager.pool
+    assert set(pool.verified['any']) == set(pool.health)
+    assert all(pool.verified['any'].items[pool.verified['any'].positions[url]] == url for url in pool.health)
+    assert set(pool.snapshot.verified['any']) == set(pool.health)
+    print(f"✅ {THREADS * ROUNDS} get_proxy calls across {THREADS} threads in {elapsed:.2f}s, no errors or lost updates")
+
+def test_snapshot_never_changes_under_a_reader():
+    manager = make_manager()
+    snapshot = manager.pool.snapshot
+    before = (snapshot.verified['any'], snapshot.candidates['any'])
+
+    manager.mark_failed({'http': 'http://10.0.5.1:8080'})
+    manager.mark_failed({'http': 'http://10.0.0.1:8080'})
+    manager.mark_failed({'http': 'http://10.0.0.1:8080'})
+    manager.report_success('http://10.0.0.2:8080')
+
+    assert (snapshot.verified['any'], snapshot.candidates['any']) == before
+    assert 'http://10.0.0.1:8080' not in manager.verified_proxies
+    assert 'http://10.0.5.1:8080' not in manager.proxies
+    print("✅ Writers publish new snapshots instead of mutating the one being read")
+
+if __name__ == "__main__":
+    test_concurrent_reads_and_writes()
+    test_snapshot_never_changes_under_a_reader()
@@ -0,0 +1,53 @@
+import sys
+import os
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from proxy_farm_simulator import ProxyFarm, run_policy, POLICIES
+
+def test_farm_endpoint_semantics():
+    farm = ProxyFarm(size=200, alive=0.5, blocked=0.5, failure=0, timeout=10, check_timeout=3, seed=3)
+    dead = [p for p in farm.proxies.values() if not p.alive]
+    blocked = [p for p in farm.proxies.values() if p.alive and p.blocked]
+    assert dead and blocked
+    assert farm.check(dead[0].url) == (False, 3)
+    assert farm.fetch_transcript(dead[0].url) == (False, 10)
+    # Rate limited proxies pass the validation check but not the transcript request
+    quick = next(p for p in blocked if p.latency < 1)
+    assert farm.check(quick.url)[0]
+    assert not farm.fetch_transcript(quick.url)[0]
+    print("✅ Dead proxies time out, blocked ones pass the check and fail transcripts")
+
+def test_churn_keeps_lists_full_and_old_proxies_known():
+    farm = ProxyFarm(size=500, alive=0.5, seed=3)
+    before = set(farm.proxies)
+    farm.churn(0.2)
+    assert len(farm.proxies) == 500
+    assert len(before - set(farm.proxies)) == 100
+    assert farm.died > 0
+    assert before <= set(farm.known)
+    texts = [text for _, status, text, _ in farm.source_responses()]
+    assert sum(len(t.split()) for t in texts) == 500
+    print(f"✅ Churn killed {farm.died} live proxies and republished the lists")
+
+def test_healthy_farm_serves_every_transcript_first_try():
+    options = {'size': 300, 'alive': 1.0, 'blocked': 0.0, 'failure': 0.0}
+    for name in POLICIES:
+        result = run_policy(name, options, transcripts=200, tick=50, churn=0.0)
+        assert result['success_rate'] == 1.0, name
+        assert result['attempts_per_success'] == 1.0, name
+        assert result['p50'] <= result['p95'] <= result['p99']
+    print("✅ Every policy succeeds first try on a healthy farm")
+
+def test_dead_farm_fails_without_crashing():
+    result = run_policy('scored', {'size': 100, 'alive': 0.0}, transcripts=20, attempts=2)
+    assert result['success_rate'] == 0.0
+    assert result['attempts_per_success'] is None and result['p50'] is None
+    print(f"✅ Dead farm: {result['no_proxy']} transcripts found no proxy left")
+
+if __name__ == "__main__":
+    test_farm_endpoint_semantics()
+    test_churn_keeps_lists_full_and_old_proxies_known()
+    test_healthy_farm_serves_every_transcript_first_try()
+    test_dead_farm_fails_without_crashing()
@@ -0,0 +1,101 @@
+import sys
+import os
+import time
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import FreeProxyManager
+
+def test_get_proxy_never_refreshes_inline():
+    manager = FreeProxyManager(maintain_interval=60)
+    refreshes = []
+
+    def slow_refresh():
+        refreshes.append(time.time())
+        time.sleep(1)
+        manager.proxies = ['http://1.1.1.1:80']
+        manager.last_update = time.time()
+    manager._refresh_proxies = slow_refresh
+    checked = []
+    manager._check_proxy = lambda proxy_url: checked.append(proxy_url) or True # No network
+
+    try:
+        start = time.time()
+        assert manager.get_proxy() is None # Empty pool: answer right away, no inline refresh
+        assert time.time() - start < 0.2
+        assert manager.get_stats()['maintainer_running']
+
+        # The maintainer fills the pool in the background
+        deadline = time.time() + 3
+        while not manager.proxies and time.time() < deadline:
+            time.sleep(0.05)
+        assert manager.get_proxy() == {'http': 'http://1.1.1.1:80', 'https': 'http://1.1.1.1:80'}
+        assert len(refreshes) == 1
+        assert set(checked) <= {'http://1.1.1.1:80'}
+        print("✅ get_proxy answered immediately while the maintainer refreshed")
+    finally:
+        manager.stop_maintainer()
+
+def test_refresh_only_when_due():
+    manager = FreeProxyManager(refresh_interval=1800)
+    refreshes = []
+    manager._refresh_proxies = lambda: refreshes.append(1)
+    manager._validate_initial_batch = lambda: None
+
+    manager.proxies = ['http://1.1.1.1:80']
+    manager.last_update = time.time()
+    manager.maintain_once()
+    assert refreshes == []
+
+    manager.last_update = time.time() - 1801
+    manager.maintain_once()
+    assert refreshes == [1]
+
+    manager.refresh_sources = False # Async server downloads the sources itself
+    manager.last_update = 0
+    manager.maintain_once()
+    assert refreshes == [1]
+    print("✅ Sources refreshed only when due")
+
+def test_stale_verified_proxies_rechecked():
+    manager = FreeProxyManager(recheck_age=600, low_water=0)
+    manager.proxies = ['http://1.1.1.1:80', 'http://2.2.2.2:80', 'http://3.3.3.3:80']
+    manager.last_update = time.time()
+    manager.verified_proxies = list(manager.proxies)
+    now = time.time()
+    manager.pool.health['http://1.1.1.1:80'].checked_at = now - 700 # stale, still works
+    manager.pool.health['http://2.2.2.2:80'].checked_at = now - 700 # stale, dead
+    checked = []
+
+    def check(proxy_url):
+        checked.append(proxy_url)
+        return proxy_url != 'http://2.2.2.2:80'
+    manager._check_proxy = check
+
+    manager.maintain_once()
+    assert sorted(checked) == ['http://1.1.1.1:80', 'http://2.2.2.2:80']
+    assert sorted(manager.verified_proxies) == ['http://1.1.1.1:80', 'http://3.3.3.3:80']
+    assert manager.pool.health['http://1.1.1.1:80'].checked_at >= now
+    assert 'http://2.2.2.2:80' not in manager.pool.candidates['any']
+    assert manager.get_stats()['dropped'] == 1
+    print("✅ Stale verified proxies re-checked and dead ones dropped")
+
+def test_topped_up_below_low_water_mark():
+    manager = FreeProxyManager(low_water=3)
+    manager.proxies = [f"http://10.0.0.{i}:80" for i in range(40)]
+    manager.last_update = time.time()
+    manager.verified_proxies = ['http://10.0.0.0:80']
+    manager._check_proxy = lambda proxy_url: True
+
+    manager.maintain_once()
+    assert len(manager.verified_proxies) >= 3
+    assert len(set(manager.verified_proxies)) == len(manager.verified_proxies)
+    assert manager.get_stats()['top_ups'] == 1
+    print(f"✅ Topped up to {len(manager.verified_proxies)} verified proxies")
+
+if __name__ == "__main__":
+    test_get_proxy_never_refreshes_inline()
+    test_refresh_only_when_due()
+    test_stale_verified_proxies_rechecked()
+    test_topped_up_below_low_water_mark()
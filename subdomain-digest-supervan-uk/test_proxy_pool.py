@@ -0,0 +1,136 @@
+import sys
+import os
+import random
+from collections import Counter
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import IndexedSet, ProxyPool, FreeProxyManager
+
+def test_indexed_set_removes_in_place():
+    items = IndexedSet(['a', 'b', 'c', 'd'])
+    assert items.discard('b')
+    assert not items.discard('b')
+    assert sorted(items) == ['a', 'c', 'd']
+    assert all(items.items[items.positions[x]] == x for x in items)
+    items.discard('d') # last item
+    assert sorted(items) == ['a', 'c'] and len(items) == 2
+    print("✅ IndexedSet removal keeps positions consistent")
+
+def test_protocol_index():
+    pool = ProxyPool()
+    pool.set_candidates(['socks5://1.1.1.1:1080', 'http://2.2.2.2:80'])
+    assert pool.candidates['http'].items == ['http://2.2.2.2:80']
+    assert all(pool.pick('http') == 'http://2.2.2.2:80' for _ in range(20))
+
+    pool.add_verified('socks5://3.3.3.3:1080', latency=0.1)
+    assert pool.pick() == 'socks5://3.3.3.3:1080'
+    # No verified HTTP proxy: fall back to an HTTP candidate, never a SOCKS one
+    assert pool.pick('http') == 'http://2.2.2.2:80'
+    print("✅ Protocol filter served from its own index")
+
+def test_fast_proxies_carry_most_traffic():
+    random.seed(1)
+    pool = ProxyPool()
+    pool.add_verified('http://fast:80', latency=0.2)
+    pool.add_verified('http://slow:80', latency=2.0)
+    picks = Counter(pool.pick() for _ in range(2000))
+    share = picks['http://fast:80'] / 2000
+    print(f"✅ Fast proxy picked {share:.0%} of the time")
+    assert share > 0.85
+
+def test_failures_lower_score_then_drop():
+    manager = FreeProxyManager()
+    manager.proxies = ['http://1.1.1.1:80', 'http://2.2.2.2:80']
+    manager.pool.add_verified('http://1.1.1.1:80', latency=0.5)
+
+    proxy = {'http': 'http://1.1.1.1:80', 'https': 'http://1.1.1.1:80'}
+    manager.mark_failed(proxy)
+    assert 'http://1.1.1.1:80' in manager.verified_proxies # One failure only costs score
+    assert manager.pool.health['http://1.1.1.1:80'].success_rate < 1.0
+    manager.mark_failed(proxy)
+    assert 'http://1.1.1.1:80' not in manager.verified_proxies
+    assert 'http://1.1.1.1:80' not in manager.proxies
+
+    # Unverified proxies are dropped on their first failure
+    manager.mark_failed({'http': 'http://2.2.2.2:80', 'https': 'http://2.2.2.2:80'})
+    assert manager.proxies == ()
+
+    manager.report_success('http://4.4.4.4:80')
+    assert manager.verified_proxies == ('http://4.4.4.4:80',)
+    assert manager.pool.health['http://4.4.4.4:80'].uses == 1
+    print("✅ Success rate tracked per proxy")
+
+def test_latency_moving_average():
+    pool = ProxyPool()
+    pool.add_verified('http://1.1.1.1:80', latency=1.0)
+    pool.add_verified('http://1.1.1.1:80', latency=2.0)
+    assert abs(pool.health['http://1.1.1.1:80'].latency - 1.3) < 1e-9
+    assert pool.get_stats()['fastest'][0]['latency'] == 1.3
+    print("✅ Latency averaged across checks")
+
+def test_request_latency_reshapes_weights():
+    random.seed(1)
+    manager = FreeProxyManager()
+    # Both answer the validation check quickly, but one is slow for real transcript requests
+    manager.pool.add_verified('http://1.1.1.1:80', latency=0.3)
+    manager.pool.add_verified('http://2.2.2.2:80', latency=0.3)
+    for _ in range(5):
+        manager.report_success('http://1.1.1.1:80', 0.5)
+        manager.report_success('http://2.2.2.2:80', 6.0)
+    manager.report_success('http://2.2.2.2:80') # Unmeasured successes leave the latency alone
+    health = manager.pool.health
+    assert health['http://1.1.1.1:80'].latency < 0.5
+    assert health['http://2.2.2.2:80'].latency > 4.5
+    picks = Counter(manager.pool.pick() for _ in range(2000))
+    share = picks['http://1.1.1.1:80'] / 2000
+    print(f"✅ Request timings moved the latency averages; fast proxy picked {share:.0%} of the time")
+    assert share > 0.85
+
+def test_dropped_candidates_published_lazily():
+    random.seed(1)
+    pool = ProxyPool()
+    pool.set_candidates([f"http://10.0.{i // 250}.{i % 250}:80" for i in range(1000)])
+    published = pool.snapshot.candidates
+    publishes = []
+    publish = pool._publish
+    pool._publish = lambda *args, **kwargs: publishes.append(1) or publish(*args, **kwargs)
+
+    dead = [f"http://10.0.0.{i}:80" for i in range(50)]
+    for url in dead:
+        assert pool.record(url, False)
+    # 5% dropped: the big tuples are not copied again, one publish per failure
+    assert pool.snapshot.candidates is published
+    assert len(publishes) == 50
+    picks = {pool.pick() for _ in range(2000)}
+    assert not picks & set(dead)
+    assert not pool.is_candidate(dead[0])
+
+    for i in range(50, 101):
+        pool.record(f"http://10.0.0.{i}:80", False)
+    # Past STALE_CANDIDATES the tuples are rebuilt without the dropped proxies
+    assert pool.snapshot.candidates is not published
+    assert len(pool.snapshot.candidates['any']) == 1000 - 101
+    print("✅ Dropped candidates skipped at once, candidate tuples rebuilt in batches")
+
+def test_dropping_verified_proxy_publishes_once():
+    pool = ProxyPool()
+    pool.add_verified('http://1.1.1.1:80', latency=0.5)
+    publishes = []
+    publish = pool._publish
+    pool._publish = lambda *args, **kwargs: publishes.append(1) or publish(*args, **kwargs)
+    pool.record('http://1.1.1.1:80', False)
+    assert pool.record('http://1.1.1.1:80', False)
+    assert len(publishes) == 2 and pool.snapshot.verified['any'] == ()
+    print("✅ One publish per recorded outcome, even when it drops the proxy")
+
+if __name__ == "__main__":
+    test_indexed_set_removes_in_place()
+    test_protocol_index()
+    test_fast_proxies_carry_most_traffic()
+    test_failures_lower_score_then_drop()
+    test_latency_moving_average()
+    test_request_latency_reshapes_weights()
+    test_dropped_candidates_published_lazily()
+    test_dropping_verified_proxy_publishes_once()
@@ -0,0 +1,113 @@
+import sys
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import FreeProxyManager
+
+class SourceHandler(BaseHTTPRequestHandler):
+    """Serves proxy lists with ETags, answering 304 when the client's copy is current."""
+    lists = {}
+    requests_seen = []
+    delay = 0.3
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = self.lists[self.path].encode()
+        etag = f'"{hash(body) & 0xffffffff:x}"'
+        SourceHandler.requests_seen.append((self.path, self.headers.get('If-None-Match')))
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def start_server():
+    SourceHandler.lists = {f"/list{i}/http.txt": f"10.0.{i}.1:80\n10.0.{i}.2:80\n10.9.9.9:80\n" for i in range(8)}
+    SourceHandler.requests_seen = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SourceHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def make_manager(server):
+    manager = FreeProxyManager()
+    base = f"http://127.0.0.1:{server.server_port}"
+    manager.SOURCES = [f"{base}{path}" for path in sorted(SourceHandler.lists)]
+    validations = []
+    manager._validate_initial_batch = lambda: validations.append(1)
+    return manager, validations
+
+def test_sources_fetched_in_parallel():
+    server = start_server()
+    try:
+        manager, validations = make_manager(server)
+        start = time.time()
+        manager._refresh_proxies()
+        elapsed = time.time() - start
+        assert len(manager.proxies) == 17 # 2 per list plus one listed everywhere
+        assert validations == [1]
+        print(f"✅ {len(manager.SOURCES)} sources fetched in {elapsed:.2f}s")
+        # Eight lists at 0.3s each took 2.4s one after another
+        assert elapsed < 1.0
+    finally:
+        server.shutdown()
+
+def test_unchanged_sources_cost_a_304():
+    server = start_server()
+    try:
+        manager, validations = make_manager(server)
+        manager._refresh_proxies()
+        manager.pool.add_verified('http://10.0.0.1:80', latency=0.4)
+        manager.report_success('http://10.0.0.1:80')
+        parsed = []
+        original_parse = manager._parse_proxy_list
+        manager._parse_proxy_list = lambda url, text: parsed.append(url) or original_parse(url, text)
+
+        manager._refresh_proxies()
+        assert all(etag for _, etag in SourceHandler.requests_seen[-8:]) # Conditional requests
+        assert parsed == [] # Nothing re-parsed
+        assert validations == [1] # Nothing new to validate
+        assert len(manager.proxies) == 17
+        assert manager.pool.health['http://10.0.0.1:80'].uses == 1
+        print("✅ Unchanged lists answered 304 and left the pool alone")
+    finally:
+        server.shutdown()
+
+def test_changed_source_merged_in_place():
+    server = start_server()
+    try:
+        manager, validations = make_manager(server)
+        manager._refresh_proxies()
+        manager.pool.add_verified('http://10.0.0.2:80', latency=0.4)
+        snapshot_health = manager.pool.health['http://10.0.0.2:80']
+
+        # list0 drops 10.0.0.1 and 10.0.0.2 (verified) and adds a new proxy
+        SourceHandler.lists['/list0/http.txt'] = "10.0.0.3:80\n10.9.9.9:80\n"
+        manager._refresh_proxies()
+        proxies = set(manager.proxies)
+        assert 'http://10.0.0.3:80' in proxies
+        assert 'http://10.0.0.1:80' not in proxies
+        assert 'http://10.9.9.9:80' in proxies # Still listed by the other sources
+        assert manager.pool.health['http://10.0.0.2:80'] is snapshot_health # Verified health kept
+        assert 'http://10.0.0.2:80' in manager.verified_proxies
+        assert validations == [1, 1]
+        print("✅ Changed list merged without rebuilding the pool")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_sources_fetched_in_parallel()
+    test_unchanged_sources_cost_a_304()
+    test_changed_source_merged_in_place()
@@ -0,0 +1,169 @@
+import sys
+import os
+import json
+import threading
+import signal
+import subprocess
+import tempfile
+import time
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import FreeProxyManager
+
+def make_saved_manager(path):
+    manager = FreeProxyManager(state_path=path)
+    manager.proxies = ['http://1.1.1.1:80', 'http://2.2.2.2:80', 'socks5://3.3.3.3:1080']
+    manager.last_update = time.time() - 60
+    manager.source_state = {'https://example.com/http.txt': {
+        'proxies': ['http://1.1.1.1:80', 'http://2.2.2.2:80'], 'etag': '"abc"', 'last_modified': None,
+        'fetched_at': manager.last_update,
+    }}
+    manager.pool.add_verified('http://1.1.1.1:80', latency=0.3)
+    manager.pool.add_verified('socks5://3.3.3.3:1080', latency=1.2)
+    manager.report_success('http://1.1.1.1:80')
+    manager.mark_failed({'http': 'socks5://3.3.3.3:1080'})
+    assert manager.save_state()
+    return manager
+
+def test_round_trip_keeps_scores_and_sources():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'proxy_state.json')
+        saved = make_saved_manager(path)
+
+        restored = FreeProxyManager(state_path=path)
+        assert restored.load_state()
+        assert sorted(restored.proxies) == sorted(saved.proxies)
+        assert sorted(restored.verified_proxies) == sorted(saved.verified_proxies)
+        assert restored.last_update == saved.last_update
+        assert restored.source_state == saved.source_state
+        assert restored._source_headers('https://example.com/http.txt') == {'If-None-Match': '"abc"'}
+        for url in saved.verified_proxies:
+            before, after = saved.pool.health[url], restored.pool.health[url]
+            assert (after.success_rate, after.latency, after.uses, after.failures) == \
+                   (before.success_rate, before.latency, before.uses, before.failures)
+        # Usable immediately, but due for re-verification
+        assert restored.pool.pick() in restored.verified_proxies
+        assert sorted(restored.pool.stale(restored.recheck_age)) == sorted(restored.verified_proxies)
+        print(f"✅ Restored {len(restored.verified_proxies)} verified proxies with their scores")
+
+def test_warm_restart_rechecks_without_redownloading():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'proxy_state.json')
+        make_saved_manager(path)
+
+        restored = FreeProxyManager(state_path=path, low_water=0)
+        restored.load_state()
+        downloads = []
+        checked = []
+        restored._refresh_proxies = lambda: downloads.append(1)
+        restored._check_proxy = lambda url: checked.append(url) or url.startswith('http')
+
+        restored.maintain_once()
+        assert downloads == [] # Sources were fetched a minute before the restart
+        assert sorted(checked) == ['http://1.1.1.1:80', 'socks5://3.3.3.3:1080']
+        assert restored.verified_proxies == ('http://1.1.1.1:80',)
+        print("✅ Warm restart re-verified the saved proxies in the background pass")
+
+def test_old_or_empty_snapshots_ignored():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'proxy_state.json')
+        make_saved_manager(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        state['saved_at'] -= 7 * 3600
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        assert not FreeProxyManager(state_path=path).load_state(max_age=6 * 3600)
+
+        # An empty pool doesn't overwrite the snapshot
+        assert not FreeProxyManager(state_path=path).save_state()
+        with open(path, 'r', encoding='utf-8') as f:
+            assert json.load(f)['verified']
+        assert os.listdir(tmp) == ['proxy_state.json'] # No leftover per-process tmp file
+
+        # A corrupt file is reported, not raised
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{not json')
+        assert not FreeProxyManager(state_path=path).load_state()
+        print("✅ Stale, empty and corrupt snapshots handled")
+
+def test_sigterm_saves_snapshot():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'proxy_state.json')
+        script = (
+            "import signal, time, app\n"
+            "app.proxy_manager.pool.add_verified('http://1.1.1.1:80', latency=0.3)\n"
+            "signal.signal(signal.SIGTERM, app._save_state_and_exit)\n"
+            "print('ready', flush=True)\n"
+            "time.sleep(30)\n"
+        )
+        env = dict(os.environ, PROXY_STATE_PATH=path, TRANSCRIPT_CACHE_PATH=os.path.join(tmp, 'cache.db'))
+        proc = subprocess.Popen([sys.executable, '-c', script], cwd=os.getcwd(), env=env,
+                                stdout=subprocess.PIPE, text=True)
+        try:
+            for line in proc.stdout:
+                if line.strip() == 'ready':
+                    break
+            proc.send_signal(signal.SIGTERM)
+            assert proc.wait(timeout=20) == 0
+        finally:
+            proc.kill()
+        with open(path, 'r', encoding='utf-8') as f:
+            assert json.load(f)['verified'][0]['url'] == 'http://1.1.1.1:80'
+        print("✅ SIGTERM writes the snapshot before exiting")
+
+def test_save_copies_sources_under_lock():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'proxy_state.json')
+        manager = make_saved_manager(path)
+        results = []
+        saver = threading.Thread(target=lambda: results.append(manager.save_state()))
+        with manager.source_lock:
+            # A refresher is mid-merge: the snapshot waits instead of iterating a changing dict
+            saver.start()
+            saver.join(0.2)
+            assert saver.is_alive()
+            manager.source_state['https://example.com/new.txt'] = {'proxies': ['http://9.9.9.9:80']}
+        saver.join(5)
+        assert results == [True]
+        with open(path, 'r', encoding='utf-8') as f:
+            assert 'https://example.com/new.txt' in json.load(f)['sources']
+        print("✅ Source state copied under the lock for the snapshot")
+
+def test_main_rechecks_restored_proxies_on_boot():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'proxy_state.json')
+        saved = FreeProxyManager(state_path=path)
+        saved.pool.add_verified('http://127.0.0.1:9', latency=0.3) # Nothing listens there
+        saved.last_update = time.time()
+        assert saved.save_state()
+
+        # Stand in for the dev server: report the pool once the first maintenance pass ran
+        script = (
+            "import runpy, sys, time, flask\n"
+            "def serve(self, **kwargs):\n"
+            "    manager = sys.modules['__main__'].proxy_manager\n"
+            "    for _ in range(100):\n"
+            "        if manager.get_stats()['last_maintenance']:\n"
+            "            break\n"
+            "        time.sleep(0.1)\n"
+            "    print('verified', list(manager.verified_proxies), manager.get_stats()['rechecked'], flush=True)\n"
+            "flask.Flask.run = serve\n"
+            "runpy.run_path('app.py', run_name='__main__')\n"
+        )
+        env = dict(os.environ, PROXY_STATE_PATH=path, TRANSCRIPT_CACHE_PATH=os.path.join(tmp, 'cache.db'),
+                   PROXY_LOW_WATER='0')
+        result = subprocess.run([sys.executable, '-c', script], cwd=os.getcwd(), env=env,
+                                capture_output=True, text=True, timeout=60)
+        assert "verified [] 1" in result.stdout, result.stdout[-2000:]
+        print("✅ python3 app.py re-verifies the restored proxies before any request")
+
+if __name__ == "__main__":
+    test_round_trip_keeps_scores_and_sources()
+    test_warm_restart_rechecks_without_redownloading()
+    test_old_or_empty_snapshots_ignored()
+    test_sigterm_saves_snapshot()
+    test_save_copies_sources_under_lock()
+    test_main_rechecks_restored_proxies_on_boot()
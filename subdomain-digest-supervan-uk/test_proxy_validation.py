@@ -0,0 +1,70 @@
+import sys
+import os
+import threading
+import time
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import FreeProxyManager
+
+def make_manager(count, check):
+    manager = FreeProxyManager()
+    manager.proxies = [f"http://10.0.{i // 250}.{i % 250}:8080" for i in range(count)]
+    manager._check_proxy = check
+    return manager
+
+def test_validation_runs_concurrently_until_target():
+    in_flight = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def check(proxy_url):
+        with lock:
+            in_flight.append(proxy_url)
+            peak[0] = max(peak[0], len(in_flight))
+        time.sleep(0.2)
+        with lock:
+            in_flight.remove(proxy_url)
+        return proxy_url.endswith('3:8080') or proxy_url.endswith('7:8080')
+
+    manager = make_manager(300, check)
+    start = time.time()
+    manager._validate_initial_batch(target=10, deadline=5, workers=20)
+    elapsed = time.time() - start
+
+    assert len(manager.verified_proxies) == 10
+    assert len(set(manager.verified_proxies)) == 10
+    assert peak[0] == 20
+    print(f"✅ Found {len(manager.verified_proxies)} proxies in {elapsed:.2f}s with {peak[0]} checks in flight")
+    # 15 sequential rounds of 3s used to take up to 45s
+    assert elapsed < 1.5
+
+def test_validation_stops_at_deadline():
+    def check(proxy_url):
+        time.sleep(2)
+        return True
+
+    manager = make_manager(100, check)
+    start = time.time()
+    manager._validate_initial_batch(target=10, deadline=0.3, workers=8)
+    elapsed = time.time() - start
+
+    assert manager.verified_proxies == ()
+    print(f"✅ Validation gave up at the deadline after {elapsed:.2f}s")
+    assert elapsed < 1.0
+
+def test_validation_tries_beyond_first_hundred_candidates():
+    def check(proxy_url):
+        return False
+
+    manager = make_manager(400, check)
+    checked = manager._validation_batch(limit=250)
+    assert len(checked) == 250 and len(set(checked)) == 250
+    assert set(manager.proxies[:50]) <= set(checked[:100]) # Top of the pool still goes first
+    print("✅ Candidates continue past the first batch up to the limit")
+
+if __name__ == "__main__":
+    test_validation_runs_concurrently_until_target()
+    test_validation_stops_at_deadline()
+    test_validation_tries_beyond_first_hundred_candidates()
@@ -0,0 +1,60 @@
+import sys
+import os
+import time
+import threading
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import SingleFlight
+
+def test_concurrent_callers_share_one_fetch():
+    flights = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'transcript'
+
+    results = []
+    def caller():
+        future, _ = flights.submit(('youtube', 'abc'), fetch)
+        results.append(future.result(timeout=5))
+
+    threads = [threading.Thread(target=caller) for _ in range(50)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print(f"📊 Stats: {flights.get_stats()}")
+    assert len(calls) == 1
+    assert results == ['transcript'] * 50
+    assert flights.get_stats()['followers'] == 49
+    assert flights.get_stats()['inflight'] == 0
+
+def test_errors_propagate_and_key_is_released():
+    flights = SingleFlight()
+
+    def broken():
+        raise Exception("All transcript strategies failed.")
+
+    future, is_leader = flights.submit(('vimeo', '1'), broken)
+    assert is_leader
+    try:
+        future.result(timeout=5)
+    except Exception as e:
+        assert 'strategies failed' in str(e)
+    else:
+        raise AssertionError("Expected failure")
+
+    time.sleep(0.05)
+    future, is_leader = flights.submit(('vimeo', '1'), lambda: 'retry ok')
+    assert is_leader
+    assert future.result(timeout=5) == 'retry ok'
+
+if __name__ == "__main__":
+    test_concurrent_callers_share_one_fetch()
+    test_errors_propagate_and_key_is_released()
+    print("✅ Single-flight tests passed")
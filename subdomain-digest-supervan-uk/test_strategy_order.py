@@ -0,0 +1,212 @@
+import sys
+import os
+import time
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+import app
+from app import StrategyStats, _run_strategies_hedged, _retry_without_cookies, NO_COOKIE_RETRY_KEY
+
+def counting_strategy(calls, name, result=None, delay=0.01):
+    def run(cancel):
+        calls.append(name)
+        time.sleep(delay)
+        if result is None:
+            raise Exception(f"{name} blocked")
+        return result, None
+    return run
+
+def datacenter_strategies(calls):
+    # Direct methods always fail from here; only the proxy path works
+    return [
+        ('Method 1', counting_strategy(calls, 'Method 1')),
+        ('Method 1.5', counting_strategy(calls, 'Method 1.5')),
+        ('Method 2', counting_strategy(calls, 'Method 2', result='text')),
+    ]
+
+def with_stats(stats, test):
+    original = app.strategy_stats
+    app.strategy_stats = stats
+    try:
+        test()
+    finally:
+        app.strategy_stats = original
+
+def run(strategies):
+    return _run_strategies_hedged(strategies, deadline=time.time() + 10, hedge_delay=5, max_parallel=1,
+                                  stats_prefix='youtube/no cookies')
+
+def test_plan_orders_by_time_per_success():
+    stats = StrategyStats(min_samples=3, probe_rate=0)
+    for _ in range(3):
+        stats.record('p/slow', True, 4.0)
+        stats.record('p/flaky', True, 1.0)
+        stats.record('p/dead', False, 0.5)
+    stats.record('p/flaky', False, 1.0) # 0.8 success rate: 1.25s per success
+    strategies = [(name, None) for name in ('dead', 'slow', 'new', 'flaky')]
+    planned, last_resort = stats.plan('p', strategies)
+    assert [name for name, _ in planned] == ['new', 'flaky', 'slow']
+    assert [name for name, _ in last_resort] == ['dead']
+    assert stats.get_stats()['p/dead']['skipped'] == 1
+    print("✅ Unknown strategies first, then learned ones by time per success, dead ones skipped")
+
+def test_failing_direct_methods_skipped_once_learned():
+    stats = StrategyStats(min_samples=3, probe_rate=0)
+    with_stats(stats, lambda: learn_datacenter(stats))
+    print("✅ Requests go straight to the working strategy after 3 samples")
+
+def learn_datacenter(stats):
+    calls = []
+    for _ in range(3):
+        assert run(datacenter_strategies(calls))[0] == 'Method 2'
+    assert calls.count('Method 1') == 3
+
+    calls.clear()
+    for _ in range(5):
+        assert run(datacenter_strategies(calls))[0] == 'Method 2'
+    assert calls == ['Method 2'] * 5
+    learned = stats.get_stats()
+    assert learned['youtube/no cookies/Method 1']['skipped'] == 5
+    assert learned['youtube/no cookies/Method 2']['success_rate'] == 1.0
+
+def test_skipped_strategies_probed_and_used_as_last_resort():
+    stats = StrategyStats(min_samples=3, probe_rate=0)
+    with_stats(stats, lambda: fall_back_and_probe(stats))
+    print("✅ Skipped strategies are probed and kept as a last resort")
+
+def fall_back_and_probe(stats):
+    calls = []
+    for _ in range(3):
+        run(datacenter_strategies(calls))
+
+    # The proxy path dies too: skipped strategies still run before giving up
+    calls.clear()
+    strategies = datacenter_strategies(calls)
+    strategies[2] = ('Method 2', counting_strategy(calls, 'Method 2'))
+    strategies[1] = ('Method 1.5', counting_strategy(calls, 'Method 1.5', result='direct text'))
+    assert run(strategies)[:2] == ('Method 1.5', 'direct text')
+    assert calls == ['Method 2', 'Method 1', 'Method 1.5']
+
+    # A probe runs a skipped strategy first
+    stats.probe_rate = 1.0
+    calls.clear()
+    run(datacenter_strategies(calls))
+    assert calls[0] == 'Method 1'
+
+def test_requests_where_everything_fails_are_not_learned():
+    stats = StrategyStats(min_samples=1)
+    calls = []
+
+    def fail_all():
+        try:
+            run([('Method 1', counting_strategy(calls, 'Method 1')), ('Method 2', counting_strategy(calls, 'Method 2'))])
+        except Exception as e:
+            assert 'Method 2 Error' in str(e)
+        else:
+            raise AssertionError("Expected failure")
+
+    with_stats(stats, fail_all)
+    assert stats.get_stats() == {} # e.g. a video without captions
+    print("✅ Total failures don't count against any strategy")
+
+def test_fixed_order_without_prefix():
+    stats = StrategyStats(min_samples=1, probe_rate=0)
+    stats.record('youtube/no cookies/Method 1', False, 1.0)
+    calls = []
+    with_stats(stats, lambda: _run_strategies_hedged(datacenter_strategies(calls), deadline=time.time() + 10,
+                                                     hedge_delay=5, max_parallel=1))
+    assert calls == ['Method 1', 'Method 1.5', 'Method 2']
+    print("✅ Callers without a stats prefix keep their order")
+
+def retry_blocked(calls):
+    def extract(ydl_opts, video_url, info=None):
+        calls.append(ydl_opts)
+        raise Exception("ERROR: Sign in to confirm you're not a bot")
+    original = app._extract_with_subtitles
+    app._extract_with_subtitles = extract
+    try:
+        _retry_without_cookies({'cookie_set': object()}, 'https://www.youtube.com/watch?v=x', Exception("403"))
+    except Exception:
+        pass
+    else:
+        raise AssertionError("Expected the block to be re-raised")
+    finally:
+        app._extract_with_subtitles = original
+
+def test_no_cookie_retry_learned_only_when_adaptive():
+    stats = StrategyStats(min_samples=1, probe_rate=0)
+    stats.record(NO_COOKIE_RETRY_KEY, False, 1.0)
+    calls = []
+    original = app.STRATEGY_ADAPTIVE
+    try:
+        app.STRATEGY_ADAPTIVE = True
+        with_stats(stats, lambda: retry_blocked(calls))
+        assert calls == [] # Learned to be pointless: skipped
+        assert stats.get_stats()[NO_COOKIE_RETRY_KEY]['skipped'] == 1
+
+        app.STRATEGY_ADAPTIVE = False
+        before = stats.get_stats()
+        with_stats(stats, lambda: retry_blocked(calls))
+        assert len(calls) == 1 and 'cookie_set' not in calls[0]
+        assert stats.get_stats() == before # Fixed order: nothing consulted or recorded
+    finally:
+        app.STRATEGY_ADAPTIVE = original
+    print("✅ The no-cookie retry is only skipped or recorded with STRATEGY_ADAPTIVE")
+
+class FakeProxies:
+    def __init__(self):
+        self.successes = []
+
+    def get_proxy(self, protocol_filter=None):
+        return {'http': 'http://10.0.0.1:8080', 'https': 'http://10.0.0.1:8080'}
+
+    def report_success(self, proxy_url, latency=None):
+        self.successes.append(proxy_url)
+
+    def mark_failed(self, proxies):
+        pass
+
+class NoCookies:
+    def acquire(self, platform):
+        return None
+
+    def report(self, cookie_set, success):
+        pass
+
+def test_tiktok_direct_skipped_once_learned():
+    calls = []
+
+    def extract(ydl_opts, video_url, info=None):
+        calls.append(ydl_opts.get('proxy', 'direct'))
+        if 'proxy' not in ydl_opts:
+            raise Exception("ERROR: [TikTok] Your IP address is blocked from accessing this post")
+        return {'title': 'Clip', 'description': 'caption text'}, None
+
+    stats = StrategyStats(min_samples=3, probe_rate=0)
+    proxies = FakeProxies()
+    original = (app._extract_with_subtitles, app.proxy_manager, app.cookie_manager, app.STRATEGY_ADAPTIVE)
+    app._extract_with_subtitles, app.proxy_manager, app.cookie_manager = extract, proxies, NoCookies()
+    app.STRATEGY_ADAPTIVE = True
+    try:
+        def fetch_four():
+            for _ in range(4):
+                text, metadata, _ = app._fetch_tiktok_transcript('7300000000000000000')
+                assert metadata['title'] == 'Clip' and 'caption text' in text
+        with_stats(stats, fetch_four)
+    finally:
+        app._extract_with_subtitles, app.proxy_manager, app.cookie_manager, app.STRATEGY_ADAPTIVE = original
+    # Three requests teach that direct is blocked from here; the fourth goes straight to a proxy
+    assert calls == ['direct', 'http://10.0.0.1:8080'] * 3 + ['http://10.0.0.1:8080']
+    assert stats.get_stats()['tiktok/no cookies/Direct']['skipped'] == 1
+    assert len(proxies.successes) == 4
+    print("✅ TikTok's direct attempt learned and skipped like YouTube's strategies")
+
+if __name__ == "__main__":
+    test_plan_orders_by_time_per_success()
+    test_failing_direct_methods_skipped_once_learned()
+    test_skipped_strategies_probed_and_used_as_last_resort()
+    test_requests_where_everything_fails_are_not_learned()
+    test_fixed_order_without_prefix()
+    test_no_cookie_retry_learned_only_when_adaptive()
+    test_tiktok_direct_skipped_once_learned()
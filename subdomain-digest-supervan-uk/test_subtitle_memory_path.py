@@ -0,0 +1,92 @@
+import sys
+import os
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import _extract_with_subtitles, _parse_vtt
+
+VTT = b"""WEBVTT
+Kind: captions
+Language: en
+
+00:00:01.000 --> 00:00:03.000
+hello from memory
+
+00:01:05.000 --> 00:01:07.000
+second cue
+"""
+
+class SubtitleHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        SubtitleHandler.requests_seen.append(self.path)
+        if 'missing' in self.path:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/vtt')
+        self.send_header('Content-Length', str(len(VTT)))
+        self.end_headers()
+        self.wfile.write(VTT)
+
+    def log_message(self, *args):
+        pass
+
+def test_track_downloaded_into_memory_without_reextracting():
+    server = HTTPServer(('127.0.0.1', 0), SubtitleHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/api/timedtext?v=abc&lang=en&fmt=vtt"
+        probe_info = {
+            'id': 'abc',
+            'title': 'Probe',
+            'automatic_captions': {'en': [{'ext': 'vtt', 'url': url}]},
+        }
+        info, vtt_content = _extract_with_subtitles({'quiet': True}, 'https://www.youtube.com/watch?v=abc', info=probe_info)
+        assert info is probe_info
+        assert SubtitleHandler.requests_seen == ['/api/timedtext?v=abc&lang=en&fmt=vtt']
+        assert not isinstance(vtt_content, (str, bytes)) # Streamed into the parser, not read whole
+        text = _parse_vtt(vtt_content)
+        print(f"📝 Parsed: {text}")
+        assert text == "[00:01] hello from memory [01:05] second cue"
+    finally:
+        server.shutdown()
+
+def test_streamed_track_with_multibyte_chunks():
+    body = VTT.replace(b'second cue', 'caf\u00e9 cue'.encode('utf-8'))
+    # Chunk boundaries that split lines and a UTF-8 character
+    chunks = iter([body[:20], body[20:body.index(b'\xc3') + 1], body[body.index(b'\xc3') + 1:]])
+    assert _parse_vtt(chunks) == "[00:01] hello from memory [01:05] caf\u00e9 cue"
+    print("✅ Chunked track parsed as it arrives")
+
+def test_track_http_error_raised_before_parsing():
+    server = HTTPServer(('127.0.0.1', 0), SubtitleHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/api/timedtext?v=missing"
+        probe_info = {'id': 'missing', 'subtitles': {'en': [{'ext': 'vtt', 'url': url}]}}
+        try:
+            _extract_with_subtitles({}, 'https://www.youtube.com/watch?v=missing', info=probe_info)
+        except Exception as e:
+            assert '404' in str(e)
+        else:
+            raise AssertionError("Expected an HTTP error")
+    finally:
+        server.shutdown()
+
+def test_missing_track_returns_none():
+    info, vtt_content = _extract_with_subtitles({}, 'https://vimeo.com/1', info={'id': '1', 'subtitles': {}})
+    assert vtt_content is None
+
+if __name__ == "__main__":
+    test_track_downloaded_into_memory_without_reextracting()
+    test_streamed_track_with_multibyte_chunks()
+    test_track_http_error_raised_before_parsing()
+    test_missing_track_returns_none()
+    print("✅ In-memory subtitle tests passed")
@@ -0,0 +1,50 @@
+import sys
+import os
+import tempfile
+import time
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import TieredCache
+
+def test_memory_and_disk_tiers():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cache.db')
+        cache = TieredCache('transcripts', path, ttl=60, memory_entries=2, disk_entries=10)
+
+        assert cache.get(('youtube', 'abc')) is None
+        cache.set(('youtube', 'abc'), {'transcript': '[00:01] hello', 'metadata': {'title': 'T'}})
+        assert cache.get(('youtube', 'abc'))['transcript'] == '[00:01] hello'
+
+        # A fresh instance (simulated restart) is served from disk
+        restarted = TieredCache('transcripts', path, ttl=60, memory_entries=2, disk_entries=10)
+        assert restarted.get(('youtube', 'abc'))['metadata']['title'] == 'T'
+        assert restarted.get(('youtube', 'abc')) is not None
+
+        stats = restarted.get_stats()
+        print(f"📊 Stats after restart: {stats}")
+        assert stats['disk_hits'] == 1
+        assert stats['memory_hits'] == 1
+
+def test_ttl_and_eviction():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cache.db')
+        cache = TieredCache('transcripts', path, ttl=0.2, memory_entries=2, disk_entries=3)
+
+        for i in range(5):
+            cache.set(('youtube', str(i)), {'transcript': str(i)})
+        stats = cache.get_stats()
+        assert stats['memory_entries'] == 2
+        assert stats['disk_entries'] == 3
+        # Oldest entries were evicted from both tiers
+        assert cache.get(('youtube', '0')) is None
+        assert cache.get(('youtube', '4')) == {'transcript': '4'}
+
+        time.sleep(0.3)
+        assert cache.get(('youtube', '4')) is None
+
+if __name__ == "__main__":
+    test_memory_and_disk_tiers()
+    test_ttl_and_eviction()
+    print("✅ Transcript cache tests passed")
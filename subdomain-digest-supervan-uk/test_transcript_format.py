@@ -0,0 +1,44 @@
+import sys
+import os
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import format_transcript_items, fit_transcript, render_flat_transcript
+
+ITEMS = [
+    {'start': 0.0, 'duration': 2.5, 'text': 'welcome back'},
+    {'start': 2.5, 'duration': 3.0, 'text': 'today we ride'},
+    {'start': 65.2, 'duration': 1.0, 'text': 'first stop'},
+]
+
+def test_format_items():
+    text = format_transcript_items(ITEMS)
+    assert text == "[00:00] welcome back [00:02] today we ride [01:05] first stop"
+    print(f"✅ Formatted {len(ITEMS)} items: {text}")
+
+def test_prompts_cut_at_segment_boundary():
+    text = format_transcript_items([{'start': i, 'text': f"line number {i}"} for i in range(100)])
+    fitted = fit_transcript(text, 200)
+    assert len(fitted) <= 200 and text.startswith(fitted)
+    assert fitted.endswith("line number 8") # Not a partial line or timestamp
+    assert fit_transcript(text, len(text)) is text
+    assert fit_transcript('x' * 500, 100) == 'x' * 100 # No timestamps: plain cut
+    print(f"✅ Prompt transcript cut to {len(fitted)} chars at a line boundary")
+
+def test_bracketed_captions_are_not_boundaries():
+    text = "[00:01] intro [Music] more intro [00:09] next part of the video"
+    fitted = fit_transcript(text, 45)
+    assert fitted == "[00:01] intro [Music] more intro"
+    print("✅ Caption text like [Music] isn't mistaken for a timestamp")
+
+def test_progressive_growth():
+    segments = [(0.0, 1.0, 'so'), (1.0, 2.0, 'so today'), (2.0, 3.0, 'so today we')]
+    assert render_flat_transcript(segments) == "[00:00] so today we"
+    print("✅ Grown captions replace the line they extend")
+
+if __name__ == "__main__":
+    test_format_items()
+    test_prompts_cut_at_segment_boundary()
+    test_bracketed_captions_are_not_boundaries()
+    test_progressive_growth()
@@ -0,0 +1,126 @@
+import sys
+import os
+import io
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import iter_vtt_segments, render_flat_transcript, _parse_vtt
+
+VTT = """WEBVTT
+Kind: captions
+Language: en
+
+NOTE this block is a comment
+and spans two lines
+
+1
+00:00:01.000 --> 00:00:03.500 align:start position:0%
+ 
+hello<00:00:01.500><c> world</c>
+
+00:00:03.500 --> 00:00:03.510 align:start position:0%
+hello world
+ 
+
+00:00:03.510 --> 00:00:06.000
+hello world
+<b>second</b> line
+
+01:02:03.250 --> 01:02:05.000
+past the hour
+"""
+
+def test_segments_keep_timing():
+    segments = list(iter_vtt_segments(VTT))
+    assert segments == [
+        (1.0, 3.5, 'hello world'),
+        (3.5, 3.51, 'hello world'),
+        (3.51, 6.0, 'hello world\nsecond line'),
+        (3723.25, 3725.0, 'past the hour'),
+    ]
+    print(f"✅ {len(segments)} segments with start/end times (hours kept)")
+
+def test_flat_renderer():
+    text = render_flat_transcript(iter_vtt_segments(VTT))
+    assert text == "[00:01] hello world [00:03] second line [1:02:03] past the hour"
+    assert _parse_vtt(VTT) == text
+    print(f"✅ Flat transcript: {text}")
+
+def test_streaming_sources_match():
+    expected = list(iter_vtt_segments(VTT))
+    data = VTT.replace('\n', '\r\n').encode('utf-8')
+    # Chunk boundaries fall inside lines, inside \r\n pairs and inside multi-byte characters
+    chunks = [data[i:i + 7] for i in range(0, len(data), 7)]
+    assert list(iter_vtt_segments(iter(chunks))) == expected
+    assert list(iter_vtt_segments(io.BytesIO(data))) == expected
+    assert list(iter_vtt_segments(io.StringIO(VTT))) == expected
+    accented = "WEBVTT\n\n00:00:01.000 --> 00:00:02.000\ncafé déjà vu\n".encode('utf-8')
+    assert list(iter_vtt_segments(iter([accented[i:i + 3] for i in range(0, len(accented), 3)]))) == \
+        [(1.0, 2.0, 'café déjà vu')]
+    print("✅ Bytes chunks, binary and text files parse identically")
+
+def test_downloaded_track_matches_previous_output():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_download', 'ZJ_xq1_fqVQ.en.vtt')
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        streamed = render_flat_transcript(iter_vtt_segments(f))
+    with open(path, 'r', encoding='utf-8') as f:
+        assert _parse_vtt(f.read()) == streamed
+    assert streamed.startswith('[00:02] foreign [00:03] [Music] [00:08] now then')
+    print(f"✅ Real auto-caption track: {len(streamed)} chars")
+
+def test_rolled_up_repeats_dropped_but_later_repeats_kept():
+    segments = [
+        (0.0, 2.0, 'we will rock you'),
+        (2.0, 2.01, 'we will rock you'),          # roll-up copy, abuts the first cue
+        (2.01, 4.0, 'we will rock you\nbuddy'),  # still on screen
+        (4.0, 6.0, 'kicking your can'),
+        (30.0, 32.0, 'we will rock you'),         # the chorus again, much later
+    ]
+    text = render_flat_transcript(segments)
+    assert text == "[00:00] we will rock you [00:02] buddy [00:04] kicking your can [00:30] we will rock you"
+    print(f"✅ Chorus kept, roll-up copies dropped: {text}")
+
+def test_progressive_captions_merged():
+    segments = [
+        (10.0, 10.5, 'press the'),
+        (10.5, 11.0, 'press the red'),
+        (11.0, 12.0, 'press the red button'),
+        (12.0, 13.0, 'then wait'),
+        (40.0, 41.0, 'press the red button'),    # repeated instruction later
+    ]
+    text = render_flat_transcript(segments)
+    assert text == "[00:10] press the red button [00:12] then wait [00:40] press the red button"
+    print(f"✅ Progressive captions merged: {text}")
+
+def test_words_sharing_a_prefix_not_merged():
+    segments = [
+        (1.0, 2.0, 'Yes'),
+        (2.0, 4.0, 'Yesterday we went home'),
+        (4.0, 6.0, 'so'),
+        (6.0, 8.0, 'something else'),
+    ]
+    text = render_flat_transcript(segments)
+    assert text == "[00:01] Yes [00:02] Yesterday we went home [00:04] so [00:06] something else"
+    print(f"✅ Prefix-sharing words kept: {text}")
+
+def test_dedup_window_is_bounded():
+    segments = [(float(i), float(i) + 1, f"line {i}") for i in range(1000)]
+    segments.append((999.5, 1001.0, 'line 998'))
+    # A repeat of a line still on screen is dropped even at the end of a long track
+    assert render_flat_transcript(segments, window=8).endswith('[16:39] line 999')
+    # A repeat that fell out of the window is kept
+    assert render_flat_transcript(segments, window=1).endswith('[16:39] line 999 [16:39] line 998')
+    print("✅ Deduplication memory bounded by the window")
+
+if __name__ == "__main__":
+    test_segments_keep_timing()
+    test_flat_renderer()
+    test_streaming_sources_match()
+    test_downloaded_track_matches_previous_output()
+    test_rolled_up_repeats_dropped_but_later_repeats_kept()
+    test_progressive_captions_merged()
+    test_words_sharing_a_prefix_not_merged()
+    test_dedup_window_is_bounded()
@@ -0,0 +1,144 @@
+import sys
+import os
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+import app
+from app import _select_subtitle_track, _is_live_info, _extract_after_probe, StrategyStats
+
+VTT = b"""WEBVTT
+
+00:00:01.000 --> 00:00:03.000
+hello again
+"""
+
+PROBE_INFO = {
+    'id': 'abc',
+    'live_status': 'not_live',
+    'subtitles': {
+        'en-GB': [{'ext': 'vtt', 'url': 'https://example.com/manual-gb.vtt'}],
+    },
+    'automatic_captions': {
+        'en': [
+            {'ext': 'json3', 'url': 'https://example.com/auto.json3'},
+            {'ext': 'vtt', 'url': 'https://example.com/auto.vtt'},
+        ],
+        'fr': [{'ext': 'vtt', 'url': 'https://example.com/auto-fr.vtt'}],
+    },
+}
+
+def test_manual_subtitles_preferred():
+    track = _select_subtitle_track(PROBE_INFO)
+    print(f"🎯 Selected track: {track}")
+    assert track['lang'] == 'en-GB'
+    assert track['automatic'] is False
+
+def test_automatic_captions_fallback():
+    info = dict(PROBE_INFO, subtitles={})
+    track = _select_subtitle_track(info)
+    assert track['url'] == 'https://example.com/auto.vtt'
+    assert track['automatic'] is True
+    assert _select_subtitle_track(info, lang='de') is None
+
+def test_live_detection_on_unprocessed_info():
+    assert not _is_live_info(PROBE_INFO)
+    assert _is_live_info({'live_status': 'is_live'})
+    assert _is_live_info({'live_status': 'post_live'})
+    assert _is_live_info({'was_live': True})
+
+class FakeEngine:
+    """Stands in for ytdlp_engine: the page extracted with the strategy's own options."""
+    def __init__(self):
+        self.calls = []
+
+    def extract(self, video_url, **options):
+        self.calls.append(options)
+        track_url = f"https://example.com/own-{len(self.calls)}.vtt"
+        return {'id': 'abc', 'subtitles': {'en': [{'ext': 'vtt', 'url': track_url}]}}, {'SID': 'x'}
+
+def fake_download(downloads):
+    def download(track, proxy_url=None, cookies=None):
+        downloads.append((track['url'], proxy_url))
+        if 'example.com/manual-gb' in track['url']:
+            raise Exception("403 Client Error: Forbidden")
+        return iter([VTT])
+    return download
+
+def test_failed_probe_track_falls_back_to_own_extraction():
+    engine, downloads = FakeEngine(), []
+    original = app.ytdlp_engine, app._download_subtitle_track
+    app.ytdlp_engine, app._download_subtitle_track = engine, fake_download(downloads)
+    try:
+        # Method 2's path: the page is extracted again through the strategy's proxy
+        opts = {'proxy': 'http://10.0.0.1:8080', 'socket_timeout': 30, 'format': 'worst'}
+        info, vtt_content = _extract_after_probe(opts, 'https://www.youtube.com/watch?v=abc', PROBE_INFO)
+        assert engine.calls == [{'proxy': 'http://10.0.0.1:8080', 'socket_timeout': 30}]
+        assert downloads == [('https://example.com/manual-gb.vtt', 'http://10.0.0.1:8080'),
+                             ('https://example.com/own-1.vtt', 'http://10.0.0.1:8080')]
+        assert list(vtt_content) == [VTT]
+
+        # A working probe track is used as-is
+        downloads.clear()
+        info, _ = _extract_after_probe(opts, 'https://www.youtube.com/watch?v=abc', dict(PROBE_INFO, subtitles={}))
+        assert len(engine.calls) == 1
+        assert downloads == [('https://example.com/auto.vtt', 'http://10.0.0.1:8080')]
+        print("✅ A failed probe track falls back to the strategy's own extraction")
+    finally:
+        app.ytdlp_engine, app._download_subtitle_track = original
+
+class FakeCookieManager:
+    def __init__(self, cookie_set):
+        self.cookie_set = cookie_set
+        self.reports = []
+
+    def acquire(self, platform):
+        return self.cookie_set
+
+    def report(self, cookie_set, success):
+        self.reports.append(success)
+
+class FakeCookieSet:
+    name = 'fake'
+    size = 3
+
+class NoProxies:
+    def get_proxy(self, protocol_filter=None):
+        return None
+
+def test_cookie_extraction_tried_after_probe_track_fails():
+    engine, downloads = FakeEngine(), []
+    cookie_set = FakeCookieSet()
+    cookies = FakeCookieManager(cookie_set)
+
+    def blocked_api(video_id, cookie_set=None, proxies=None):
+        raise Exception("Sign in to confirm you're not a bot")
+
+    original = (app.ytdlp_engine, app._download_subtitle_track, app._probe_youtube_video, app._fetch_transcript_api,
+                app.cookie_manager, app.proxy_manager, app.strategy_stats)
+    app.ytdlp_engine, app._download_subtitle_track = engine, fake_download(downloads)
+    app._probe_youtube_video = lambda video_url: dict(PROBE_INFO, title='Probed')
+    app._fetch_transcript_api = blocked_api
+    app.cookie_manager, app.proxy_manager, app.strategy_stats = cookies, NoProxies(), StrategyStats()
+    try:
+        text, metadata, cookie_count = app._get_youtube_transcript_with_cookies('abc')
+        assert text == "[00:01] hello again"
+        assert metadata['title'] == 'Probed' # Metadata still comes from the probe
+        assert cookie_count == 3
+        # Method 1.5 extracted the page itself, with its cookie set, once the probe's track failed
+        assert engine.calls[0]['cookie_set'] is cookie_set
+        assert downloads[0][0] == 'https://example.com/manual-gb.vtt'
+        assert downloads[-1][0].startswith('https://example.com/own-')
+        assert cookies.reports == [True]
+        print("✅ Method 1.5 uses its cookie set when the probe's track download fails")
+    finally:
+        (app.ytdlp_engine, app._download_subtitle_track, app._probe_youtube_video, app._fetch_transcript_api,
+         app.cookie_manager, app.proxy_manager, app.strategy_stats) = original
+
+if __name__ == "__main__":
+    test_manual_subtitles_preferred()
+    test_automatic_captions_fallback()
+    test_live_detection_on_unprocessed_info()
+    test_failed_probe_track_falls_back_to_own_extraction()
+    test_cookie_extraction_tried_after_probe_track_fails()
+    print("✅ Probe helper tests passed")
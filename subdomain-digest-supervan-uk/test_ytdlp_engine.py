@@ -0,0 +1,66 @@
+import sys
+import os
+import copy
+import tempfile
+
+# Add current directory to path so we can import app
+sys.path.append(os.getcwd())
+
+from app import YtDlpEngine, CookieJarManager
+
+COOKIES = """# Netscape HTTP Cookie File
+.youtube.com	TRUE	/	TRUE	2147483647	PREF	hl=en
+"""
+
+def test_instances_are_reused_per_profile_and_options():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        engine = YtDlpEngine(cache_dir=cache_dir)
+        with engine.acquire('subtitles') as first:
+            assert first.params['cachedir'] == cache_dir
+            assert first.params['extractor_args']['youtube']['skip'] == ['dash', 'hls', 'translated_subs']
+        with engine.acquire('subtitles') as second:
+            assert second is first
+            # Checked-out instances are never shared between concurrent users
+            with engine.acquire('subtitles') as third:
+                assert third is not first
+        with engine.acquire('subtitles', proxy='socks5://127.0.0.1:9050',
+                            extractor_args={'youtube': {'player_client': ['web']}}) as proxied:
+            assert proxied is not first
+            assert proxied.params['proxy'] == 'socks5://127.0.0.1:9050'
+            assert proxied.params['extractor_args']['youtube']['player_client'] == ['web']
+            assert proxied.params['extractor_args']['youtube']['player_skip'] == ['js']
+        stats = engine.get_stats()
+        print(f"📊 Engine stats: {stats}")
+        assert stats['created'] == 3 and stats['reused'] == 1
+
+def test_cookie_sets_copied_into_instances():
+    manager = CookieJarManager({'YOUTUBE_COOKIES': COOKIES})
+    cookie_set = manager.acquire('youtube')
+    engine = YtDlpEngine(max_keys=1)
+
+    with engine.acquire('subtitles', cookie_set=cookie_set) as first:
+        assert 'cookiefile' not in first.params
+        assert any(c.name == 'PREF' for c in first.cookiejar)
+        first.cookiejar.clear()
+    # The shared jar is never modified by its consumers
+    assert len(cookie_set.jar) == 1
+    with engine.acquire('subtitles', cookie_set=cookie_set) as second:
+        assert second is first
+        # A reused instance gets the set's cookies back, not the last user's jar
+        assert [c.name for c in second.cookiejar] == ['PREF']
+        # Cookies picked up during a request don't leak into the next checkout
+        stray = copy.copy(next(iter(cookie_set.jar)))
+        stray.name, stray.value = 'VISITOR_INFO1_LIVE', 'other-session'
+        second.cookiejar.set_cookie(stray)
+    with engine.acquire('subtitles', cookie_set=cookie_set) as third:
+        assert third is first
+        assert [(c.name, c.value) for c in third.cookiejar] == [('PREF', 'hl=en')]
+
+    with engine.acquire('subtitles', proxy='http://127.0.0.1:1'):
+        pass
+    assert engine.get_stats()['closed'] == 1
+
+if __name__ == "__main__":
+    test_instances_are_reused_per_profile_and_options()
+    test_cookie_sets_copied_into_instances()
+    print("✅ yt-dlp engine tests passed")